@@ -0,0 +1,346 @@
+# app/core/compression.py
+"""
+Negotiated response compression.
+
+CompressionMiddleware compresses responses on the fly with the best coding
+the client accepts (Accept-Encoding, with q-values): zstd and brotli when
+their optional packages (zstandard, brotli) are installed, gzip always.
+Responses are left alone when they are small (below COMPRESSION_MIN_SIZE),
+already encoded, of a type that does not compress (images, archives...),
+partial, or marked no-transform. Streamed responses are compressed chunk by
+chunk, each chunk flushed, so NDJSON and CSV streams still arrive as they
+are produced.
+
+Static assets are compressed once instead: precompress_directory() (run at
+image build time, ``python -m app.core.compression static``) writes .br,
+.zst and .gz variants next to each compressible file, and
+PrecompressedStaticFiles serves the best variant the client accepts with
+the matching Content-Encoding, falling back to the plain file.
+"""
+
+import argparse
+import gzip
+import mimetypes
+import os
+import zlib
+from typing import Dict, Optional, Sequence, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+
+try:
+    import brotli
+except ImportError:  # optional: br is only offered when installed
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: zstd is only offered when installed
+    zstandard = None
+
+settings = get_settings()
+
+# Codings in order of preference when the client accepts several equally.
+# zstd and brotli compress JSON better than gzip; zstd is the cheapest of
+# the three per byte, brotli's top levels the smallest for static files.
+DYNAMIC_CODINGS = tuple(
+    coding for coding, available in (("zstd", zstandard), ("br", brotli), ("gzip", zlib)) if available
+)
+STATIC_CODINGS = ("br", "zstd", "gzip")
+VARIANT_SUFFIXES = {"br": ".br", "zstd": ".zst", "gzip": ".gz"}
+
+_COMPRESSIBLE_TYPES = (
+    "application/json", "application/x-ndjson", "application/javascript", "application/xml",
+    "application/manifest+json", "image/svg+xml",
+)
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    """Whether a media type is worth compressing (text-like formats)."""
+    if not content_type:
+        return False
+    media_type = content_type.split(";")[0].strip().lower()
+    return media_type.startswith("text/") or media_type in _COMPRESSIBLE_TYPES or media_type.endswith("+json")
+
+
+def negotiate(accept_encoding: str, codings: Sequence[str]) -> Optional[str]:
+    """
+    The coding to use for a request's Accept-Encoding header.
+
+    Codings are weighed by their q-value (an explicit entry, else "*", else
+    not accepted); ties go to the earlier entry of codings.
+
+    Args:
+        accept_encoding: The Accept-Encoding header value
+        codings: The codings the server can produce, in order of preference
+
+    Returns:
+        Optional[str]: The chosen coding, or None to send the identity
+    """
+    weights: Dict[str, float] = {}
+    for entry in accept_encoding.split(","):
+        name, _, parameters = entry.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        parameter, _, value = parameters.partition("=")
+        if parameter.strip().lower() == "q":
+            try:
+                weight = float(value)
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+
+    best, best_weight = None, 0.0
+    for coding in codings:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+class _Compressor:
+    """A streaming compressor: compress() each chunk, then flush() it, or finish() at the end."""
+
+    def __init__(self, coding: str):
+        if coding == "zstd":
+            compressor = zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compressobj()
+            self.compress = compressor.compress
+            self.flush = lambda: compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+            self.finish = compressor.flush
+        elif coding == "br":
+            compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+            self.compress = compressor.process
+            self.flush = compressor.flush
+            self.finish = compressor.finish
+        else:
+            compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self.compress = compressor.compress
+            self.flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+            self.finish = compressor.flush
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses per the request's Accept-Encoding.
+
+    A response is compressed unless it is smaller than minimum_size (known
+    when its body comes in one message), already has a Content-Encoding,
+    has a type that is not text-like, is partial or has no body, or carries
+    Cache-Control: no-transform. Compressed responses get Vary:
+    Accept-Encoding, and a strong ETag is made weak, since the bytes are no
+    longer those it was computed for.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None, codings: Sequence[str] = DYNAMIC_CODINGS):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        self.codings = codings
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        coding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.codings)
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressionResponder(send, coding, self.minimum_size).send)
+
+
+class _CompressionResponder:
+    """Compresses one response, deciding on its first body message."""
+
+    def __init__(self, send: Send, coding: str, minimum_size: int):
+        self._send = send
+        self.coding = coding
+        self.minimum_size = minimum_size
+        self.start: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+
+    def _should_compress(self, start: Message, body: bytes, more_body: bool) -> bool:
+        headers = Headers(raw=start.get("headers", []))
+        status = start["status"]
+        if status < 200 or status in (204, 206, 304):
+            return False
+        if "content-encoding" in headers or "content-range" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", "").lower():
+            return False
+        if not is_compressible(headers.get("content-type")):
+            return False
+        return more_body or len(body) >= self.minimum_size
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            if self.start is not None:
+                start, self.start = self.start, None
+                await self._send(start)
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is None:
+            if self.compressor is None:
+                await self._send(message)
+                return
+            data = self.compressor.compress(body)
+            data += self.compressor.flush() if more_body else self.compressor.finish()
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        start, self.start = self.start, None
+        if not self._should_compress(start, body, more_body):
+            await self._send(start)
+            await self._send(message)
+            return
+
+        self.compressor = _Compressor(self.coding)
+        data = self.compressor.compress(body)
+        data += self.compressor.flush() if more_body else self.compressor.finish()
+        headers = MutableHeaders(scope=start)
+        headers["Content-Encoding"] = self.coding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag is not None and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        if more_body:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(data))
+        await self._send(start)
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+
+# ------------------------------------------------------------------------------
+# Precompressed static files
+# ------------------------------------------------------------------------------
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves precompressed variants (see precompress_directory()).
+
+    For a file such as style.css it looks for style.css.br, .zst and .gz,
+    and serves the best one the client accepts, provided it is not older
+    than the file itself. The response keeps the original media type and
+    gets Content-Encoding and Vary: Accept-Encoding; its ETag comes from the
+    variant, so each encoding revalidates on its own. Without an acceptable
+    variant the plain file is served.
+    """
+
+    def _variants(self, full_path: str, stat_result: os.stat_result) -> Dict[str, Tuple[str, os.stat_result]]:
+        variants = {}
+        for coding, suffix in VARIANT_SUFFIXES.items():
+            try:
+                variant_stat = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            if variant_stat.st_mtime >= stat_result.st_mtime:
+                variants[coding] = (full_path + suffix, variant_stat)
+        return variants
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        variants = self._variants(str(full_path), stat_result)
+        if not variants:
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        request_headers = Headers(scope=scope)
+        coding = negotiate(
+            request_headers.get("accept-encoding", ""),
+            [coding for coding in STATIC_CODINGS if coding in variants],
+        )
+        if coding is None:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+        else:
+            variant_path, variant_stat = variants[coding]
+            media_type = mimetypes.guess_type(str(full_path))[0] or "text/plain"
+            response = FileResponse(
+                variant_path,
+                status_code=status_code,
+                stat_result=variant_stat,
+                media_type=media_type,
+                headers={"Content-Encoding": coding},
+            )
+            if self.is_not_modified(response.headers, request_headers):
+                response = NotModifiedResponse(response.headers)
+        response.headers.add_vary_header("Accept-Encoding")
+        return response
+
+
+def _compress_static(coding: str, data: bytes) -> bytes:
+    """One file's content compressed at the coding's highest level."""
+    if coding == "br":
+        return brotli.compress(data, quality=11)
+    if coding == "zstd":
+        return zstandard.ZstdCompressor(level=19).compress(data)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def precompress_directory(directory: str, minimum_size: Optional[int] = None) -> int:
+    """
+    Write compressed variants of the compressible files under directory.
+
+    Each file of a text-like type, at least minimum_size bytes long, gets a
+    variant per available coding (.gz always; .br and .zst when brotli and
+    zstandard are installed). Variants that are up to date are kept, and
+    ones that would not be smaller than the file are not written.
+
+    Args:
+        directory: The static files directory
+        minimum_size: Smallest file to compress (defaults to COMPRESSION_MIN_SIZE)
+
+    Returns:
+        int: Number of variants written
+    """
+    minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+    suffixes = tuple(VARIANT_SUFFIXES.values())
+    written = 0
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            if name.endswith(suffixes) or not is_compressible(mimetypes.guess_type(name)[0]):
+                continue
+            stat_result = os.stat(path)
+            if stat_result.st_size < minimum_size:
+                continue
+            with open(path, "rb") as source:
+                data = None
+                for coding in DYNAMIC_CODINGS:
+                    variant = path + VARIANT_SUFFIXES[coding]
+                    if os.path.exists(variant) and os.stat(variant).st_mtime >= stat_result.st_mtime:
+                        continue
+                    data = source.read() if data is None else data
+                    compressed = _compress_static(coding, data)
+                    if len(compressed) < len(data):
+                        with open(variant, "wb") as target:
+                            target.write(compressed)
+                        written += 1
+    return written
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command-line entry point: precompress a static files directory."""
+    parser = argparse.ArgumentParser(description="Write .br/.zst/.gz variants of static files.")
+    parser.add_argument("directory", help="static files directory (e.g. static)")
+    parser.add_argument("--min-size", type=int, default=settings.COMPRESSION_MIN_SIZE)
+    args = parser.parse_args(argv)
+    written = precompress_directory(args.directory, args.min_size)
+    print(f"Wrote {written} precompressed files ({', '.join(DYNAMIC_CODINGS)}).")
+
+
+if __name__ == "__main__":
+    main()  # pragma: no cover
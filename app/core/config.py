@@ -1,7 +1,7 @@
 # app/config.py
 from functools import lru_cache
 from pydantic_settings import BaseSettings
-from typing import Optional, List
+from typing import Literal, Optional, List
 
 class Settings(BaseSettings):
     # Database settings (keeping your existing default)
@@ -20,6 +20,106 @@ class Settings(BaseSettings):
     
     # Redis (optional, for token blacklisting)
     REDIS_URL: Optional[str] = "redis://localhost:6379/0"
+
+    # Calculation listing (keyset pagination)
+    CALCULATIONS_PAGE_SIZE: int = 50
+    CALCULATIONS_MAX_PAGE_SIZE: int = 500
+
+    # Calculation result cache (in-process LRU + shared Redis tier)
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_MAX_ENTRIES: int = 10000
+    RESULT_CACHE_TTL_SECONDS: int = 3600
+    RESULT_CACHE_REDIS_ENABLED: bool = True
+    RESULT_CACHE_REDIS_TIMEOUT_SECONDS: float = 0.05
+    RESULT_CACHE_REDIS_RETRY_SECONDS: int = 30
+
+    # Bulk creation (POST /calculations/batch); also caps batched POST /evaluate
+    CALCULATIONS_BATCH_MAX_ITEMS: int = 1000
+
+    # Parameter sweeps (POST /evaluate/sweep): largest Cartesian product, and
+    # points evaluated (and held in memory) per streamed chunk
+    SWEEP_MAX_POINTS: int = 1_000_000
+    SWEEP_CHUNK_POINTS: int = 16384
+
+    # Streaming export (GET /calculations/export): rows per server-side cursor fetch
+    EXPORT_CHUNK_SIZE: int = 1000
+
+    # Bulk import (POST /calculations/import, app.operations.importer): lines
+    # validated, computed and COPYed per chunk, and per-line errors reported
+    IMPORT_CHUNK_SIZE: int = 5000
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000
+    # Longer lines are reported as errors instead of being buffered
+    IMPORT_MAX_LINE_BYTES: int = 1 << 20
+
+    # Cache-Control max-age of GET /evaluate responses (results depend only
+    # on the query; private, since the endpoint is authenticated)
+    EVALUATE_CACHE_MAX_AGE_SECONDS: int = 86400
+
+    # Reuse the stored result of an identical calculation (same inputs_hash)
+    # on create instead of computing it; POST /calculations?dedupe= overrides
+    CALCULATIONS_DEDUPE_ON_CREATE: bool = False
+    CALCULATIONS_LOOKUP_MAX_MATCHES: int = 100
+
+    # Bulk recomputation (rows evaluated and updated per statement)
+    BATCH_RECOMPUTE_CHUNK_SIZE: int = 5000
+
+    # Bulk deletion (POST /calculations/bulk-delete): rows deleted per
+    # statement (each committed on its own), and ids accepted per request
+    BULK_DELETE_CHUNK_SIZE: int = 5000
+    BULK_MAX_IDS: int = 10000
+
+    # Storage format for new calculation inputs: "json" (text) or "binary"
+    # (packed little-endian float64); rows in either format are always readable
+    INPUTS_STORAGE_FORMAT: Literal["json", "binary"] = "json"
+
+    # Exponentiation budgets (checked up front by app.operations.cost)
+    # Largest integer intermediate, in decimal digits (CPython's default
+    # int-to-str limit is 4300 digits)
+    EXPONENTIATION_MAX_RESULT_DIGITS: int = 4300
+    # Total estimated work of the integer steps, in digit-operations
+    EXPONENTIATION_MAX_WORK: float = 5_000_000
+    # Largest result magnitude, as log10 (results are stored as float64)
+    EXPONENTIATION_MAX_LOG10: float = 308.0
+    # What to do with over-budget integer towers: "reject" or "downgrade" (to float)
+    EXPONENTIATION_OVER_BUDGET: Literal["reject", "downgrade"] = "reject"
+
+    # Exact results: ints and decimals are kept exact instead of float64, and
+    # results that do not fit a float are stored as NUMERIC (result_exact)
+    CALCULATIONS_EXACT_RESULTS: bool = False
+    # Largest exact result, in decimal digits (also the decimal precision)
+    EXACT_MAX_DIGITS: int = 4300
+    # Significant digits of quotients that have no exact decimal expansion
+    EXACT_DIVISION_DIGITS: int = 50
+
+    # Compute executor (process pool for heavy calculations)
+    COMPUTE_POOL_ENABLED: bool = True
+    COMPUTE_POOL_MAX_WORKERS: int = 2
+    # Calculations estimated above this cost run on the pool instead of inline
+    COMPUTE_INLINE_MAX_COST: float = 50_000
+    COMPUTE_TIMEOUT_SECONDS: float = 10.0
+    COMPUTE_MAX_PENDING: int = 32
+
+    # Expression calculations (compiled expressions are memoized by text)
+    EXPRESSION_MAX_LENGTH: int = 1000
+    # Deeper syntax trees (e.g. "1+1+...+1", "--...-1") are rejected before
+    # they can exhaust the compiler's recursion limit
+    EXPRESSION_MAX_DEPTH: int = 200
+    EXPRESSION_CACHE_SIZE: int = 1024
+
+    # Response compression (app.core.compression): smallest body worth
+    # compressing, and on-the-fly levels (zstd and brotli need the optional
+    # zstandard and brotli packages)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    # Chunked upload sessions (inputs too large for one request)
+    UPLOAD_MAX_CHUNK_BYTES: int = 8 * 1024 * 1024
+    # Finalized inputs are stored as one BYTEA value (Postgres caps it at 1 GB)
+    UPLOAD_MAX_INPUTS: int = 50_000_000
+    UPLOAD_SESSION_TTL_SECONDS: int = 86400
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,103 @@
+# app/core/packing.py
+"""
+Packed float64 codec for numeric vectors.
+
+Calculation inputs can be stored as little-endian float64 values packed back
+to back (8 bytes per input, no separators) instead of JSON text. Decoding is
+numpy.frombuffer() over the stored buffer: no parsing and no copy, with the
+result exposed as a read-only array.
+
+The same packing is accepted on the wire, either base64-encoded in JSON
+(decode_packed_b64) or as a raw application/octet-stream body.
+
+Only values that survive the round trip exactly are packed: real numbers
+(not bools) and integers no larger than 2**53. Anything else (huge integers,
+strings, non-lists) is left to the JSON representation by the callers.
+"""
+
+import base64
+import binascii
+from typing import Any, Sequence, Union
+
+import numpy as np
+
+FLOAT64_LE = np.dtype("<f8")
+
+# Largest integer magnitude float64 represents exactly
+MAX_EXACT_INT = 2 ** 53
+
+
+def can_pack(values: Any) -> bool:
+    """
+    Check whether values round-trip exactly through packed float64.
+
+    Args:
+        values: Candidate list/tuple of numbers (or a float64 array)
+
+    Returns:
+        bool: True if pack_floats(values) loses nothing
+    """
+    if isinstance(values, np.ndarray):
+        return values.ndim == 1 and values.dtype.kind == "f"
+    if not isinstance(values, (list, tuple)):
+        return False
+    for value in values:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+        if isinstance(value, int) and abs(value) > MAX_EXACT_INT:
+            return False
+    return True
+
+
+def pack_floats(values: Union[Sequence[float], np.ndarray]) -> bytes:
+    """
+    Pack numbers as little-endian float64.
+
+    Args:
+        values: The numbers to pack
+
+    Returns:
+        bytes: 8 bytes per value
+    """
+    return np.asarray(values, dtype=FLOAT64_LE).tobytes()
+
+
+def unpack_floats(data: Union[bytes, bytearray, memoryview]) -> np.ndarray:
+    """
+    Decode packed little-endian float64 without copying.
+
+    Args:
+        data: A buffer produced by pack_floats()
+
+    Returns:
+        np.ndarray: A read-only float64 view over data
+
+    Raises:
+        ValueError: If the buffer length is not a multiple of 8
+    """
+    view = memoryview(data)
+    if view.nbytes % FLOAT64_LE.itemsize:
+        raise ValueError("Packed inputs must be a multiple of 8 bytes.")
+    array = np.frombuffer(view, dtype=FLOAT64_LE)
+    array.flags.writeable = False
+    return array
+
+
+def decode_packed_b64(text: str) -> np.ndarray:
+    """
+    Decode base64-encoded packed float64 (e.g. an inputs_b64 field).
+
+    Args:
+        text: Standard base64 of the packed bytes
+
+    Returns:
+        np.ndarray: A read-only float64 view over the decoded bytes
+
+    Raises:
+        ValueError: If text is not valid base64 of whole float64 values
+    """
+    try:
+        data = base64.b64decode(text, validate=True)
+    except (binascii.Error, TypeError, ValueError):
+        raise ValueError("inputs_b64 must be base64-encoded little-endian float64 values.")
+    return unpack_floats(data)
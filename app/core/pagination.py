@@ -0,0 +1,50 @@
+# app/core/pagination.py
+"""
+Opaque cursor helpers for keyset pagination.
+
+A cursor is the sort key of the last row on a page, serialised as compact
+JSON and base64url-encoded. Clients must treat it as an opaque token and
+only ever pass back a value previously returned by the API.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Dict
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """
+    Encode a cursor payload into an opaque, URL-safe token.
+
+    Args:
+        payload: JSON-serialisable dictionary describing the position
+
+    Returns:
+        str: The base64url token (without padding)
+    """
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(token: str) -> Dict[str, Any]:
+    """
+    Decode a token produced by encode_cursor().
+
+    Args:
+        token: The opaque cursor string supplied by the client
+
+    Returns:
+        dict: The decoded cursor payload
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError("Invalid pagination cursor.")
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid pagination cursor.")
+    return payload
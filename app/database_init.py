@@ -1,5 +1,6 @@
 from app.database import engine
 from app.models.user import Base
+from app.models.upload import CalculationUpload  # noqa: F401 - registers the upload tables
 
 def init_db():
     Base.metadata.create_all(bind=engine)
@@ -16,29 +16,73 @@ The application follows a RESTful API design with proper separation of concerns:
 """
 
 from contextlib import asynccontextmanager  # Used for startup/shutdown events
+import hashlib  # Weak ETags of stored calculations
+import json  # Exact-mode request bodies (decimals parsed as Decimal)
 from datetime import datetime, timezone, timedelta
+from decimal import Decimal
 from uuid import UUID  # For type validation of UUIDs in path parameters
-from typing import List
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 # FastAPI imports
-from fastapi import Body, FastAPI, Depends, HTTPException, status, Request, Form
+from fastapi import Body, FastAPI, Depends, HTTPException, status, Request, Form, Query, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
-from fastapi.staticfiles import StaticFiles  # For serving static files (CSS, JS)
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates  # For HTML templates
+from starlette.concurrency import run_in_threadpool  # Blocking DB work from async routes
 
-from sqlalchemy.orm import Session  # SQLAlchemy database session
+from pydantic import ValidationError  # Per-item validation in batch requests
+from sqlalchemy.orm import Session, undefer  # SQLAlchemy database session
 
+import anyio  # Reading import bodies from the threadpool
+import numpy as np  # Validating packed upload chunks
 import uvicorn  # ASGI server for running FastAPI apps
 
 # Application imports
 from app.auth.dependencies import get_current_active_user  # Authentication dependency
 from app.models.calculation import Calculation  # Database model for calculations
+from app.models.upload import CalculationUpload, UploadOffsetError  # Chunked upload sessions
 from app.models.user import User  # Database model for users
-from app.schemas.calculation import CalculationBase, CalculationResponse, CalculationUpdate  # API request/response schemas
+from app.schemas.calculation import (  # API request/response schemas
+    CalculationBase,
+    CalculationBatchItemResult,
+    CalculationBatchResponse,
+    CalculationBulkDeleteRequest,
+    CalculationBulkDeleteResponse,
+    CalculationBulkFilter,
+    CalculationImportResponse,
+    CalculationInputsPatch,
+    CalculationLookupResponse,
+    CalculationLookupScope,
+    CalculationRecomputeResponse,
+    CalculationResponse,
+    CalculationSort,
+    CalculationSweepRequest,
+    CalculationType,
+    CalculationUpdate,
+    CalculationUploadCreate,
+    CalculationUploadFinalizeResponse,
+    CalculationUploadResponse,
+    EvaluationBatchItemResult,
+    EvaluationBatchResponse,
+    EvaluationResponse,
+)
+from app.operations.batch import evaluate_batch  # Vectorized calculation kernels
+from app.operations.cache import make_key, result_cache  # Memoized calculation results
+from app.operations.executor import ComputeError, compute_executor, compute_result, compute_result_async  # Process-pool kernels
+from app.operations.kernels import operation_labels  # Operation registry (form choices)
+from app.operations.export import EXPORT_FORMATS, MEDIA_TYPES, stream_export  # Streamed exports
+from app.operations.importer import IMPORT_FORMATS, CalculationImporter  # Bulk imports (COPY)
+from app.operations.sweep import sweep_ndjson  # Streamed parameter sweeps
 from app.schemas.token import TokenResponse  # API token schema
 from app.schemas.user import UserCreate, UserResponse, UserLogin  # User schemas
-from app.database import Base, get_db, engine  # Database connection
+from app.database import Base, SessionLocal, get_db, engine  # Database connection
+from app.core.config import get_settings  # Application settings
+from app.core.compression import CompressionMiddleware, PrecompressedStaticFiles  # Response compression
+from app.core.pagination import encode_cursor, decode_cursor  # Keyset cursor tokens
+from app.core.packing import unpack_floats  # Packed float64 request bodies
+
+settings = get_settings()
 
 
 # ------------------------------------------------------------------------------
@@ -59,8 +103,9 @@ async def lifespan(app: FastAPI):
     print("Creating tables...")
     Base.metadata.create_all(bind=engine)
     print("Tables created successfully!")
+    compute_executor.start()
     yield  # This is where application runs
-    # Cleanup code would go here (after yield), but we don't need any
+    compute_executor.shutdown()
 
 # Initialize the FastAPI application with metadata and lifespan
 app = FastAPI(
@@ -70,11 +115,16 @@ app = FastAPI(
     lifespan=lifespan  # Pass our lifespan context manager
 )
 
+# Compress responses per Accept-Encoding (static files ship precompressed)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
 # ------------------------------------------------------------------------------
 # Static Files and Templates Configuration
 # ------------------------------------------------------------------------------
-# Mount the static files directory for serving CSS, JS, and images
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Mount the static files directory for serving CSS, JS, and images, with the
+# .br/.zst/.gz variants written by `python -m app.core.compression static`
+app.mount("/static", PrecompressedStaticFiles(directory="static"), name="static")
 
 # Set up Jinja2 templates directory for HTML rendering
 templates = Jinja2Templates(directory="templates")
@@ -125,7 +175,7 @@ def dashboard_page(request: Request):
     
     JavaScript in this page calls the API endpoints to fetch and display data.
     """
-    return templates.TemplateResponse("dashboard.html", {"request": request})
+    return templates.TemplateResponse("dashboard.html", {"request": request, "operations": operation_labels()})
 
 @app.get("/dashboard/view/{calc_id}", response_class=HTMLResponse, tags=["web"])
 def view_calculation_page(request: Request, calc_id: str):
@@ -170,7 +220,8 @@ def edit_calculation_page(request: Request, calc_id: str, db: Session = Depends(
     return templates.TemplateResponse("edit_calculation.html", {
         "request": request,
         "calc_id": calc_id,
-        "selected_type": calculation.type  # Pass operation type to template
+        "selected_type": calculation.type,  # Pass operation type to template
+        "operations": operation_labels(),
     })
 
 
@@ -182,6 +233,16 @@ def read_health():
     """Health check."""
     return {"status": "ok"}
 
+@app.get("/health/result-cache", tags=["health"])
+def read_result_cache_stats():
+    """Hit/miss counters of the calculation result cache in this worker."""
+    return result_cache.stats()
+
+@app.get("/health/compute", tags=["health"])
+def read_compute_stats():
+    """Configuration and queue depth of the compute executor in this worker."""
+    return compute_executor.stats()
+
 
 # ------------------------------------------------------------------------------
 # User Registration Endpoint
@@ -271,79 +332,985 @@ def login_form(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = D
 # ------------------------------------------------------------------------------
 # Calculations Endpoints (BREAD)
 # ------------------------------------------------------------------------------
+# Calculation bodies are JSON, or (for large input vectors) the inputs packed as
+# little-endian float64 with type/expression in the query string.
+PACKED_INPUTS_MEDIA_TYPE = "application/octet-stream"
+
+# Referencing inputs need the referenced (stored) calculations' results
+REFERENCES_NOT_SUPPORTED = "Inputs referencing other calculations are only supported by POST and PUT /calculations."
+
+
+def exact_mode(
+    exact: Optional[bool] = Query(
+        None,
+        description="Compute the result exactly (integers and decimals kept exact, results stored as NUMERIC) "
+                    "instead of in float64 (defaults to the server's CALCULATIONS_EXACT_RESULTS)",
+    ),
+) -> bool:
+    """The exact query flag, defaulting to CALCULATIONS_EXACT_RESULTS."""
+    return settings.CALCULATIONS_EXACT_RESULTS if exact is None else exact
+
+
+async def _parse_calculation_body(request: Request, schema, exact: bool = False):
+    """
+    Validate a create/update body sent as JSON or as packed float64.
+
+    A packed body is decoded straight into a float64 array (no Python float
+    per input) and then goes through the same schema validation as JSON.
+    In exact mode, JSON numbers with a fraction or exponent are parsed as
+    Decimals, so inputs keep every digit they were sent with.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    try:
+        if content_type == PACKED_INPUTS_MEDIA_TYPE:
+            data: Any = dict(request.query_params)
+            try:
+                data["inputs"] = unpack_floats(await request.body())
+            except ValueError as e:
+                raise RequestValidationError([
+                    {"type": "value_error", "loc": ("body",), "msg": str(e), "input": None}
+                ])
+        else:
+            try:
+                body = await request.body()
+                data = json.loads(body, parse_float=Decimal) if exact else json.loads(body)
+            except ValueError:
+                raise RequestValidationError([
+                    {"type": "json_invalid", "loc": ("body",), "msg": "JSON decode error", "input": {}}
+                ])
+        return schema.model_validate(data, context={"exact": exact})
+    except ValidationError as e:
+        errors = [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        if content_type == PACKED_INPUTS_MEDIA_TYPE or (isinstance(data, dict) and data.get("inputs_b64")):
+            # Never echo decoded arrays (or the whole packed vector) back
+            errors = [{key: value for key, value in error.items() if key != "input"} for error in errors]
+        raise RequestValidationError(errors)
+
+
+def _calculation_body_openapi(schema) -> Dict[str, Any]:
+    """OpenAPI request body for routes that parse their body with _parse_calculation_body()."""
+    json_schema = schema.model_json_schema(ref_template="#/components/schemas/{model}")
+    json_schema.pop("$defs", None)
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": json_schema},
+                PACKED_INPUTS_MEDIA_TYPE: {
+                    "schema": {
+                        "type": "string",
+                        "format": "binary",
+                        "description": "Inputs packed as little-endian float64; "
+                                       "pass type and expression as query parameters",
+                    }
+                },
+            },
+        }
+    }
+
+
+async def calculation_create_body(request: Request, exact: bool = Depends(exact_mode)) -> CalculationBase:
+    """Body of POST /calculations (JSON or packed float64)."""
+    return await _parse_calculation_body(request, CalculationBase, exact)
+
+
+async def calculation_update_body(request: Request, exact: bool = Depends(exact_mode)) -> CalculationUpdate:
+    """Body of PUT /calculations/{calc_id} (JSON or packed float64)."""
+    return await _parse_calculation_body(request, CalculationUpdate, exact)
+
+
 # Create (Add) Calculation
 @app.post(
     "/calculations",
     response_model=CalculationResponse,
     status_code=status.HTTP_201_CREATED,
     tags=["calculations"],
+    openapi_extra=_calculation_body_openapi(CalculationBase),
 )
-def create_calculation(
-    calculation_data: CalculationBase,
+async def create_calculation(
+    calculation_data: CalculationBase = Depends(calculation_create_body),
+    dedupe: Optional[bool] = Query(
+        None,
+        description="Reuse the stored result of an identical calculation instead of computing it "
+                    "(defaults to the server's CALCULATIONS_DEDUPE_ON_CREATE)",
+    ),
+    exact: bool = Depends(exact_mode),
     current_user = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
     Create a new calculation for the authenticated user.
     Automatically computes the 'result'.
+
+    An input given as {"ref": "<calculation id>"} takes the result of
+    another of the user's calculations, and is kept up to date when that
+    calculation changes (see PUT /calculations/{calc_id}).
+
+    With exact=true, the arithmetic types compute in exact integer/decimal
+    arithmetic; results float64 cannot hold are stored in full and returned
+    as a summary (result_exact; see GET ?materialize=true for the digits).
+
+    Large input vectors can be sent packed instead of as a JSON list: either
+    base64 in an inputs_b64 field, or as an application/octet-stream body
+    with type (and expression) in the query string.
+
+    The result is awaited from the compute executor (heavy calculations run
+    in a worker process); database work runs in the threadpool. With dedupe,
+    an identical stored calculation (same inputs_hash, any user) supplies
+    the result through one index probe instead.
     """
+    if dedupe is None:
+        dedupe = settings.CALCULATIONS_DEDUPE_ON_CREATE
     try:
         new_calculation = Calculation.create(
             calculation_type=calculation_data.type,
             user_id=current_user.id,
             inputs=calculation_data.inputs,
+            expression=calculation_data.expression,
         )
-        new_calculation.result = new_calculation.get_result()
+        new_calculation.exact = exact  # references resolve at this mode's precision
+        inputs = calculation_data.inputs
+        if calculation_data.references:
+            inputs = await run_in_threadpool(
+                new_calculation.resolve_references, db, calculation_data.references
+            )
+        reused = None
+        if dedupe and not exact:
+            reused = await run_in_threadpool(Calculation.stored_result, db, new_calculation.hash_inputs())
+        if reused is not None:
+            new_calculation.store_result(reused)
+        else:
+            new_calculation.store_result(
+                await compute_result_async(new_calculation, inputs, exact=exact), exact
+            )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except ComputeError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    def save():
+        try:
+            db.add(new_calculation)
+            if calculation_data.references:
+                db.flush()
+                new_calculation.set_references(db, calculation_data.references)
+            db.commit()
+            db.refresh(new_calculation)
+            return new_calculation
+        except Exception:
+            db.rollback()
+            raise
+
+    return await run_in_threadpool(save)
+
+
+# Bulk Add Calculations
+@app.post(
+    "/calculations/batch",
+    response_model=CalculationBatchResponse,
+    tags=["calculations"],
+)
+def create_calculations_batch(
+    items: List[Dict[str, Any]] = Body(
+        ...,
+        min_length=1,
+        max_length=settings.CALCULATIONS_BATCH_MAX_ITEMS,
+        description="Calculations to create, each shaped like the POST /calculations body",
+    ),
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create many calculations for the authenticated user in one request.
 
-        db.add(new_calculation)
+    Each item is validated on its own; valid items are evaluated together by
+    the vectorized batch engine and stored with a single multi-row
+    INSERT ... RETURNING. The response reports success or failure per item.
+    """
+    results: List[Optional[CalculationBatchItemResult]] = [None] * len(items)
+
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            data = CalculationBase.model_validate(item)
+        except ValidationError as e:
+            message = "; ".join(error["msg"] for error in e.errors())
+            results[index] = CalculationBatchItemResult(index=index, error=message)
+            continue
+        if data.references:
+            results[index] = CalculationBatchItemResult(index=index, error=REFERENCES_NOT_SUPPORTED)
+        else:
+            valid.append((index, data))
+
+    outcomes = evaluate_batch([(data.type.value, data.inputs, data.expression) for _, data in valid])
+    to_insert = []
+    for (index, data), outcome in zip(valid, outcomes):
+        if outcome.ok:
+            to_insert.append((index, data, outcome.result))
+        else:
+            results[index] = CalculationBatchItemResult(index=index, error=outcome.error)
+
+    try:
+        stored = Calculation.insert_many(
+            db,
+            user_id=current_user.id,
+            rows=[(data.type.value, data.inputs, data.expression, result) for _, data, result in to_insert],
+        )
         db.commit()
-        db.refresh(new_calculation)
-        return new_calculation
+    except Exception:
+        db.rollback()
+        raise
+
+    for (index, _, _), row in zip(to_insert, stored):
+        results[index] = CalculationBatchItemResult(
+            index=index,
+            calculation=CalculationResponse.model_validate(row),
+        )
+
+    return CalculationBatchResponse(
+        created=len(stored),
+        failed=len(items) - len(stored),
+        results=results,
+    )
+
+
+# Bulk Import Calculations (CSV / NDJSON)
+@app.post(
+    "/calculations/import",
+    response_model=CalculationImportResponse,
+    tags=["calculations"],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                MEDIA_TYPES["ndjson"]: {"schema": {"type": "string", "description": "One calculation object per line"}},
+                MEDIA_TYPES["csv"]: {"schema": {"type": "string", "description": "A header line, then one calculation per line"}},
+            },
+        }
+    },
+)
+async def import_calculations(
+    request: Request,
+    import_format: Optional[str] = Query(
+        None, alias="format", pattern=f"^({'|'.join(IMPORT_FORMATS)})$",
+        description="ndjson or csv (defaults to csv for a text/csv body, else ndjson)",
+    ),
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Import calculations from an NDJSON or CSV body, in the format
+    GET /calculations/export writes (type, inputs, expression and
+    optionally created_at; results are recomputed).
+
+    The body is read as a stream and handled in chunks of
+    IMPORT_CHUNK_SIZE lines: each chunk is validated, evaluated by the
+    vectorized batch engine, loaded with COPY into a staging table and
+    inserted set-wise, then committed. Bad lines, and lines longer than
+    IMPORT_MAX_LINE_BYTES, are skipped and reported by line number without
+    aborting the load.
+    """
+    if import_format is None:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        import_format = "csv" if content_type == MEDIA_TYPES["csv"] else "ndjson"
+    importer = CalculationImporter(db, current_user.id, import_format)
+    body = request.stream()
+
+    def chunks() -> Iterator[bytes]:
+        # The importer runs in the threadpool; each body chunk is awaited on the event loop
+        while (data := anyio.from_thread.run(anext, body, None)) is not None:
+            yield data
+
+    return await run_in_threadpool(importer.read, chunks())
+
+
+# Bulk Delete / Recompute Calculations
+def _bulk_query(db: Session, user_id, selection: CalculationBulkFilter):
+    """The current user's calculations selected by a bulk-operation body."""
+    return Calculation.filter_query(
+        db,
+        user_id=user_id,
+        calculation_type=selection.type.value if selection.type else None,
+        ids=selection.ids,
+        created_after=_as_naive_utc(selection.created_after),
+        created_before=_as_naive_utc(selection.created_before),
+    )
+
+
+@app.post("/calculations/bulk-delete", response_model=CalculationBulkDeleteResponse, tags=["calculations"])
+def bulk_delete_calculations(
+    selection: CalculationBulkDeleteRequest,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Delete the current user's calculations by ids and/or by filter (type,
+    created_after, created_before), and return how many were deleted.
 
+    Rows are deleted set-wise in chunks of BULK_DELETE_CHUNK_SIZE, one
+    statement per chunk, each committed on its own; nothing is loaded
+    first. At least one criterion is required.
+    """
+    deleted = Calculation.delete_many(
+        db, _bulk_query(db, current_user.id, selection), chunk_size=settings.BULK_DELETE_CHUNK_SIZE
+    )
+    return CalculationBulkDeleteResponse(deleted=deleted)
+
+
+@app.post("/calculations/recompute", response_model=CalculationRecomputeResponse, tags=["calculations"])
+def recompute_calculations(
+    selection: CalculationBulkFilter = Body(default_factory=CalculationBulkFilter),
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Recompute and store the results of the current user's calculations
+    selected by ids and/or filter (all of them for an empty body), e.g.
+    after a kernel changed.
+
+    Rows are evaluated by the vectorized batch engine and updated in chunks
+    of BATCH_RECOMPUTE_CHUNK_SIZE, one UPDATE per chunk, each committed on
+    its own. Exact-mode results are left as they are. Calculations that
+    reference a changed result are recomputed with it, as after a PUT.
+    """
+    summary = Calculation.recompute_results(
+        db, query=_bulk_query(db, current_user.id, selection), chunk_size=settings.BATCH_RECOMPUTE_CHUNK_SIZE
+    )
+    return CalculationRecomputeResponse(**summary)
+
+
+# Find Identical Calculations
+@app.post(
+    "/calculations/lookup",
+    response_model=CalculationLookupResponse,
+    tags=["calculations"],
+    openapi_extra=_calculation_body_openapi(CalculationBase),
+)
+def lookup_identical_calculations(
+    calculation_data: CalculationBase = Depends(calculation_create_body),
+    scope: CalculationLookupScope = Query(
+        CalculationLookupScope.USER,
+        description="Count identical calculations of the current user only, or of every user",
+    ),
+    limit: int = Query(
+        settings.CALCULATIONS_LOOKUP_MAX_MATCHES,
+        ge=1,
+        le=settings.CALCULATIONS_LOOKUP_MAX_MATCHES,
+        description="Maximum number of the user's matching calculations to return",
+    ),
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Find stored calculations identical to the body, without creating one.
+
+    The body is hashed like a stored calculation (inputs_hash), so the
+    lookup is an index probe whatever the number of inputs. Other users'
+    calculations are only ever counted, never returned.
+    """
+    if calculation_data.references:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=REFERENCES_NOT_SUPPORTED)
+    inputs_hash = make_key(calculation_data.type.value, calculation_data.inputs, calculation_data.expression)
+    if inputs_hash is None:
+        return CalculationLookupResponse(count=0, calculations=[])
+
+    own = Calculation.find_identical(db, inputs_hash, user_id=current_user.id)
+    calculations = own.order_by(Calculation.created_at.desc(), Calculation.id.desc()).limit(limit).all()
+    if scope == CalculationLookupScope.GLOBAL:
+        count = Calculation.find_identical(db, inputs_hash).count()
+        result = Calculation.stored_result(db, inputs_hash)
+    else:
+        count = own.count()
+        result = next((calc.result for calc in calculations if calc.result is not None and not calc.exact), None)
+    return CalculationLookupResponse(
+        inputs_hash=inputs_hash,
+        count=count,
+        result=result,
+        calculations=calculations,
+    )
+
+
+# Evaluate Without Storing (no database access)
+def _evaluate_body_openapi() -> Dict[str, Any]:
+    """OpenAPI request body of POST /evaluate: one calculation body, or a list of them."""
+    extra = _calculation_body_openapi(CalculationBase)
+    content = extra["requestBody"]["content"]
+    single = content["application/json"]["schema"]
+    content["application/json"]["schema"] = {
+        "oneOf": [
+            single,
+            {"type": "array", "items": single, "minItems": 1, "maxItems": settings.CALCULATIONS_BATCH_MAX_ITEMS},
+        ]
+    }
+    return extra
+
+
+async def _evaluate_one(calculation_data: CalculationBase, user_id) -> EvaluationResponse:
+    """Compute one validated calculation through the result cache and executor, without storing it."""
+    if calculation_data.references:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=REFERENCES_NOT_SUPPORTED)
+    calculation_type = calculation_data.type.value
+    try:
+        # A transient instance (never added to a session) gives the cache and
+        # executor the same view of the calculation as create does
+        calculation = Calculation.create(
+            calculation_type=calculation_type,
+            user_id=user_id,
+            inputs=calculation_data.inputs,
+            expression=calculation_data.expression,
+        )
+        result = await compute_result_async(calculation, calculation_data.inputs)
     except ValueError as e:
-        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ComputeError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    return EvaluationResponse(
+        type=calculation_type,
+        result=result,
+        inputs_hash=make_key(calculation_type, calculation_data.inputs, calculation_data.expression),
+    )
+
+
+def _evaluate_items(items: List[Any]) -> EvaluationBatchResponse:
+    """Validate and evaluate a batch of calculation bodies, reporting per item."""
+    results: List[Optional[EvaluationBatchItemResult]] = [None] * len(items)
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            data = CalculationBase.model_validate(item)
+        except ValidationError as e:
+            message = "; ".join(error["msg"] for error in e.errors())
+            results[index] = EvaluationBatchItemResult(index=index, error=message)
+            continue
+        if data.references:
+            results[index] = EvaluationBatchItemResult(index=index, error=REFERENCES_NOT_SUPPORTED)
+        else:
+            valid.append((index, data))
+
+    outcomes = evaluate_batch([(data.type.value, data.inputs, data.expression) for _, data in valid])
+    for (index, _), outcome in zip(valid, outcomes):
+        results[index] = EvaluationBatchItemResult(index=index, result=outcome.result, error=outcome.error)
+
+    failed = sum(result.error is not None for result in results)
+    return EvaluationBatchResponse(evaluated=len(items) - failed, failed=failed, results=results)
+
+
+@app.post(
+    "/evaluate",
+    response_model=Union[EvaluationResponse, EvaluationBatchResponse],
+    tags=["calculations"],
+    openapi_extra=_evaluate_body_openapi(),
+)
+async def evaluate_calculations(
+    request: Request,
+    current_user = Depends(get_current_active_user),
+):
+    """
+    Compute calculations without storing them.
+
+    The body is one calculation, shaped like the POST /calculations body
+    (JSON, inputs_b64 or packed float64), or a JSON list of up to
+    CALCULATIONS_BATCH_MAX_ITEMS of them. Validation and kernels are the
+    ones create uses; nothing is written and the database is never touched.
+    A single calculation goes through the result cache and compute
+    executor; a list is evaluated by the vectorized batch engine and
+    reports success or failure per item.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    body = await request.body()
+    if content_type != PACKED_INPUTS_MEDIA_TYPE and body.lstrip().startswith(b"["):
+        try:
+            items = json.loads(body)
+        except ValueError:
+            raise RequestValidationError([
+                {"type": "json_invalid", "loc": ("body",), "msg": "JSON decode error", "input": {}}
+            ])
+        if not 1 <= len(items) <= settings.CALCULATIONS_BATCH_MAX_ITEMS:
+            raise RequestValidationError([{
+                "type": "value_error",
+                "loc": ("body",),
+                "msg": f"A batch must have between 1 and {settings.CALCULATIONS_BATCH_MAX_ITEMS} items",
+                "input": None,
+            }])
+        return await run_in_threadpool(_evaluate_items, items)
+
+    calculation_data = await _parse_calculation_body(request, CalculationBase)
+    return await _evaluate_one(calculation_data, current_user.id)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header matches etag (weak comparison, as RFC 9110 requires for it)."""
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    opaque = etag.removeprefix("W/")
+    return "*" in candidates or any(candidate.removeprefix("W/") == opaque for candidate in candidates)
+
+
+def _weak_etag(*parts: Any) -> str:
+    """A weak ETag standing for the given version parts (hashed, so nothing leaks)."""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+# Stored calculations can change at any time: caches may keep them but must
+# revalidate (a cheap 304 while the ETag still matches)
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+@app.get("/evaluate", response_model=EvaluationResponse, tags=["calculations"])
+async def evaluate_calculation(
+    request: Request,
+    response: Response,
+    calculation_type: str = Query(..., alias="type", description="Calculation type", example="addition"),
+    inputs: List[float] = Query(..., description="Inputs, one inputs= parameter each, in order"),
+    expression: Optional[str] = Query(None, description="Expression (expression type only)"),
+    current_user = Depends(get_current_active_user),
+):
+    """
+    Compute one calculation given in the query string, without storing it.
+
+    The result depends only on the query, so the response may be kept by
+    the client for EVALUATE_CACHE_MAX_AGE_SECONDS; it is Cache-Control:
+    private, since the endpoint requires authentication and shared caches
+    must not answer for other users. It carries the calculation's
+    inputs_hash as its ETag (weakened by CompressionMiddleware when the
+    body is compressed). A request whose If-None-Match holds that ETag gets
+    304 Not Modified without the result being computed.
+    """
+    try:
+        calculation_data = CalculationBase.model_validate(
+            {"type": calculation_type, "inputs": inputs, "expression": expression}
+        )
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("query", *error["loc"])} for error in e.errors(include_url=False)]
+        )
+
+    inputs_hash = make_key(calculation_data.type.value, calculation_data.inputs, calculation_data.expression)
+    headers = {"Cache-Control": f"private, max-age={settings.EVALUATE_CACHE_MAX_AGE_SECONDS}"}
+    if inputs_hash is not None:
+        etag = f'"{inputs_hash}"'
+        headers["ETag"] = etag
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None and _etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    evaluation = await _evaluate_one(calculation_data, current_user.id)
+    response.headers.update(headers)
+    return evaluation
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+@app.post(
+    "/evaluate/sweep",
+    tags=["calculations"],
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}, "description": "One JSON object per sweep point"}},
+)
+def sweep_calculation(
+    sweep: CalculationSweepRequest,
+    current_user = Depends(get_current_active_user),
+):
+    """
+    Evaluate a calculation over a grid of inputs, without storing anything.
+
+    Each input is a fixed number or a range ({start, stop, num}, {start,
+    stop, step} or {values}); every point of the ranges' Cartesian product
+    is evaluated, last range varying fastest. Points are evaluated one
+    vectorized chunk at a time and streamed as NDJSON lines ({"index",
+    "point", "result"} or {"index", "point", "error"}), so memory stays flat
+    however large the sweep (up to SWEEP_MAX_POINTS points).
+    """
+    return StreamingResponse(
+        sweep_ndjson(sweep.type.value, sweep.sweep_inputs(), sweep.expression),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"X-Sweep-Points": str(sweep.points)},
+    )
+
+
+# Chunked Upload Sessions (inputs too large for one request)
+def _get_upload(db: Session, upload_id: str, user_id, lock: bool = False) -> CalculationUpload:
+    """Load one of the user's upload sessions, optionally locking it for update."""
+    try:
+        upload_uuid = UUID(upload_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid upload id format.")
+    query = db.query(CalculationUpload).filter(
+        CalculationUpload.id == upload_uuid,
+        CalculationUpload.user_id == user_id,
+    )
+    if lock:
+        query = query.with_for_update()
+    upload = query.first()
+    if not upload:
+        raise HTTPException(status_code=404, detail="Upload not found.")
+    return upload
+
+
+async def _read_upload_chunk(request: Request) -> np.ndarray:
+    """Read a packed float64 chunk body, enforcing UPLOAD_MAX_CHUNK_BYTES while streaming."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type != PACKED_INPUTS_MEDIA_TYPE:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Chunks must be sent as {PACKED_INPUTS_MEDIA_TYPE} (little-endian float64).",
         )
+    body = bytearray()
+    async for part in request.stream():
+        body += part
+        if len(body) > settings.UPLOAD_MAX_CHUNK_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Chunks are limited to {settings.UPLOAD_MAX_CHUNK_BYTES} bytes.",
+            )
+    try:
+        values = unpack_floats(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not np.isfinite(values).all():
+        raise HTTPException(status_code=400, detail="Inputs must be a list of finite numbers.")
+    return values
+
+
+@app.post(
+    "/calculations/uploads",
+    response_model=CalculationUploadResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["calculations"],
+)
+def open_calculation_upload(
+    upload_data: CalculationUploadCreate,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Open a chunked upload session for a calculation with very many inputs.
+
+    Append the inputs with POST /calculations/uploads/{id}/chunks, then
+    create the calculation with POST /calculations/uploads/{id}/finalize.
+    """
+    try:
+        upload = CalculationUpload.open(db, current_user.id, upload_data.type.value)
+        db.commit()
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    db.refresh(upload)
+    return upload
+
+
+@app.get("/calculations/uploads/{upload_id}", response_model=CalculationUploadResponse, tags=["calculations"])
+def get_calculation_upload(
+    upload_id: str,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Return an upload session's progress, e.g. to find where to resume after
+    a failed chunk (input_count is the offset of the next chunk).
+    """
+    return _get_upload(db, upload_id, current_user.id)
+
+
+@app.post(
+    "/calculations/uploads/{upload_id}/chunks",
+    response_model=CalculationUploadResponse,
+    tags=["calculations"],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {PACKED_INPUTS_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}}},
+        }
+    },
+)
+async def append_calculation_upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: Optional[int] = Query(
+        None, ge=0, description="Index of the chunk's first input; must equal the upload's input_count"
+    ),
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Append the next chunk of inputs (packed little-endian float64).
+
+    The chunk is folded into the running result immediately and stored, so
+    memory use does not grow with the length of the upload. Sending offset
+    makes retries safe: a lost or repeated chunk is rejected with 409.
+    """
+    values = await _read_upload_chunk(request)
+
+    def append():
+        upload = _get_upload(db, upload_id, current_user.id, lock=True)
+        try:
+            upload.append(db, values, offset)
+            db.commit()
+        except UploadOffsetError as e:
+            db.rollback()
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        except ValueError as e:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=str(e))
+        db.refresh(upload)
+        return upload
+
+    return await run_in_threadpool(append)
+
+
+@app.post(
+    "/calculations/uploads/{upload_id}/finalize",
+    response_model=CalculationUploadFinalizeResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["calculations"],
+)
+def finalize_calculation_upload(
+    upload_id: str,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create the calculation from an upload's inputs and close the session.
+    """
+    upload = _get_upload(db, upload_id, current_user.id, lock=True)
+    summary = {"type": upload.type, "input_count": upload.input_count, "result": upload.running_result}
+    try:
+        summary["id"] = upload.finalize(db)
+        db.commit()
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    return summary
+
+
+@app.delete(
+    "/calculations/uploads/{upload_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    tags=["calculations"],
+)
+def abort_calculation_upload(
+    upload_id: str,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Abandon an upload session and discard its chunks.
+    """
+    upload = _get_upload(db, upload_id, current_user.id)
+    db.delete(upload)
+    db.commit()
+    return None
 
 
 # Browse / List Calculations
+def _as_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Convert an aware datetime to naive UTC, matching the created_at column."""
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
 @app.get("/calculations", response_model=List[CalculationResponse], tags=["calculations"])
 def list_calculations(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=settings.CALCULATIONS_MAX_PAGE_SIZE,
+        description="Maximum number of calculations to return (defaults to the configured page size)",
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque cursor from the X-Next-Cursor header of the previous page",
+    ),
+    calculation_type: Optional[CalculationType] = Query(
+        None, alias="type", description="Only return calculations of this type"
+    ),
+    created_after: Optional[datetime] = Query(None, description="Only return calculations created at or after this time"),
+    created_before: Optional[datetime] = Query(None, description="Only return calculations created before this time"),
+    result_min: Optional[float] = Query(None, description="Only return calculations with result >= this value"),
+    result_max: Optional[float] = Query(None, description="Only return calculations with result <= this value"),
+    sort: CalculationSort = Query(
+        CalculationSort.CREATED_AT_DESC,
+        description="Sort order; prefix with '-' for descending",
+    ),
     current_user = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
-    List all calculations belonging to the current authenticated user.
+    List the current user's calculations one page at a time.
+
+    Filtering and sorting happen in the database, on indexes that lead with
+    the user's id, so only matching rows are read.
+
+    Pagination is keyset-based: when more rows exist, the response carries an
+    X-Next-Cursor header whose value is passed back as ?cursor= (with the same
+    filters and sort) to fetch the next page. The body stays a plain JSON array.
+
+    Responses carry a weak ETag built from the user's listing version (a
+    counter bumped on every write to their calculations, see
+    Calculation.listing_version()) and the query string. A request whose
+    If-None-Match still matches gets 304 Not Modified after that single
+    lookup, before any row is loaded.
     """
-    calculations = db.query(Calculation).filter(Calculation.user_id == current_user.id).all()
+    field = sort.value.lstrip("-")
+    after = None
+    if cursor is not None:
+        try:
+            key = decode_cursor(cursor)
+            if key["sort"] != sort.value:
+                raise ValueError("Cursor was issued for a different sort order.")
+            value = datetime.fromisoformat(key["key"]) if field == "created_at" else float(key["key"])
+            after = (value, UUID(key["id"]))
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+
+    version = Calculation.listing_version(db, current_user.id)
+    etag = _weak_etag(current_user.id, version, request.url.query)
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+    query = Calculation.filter_query(
+        db,
+        user_id=current_user.id,
+        calculation_type=calculation_type.value if calculation_type else None,
+        created_after=_as_naive_utc(created_after),
+        created_before=_as_naive_utc(created_before),
+        result_min=result_min,
+        result_max=result_max,
+    )
+    calculations, next_key = Calculation.paginate(
+        query,
+        limit=limit or settings.CALCULATIONS_PAGE_SIZE,
+        sort=sort.value,
+        after=after,
+    )
+    if next_key is not None:
+        value, calc_id = next_key
+        response.headers["X-Next-Cursor"] = encode_cursor({
+            "sort": sort.value,
+            "key": value.isoformat() if field == "created_at" else value,
+            "id": str(calc_id),
+        })
     return calculations
 
 
+# Export the current user's calculations (registered before /calculations/{calc_id})
+@app.get(
+    "/calculations/export",
+    tags=["calculations"],
+    response_class=StreamingResponse,
+    responses={200: {"content": {MEDIA_TYPES["ndjson"]: {}, MEDIA_TYPES["csv"]: {}},
+                     "description": "One line per calculation, oldest first"}},
+)
+def export_calculations(
+    export_format: str = Query("ndjson", alias="format", pattern=f"^({'|'.join(EXPORT_FORMATS)})$",
+                               description="ndjson (one JSON object per line) or csv"),
+    calculation_type: Optional[CalculationType] = Query(
+        None, alias="type", description="Only export calculations of this type"
+    ),
+    created_after: Optional[datetime] = Query(None, description="Only export calculations created at or after this time"),
+    created_before: Optional[datetime] = Query(None, description="Only export calculations created before this time"),
+    result_min: Optional[float] = Query(None, description="Only export calculations with result >= this value"),
+    result_max: Optional[float] = Query(None, description="Only export calculations with result <= this value"),
+    current_user = Depends(get_current_active_user),
+):
+    """
+    Stream all of the current user's calculations (optionally filtered as in
+    GET /calculations) as NDJSON or CSV.
+
+    Rows are read through a server-side cursor in chunks of
+    EXPORT_CHUNK_SIZE and written as they arrive, so memory stays flat and
+    the download starts immediately however many rows there are. The stream
+    uses its own database session, open for as long as the download runs.
+    """
+    def stream():
+        db = SessionLocal()
+        try:
+            query = Calculation.filter_query(
+                db,
+                user_id=current_user.id,
+                calculation_type=calculation_type.value if calculation_type else None,
+                created_after=_as_naive_utc(created_after),
+                created_before=_as_naive_utc(created_before),
+                result_min=result_min,
+                result_max=result_max,
+            )
+            yield from stream_export(db, query, export_format)
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="calculations.{export_format}"'},
+    )
+
+
 # Read / Retrieve a Specific Calculation by ID
 @app.get("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
 def get_calculation(
     calc_id: str,
+    request: Request,
+    response: Response,
+    materialize: bool = Query(
+        False, description="Include the full digits of an exact result (result_exact.value)"
+    ),
     current_user = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
     Retrieve a single calculation by its UUID, if it belongs to the current user.
+
+    Exact results come back as a summary; with materialize=true the NUMERIC
+    result_exact column is loaded as well and its digits returned.
+
+    Responses carry a weak ETag derived from the row's updated_at. The
+    timestamp is probed first, so a request whose If-None-Match still
+    matches gets 304 Not Modified without the row being loaded.
     """
     try:
         calc_uuid = UUID(calc_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid calculation id format.")
 
-    calculation = db.query(Calculation).filter(
+    updated_at = db.query(Calculation.updated_at).filter(
+        Calculation.id == calc_uuid,
+        Calculation.user_id == current_user.id
+    ).scalar()
+    if updated_at is None:
+        raise HTTPException(status_code=404, detail="Calculation not found.")
+    etag = _weak_etag(calc_uuid, updated_at.isoformat(), materialize)
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    query = db.query(Calculation)
+    if materialize:
+        query = query.options(undefer(Calculation.result_exact))
+    calculation = query.filter(
         Calculation.id == calc_uuid,
         Calculation.user_id == current_user.id
     ).first()
     if not calculation:
         raise HTTPException(status_code=404, detail="Calculation not found.")
+    # Tagged with the version actually loaded, in case it changed since the probe
+    headers["ETag"] = _weak_etag(calc_uuid, calculation.updated_at.isoformat(), materialize)
+    response.headers.update(headers)
 
-    return calculation
+    calculation_response = CalculationResponse.model_validate(calculation)
+    if materialize and calculation_response.result_exact is not None:
+        calculation_response.result_exact.value = calculation.result_text
+    return calculation_response
 
 
 # Edit / Update a Calculation
@@ -379,53 +1346,181 @@ def update_calculation(
     db.refresh(calculation)
     return calculation
 """
-@app.put("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
-def update_calculation(
+@app.put(
+    "/calculations/{calc_id}",
+    response_model=CalculationResponse,
+    tags=["calculations"],
+    openapi_extra=_calculation_body_openapi(CalculationUpdate),
+)
+async def update_calculation(
     calc_id: str,
-    calculation_update: CalculationUpdate,
+    calculation_update: CalculationUpdate = Depends(calculation_update_body),
+    exact: bool = Depends(exact_mode),
     current_user = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
+    """
+    Update a calculation's type, inputs and/or expression and recompute it.
+
+    Like create, the body can be JSON (inputs or inputs_b64) or packed
+    float64 (application/octet-stream, type/expression in the query string),
+    and exact=true recomputes the result exactly.
+
+    Calculations that reference this one (directly or through others) are
+    then recomputed, in topological order and in the same transaction: if
+    one of them can no longer be computed, nothing is changed.
+    """
     try:
         calc_uuid = UUID(calc_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid calculation id format.")
 
-    # Fetch calculation
-    calculation = db.query(Calculation).filter(
-        Calculation.id == calc_uuid,
-        Calculation.user_id == current_user.id
-    ).first()
+    def load_and_apply():
+        # Fetch calculation
+        calculation = db.query(Calculation).filter(
+            Calculation.id == calc_uuid,
+            Calculation.user_id == current_user.id
+        ).first()
 
-    if not calculation:
-        raise HTTPException(status_code=404, detail="Calculation not found.")
+        if not calculation:
+            raise HTTPException(status_code=404, detail="Calculation not found.")
 
-    # Update fields
-    if calculation_update.type is not None:
-        calculation.type = calculation_update.type
+        # Update fields
+        if calculation_update.type is not None:
+            calculation.type = calculation_update.type
+            if calculation_update.type != "expression":
+                calculation.expression = None
 
-    if calculation_update.inputs is not None:
-        calculation.inputs = calculation_update.inputs
+        if calculation_update.inputs is not None:
+            calculation.inputs = calculation_update.inputs
 
-    db.flush()  # Write changes to DB but don't commit yet.
+        if calculation_update.expression is not None:
+            calculation.expression = calculation_update.expression
 
-    # Re-fetch to ensure polymorphic identity is refreshed
-    db.expunge(calculation)
-    calculation = db.query(Calculation).get(calc_uuid)
+        # Without new inputs, the stored (possibly decimal) ones keep their mode
+        calculation.exact = exact or (calculation_update.inputs is None and calculation.exact)
 
-    if not calculation:
-        raise HTTPException(status_code=404, detail="Calculation not found after refresh.")
+        db.flush()  # Write changes to DB but don't commit yet.
+
+        if calculation_update.inputs is not None:
+            # New inputs replace the references (none if they have none)
+            try:
+                calculation.set_references(db, calculation_update.references or {})
+            except ValueError as e:
+                db.rollback()
+                raise HTTPException(status_code=400, detail=str(e))
+
+        # Re-fetch to ensure polymorphic identity is refreshed
+        db.expunge(calculation)
+        calculation = db.query(Calculation).get(calc_uuid)
+
+        if not calculation:
+            raise HTTPException(status_code=404, detail="Calculation not found after refresh.")
+        if calculation.references:
+            try:
+                calculation.resolve_references(db)
+            except ValueError as e:
+                db.rollback()
+                raise HTTPException(status_code=400, detail=str(e))
+        return calculation
+
+    calculation = await run_in_threadpool(load_and_apply)
+    inputs = calculation_update.inputs if not calculation.references else None
 
     try:
-        calculation.result = calculation.get_result()
+        calculation.store_result(await compute_result_async(calculation, inputs, exact=calculation.exact))
+    except ComputeError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Calculation failed: {str(e)}")
 
-    calculation.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(calculation)
+    def save():
+        calculation.updated_at = datetime.utcnow()
+        try:
+            Calculation.recompute_downstream(db, calculation, compute=compute_result)
+        except ComputeError as e:
+            db.rollback()
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        except ValueError as e:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=str(e))
+        db.commit()
+        db.refresh(calculation)
+        return calculation
 
-    return calculation
+    return await run_in_threadpool(save)
+
+# Edit the tail of a Calculation's inputs
+@app.patch("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
+async def patch_calculation_inputs(
+    calc_id: str,
+    patch: CalculationInputsPatch,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Remove trailing inputs and/or append new ones.
+
+    For addition, subtraction, multiplication, division and modulo the new
+    result is derived from the stored one (only the removed and appended
+    inputs are touched); other types are recomputed from all inputs.
+    Dependent calculations are recomputed as after PUT.
+    """
+    try:
+        calc_uuid = UUID(calc_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid calculation id format.")
+
+    def load_and_patch():
+        calculation = db.query(Calculation).filter(
+            Calculation.id == calc_uuid,
+            Calculation.user_id == current_user.id
+        ).with_for_update().first()
+        if not calculation:
+            raise HTTPException(status_code=404, detail="Calculation not found.")
+        references = calculation.references
+        remaining = len(calculation.kernel_inputs) - patch.remove
+        try:
+            derived = calculation.patch_inputs(patch.remove, patch.append)
+        except ValueError as e:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=str(e))
+        kept = {position: source_id for position, source_id in references.items() if position < remaining}
+        if kept != references:
+            calculation.set_references(db, kept)  # the removed inputs' references go with them
+        return calculation, derived
+
+    calculation, derived = await run_in_threadpool(load_and_patch)
+
+    if derived is None:
+        try:
+            calculation.store_result(
+                await compute_result_async(calculation, calculation.kernel_inputs, exact=calculation.exact)
+            )
+        except ComputeError as e:
+            await run_in_threadpool(db.rollback)
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        except ValueError as e:
+            await run_in_threadpool(db.rollback)
+            raise HTTPException(status_code=400, detail=str(e))
+
+    def save():
+        calculation.updated_at = datetime.utcnow()
+        try:
+            Calculation.recompute_downstream(db, calculation, compute=compute_result)
+        except ComputeError as e:
+            db.rollback()
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        except ValueError as e:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=str(e))
+        db.commit()
+        db.refresh(calculation)
+        return calculation
+
+    return await run_in_threadpool(save)
 
 # Delete a Calculation
 @app.delete("/calculations/{calc_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["calculations"])
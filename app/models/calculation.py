@@ -15,13 +15,32 @@ basic mathematical operations: addition, subtraction, multiplication, and divisi
 """
 
 from datetime import datetime
+from decimal import Decimal
 import uuid
-from typing import List
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Float
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import (
+    DDL, Boolean, CheckConstraint, Column, String, Text, DateTime, ForeignKey, JSON, Float, Index, LargeBinary, Numeric,
+    cast, delete, column, event, false, insert, inspect, select, tuple_, update, values,
+)
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship, declared_attr
+from sqlalchemy.orm import deferred, relationship, declared_attr, has_inherited_table
 from sqlalchemy.ext.declarative import declared_attr
+from app.core.config import settings
+from app.core.packing import can_pack, pack_floats, unpack_floats
 from app.database import Base
+from app.models.dependency import CalculationDependency, DependencyCycleError, topological_order, would_create_cycle
+from app.operations import exact as exact_kernels
+from app.operations import kernels, statistics
+from app.operations.cache import make_key
+from app.operations.storage import LISTING_VERSION_STATEMENTS
+
+def _decode_decimals(values: Any) -> Any:
+    """Stored JSON inputs with the digit strings of exact-mode decimals turned back into Decimals."""
+    if isinstance(values, list) and any(isinstance(value, str) for value in values):
+        return [Decimal(value) if isinstance(value, str) else value for value in values]
+    return values
+
 
 class AbstractCalculation:
     """
@@ -34,6 +53,9 @@ class AbstractCalculation:
     Design Pattern: Template Method - Defines the skeleton of the calculation
     algorithm in a method, deferring some steps to subclasses.
     """
+
+    # Columns a calculation listing can be sorted by (see paginate())
+    SORT_FIELDS = ("created_at", "result")
     
     @declared_attr
     def __tablename__(cls):
@@ -44,6 +66,42 @@ class AbstractCalculation:
         """
         return 'calculations'
 
+    @declared_attr
+    def __table_args__(cls):
+        """
+        Composite indexes for the calculations table.
+
+        Every listing is scoped to one user, so each index leads with user_id
+        and ends with id (the keyset tie-breaker):
+        - ix_calculations_user_created_id: default newest-first listing and
+          created_at ranges; its prefix also covers plain user_id lookups
+        - ix_calculations_user_type_created_id: type filters, still in
+          created_at order
+        - ix_calculations_user_result_id: result ranges and result sorting
+
+        ix_calculations_inputs_hash_user serves identical-calculation
+        lookups: its inputs_hash prefix finds matches across all users, and
+        the full key finds one user's matches.
+
+        The check constraint requires the inputs in at least one of the two
+        storage columns (see inputs).
+
+        Only the base model declares them; the single-table subclasses
+        share its table.
+        """
+        if has_inherited_table(cls):
+            return None
+        return (
+            Index('ix_calculations_user_created_id', 'user_id', 'created_at', 'id'),
+            Index('ix_calculations_user_type_created_id', 'user_id', 'type', 'created_at', 'id'),
+            Index('ix_calculations_user_result_id', 'user_id', 'result', 'id'),
+            Index('ix_calculations_inputs_hash_user', 'inputs_hash', 'user_id'),
+            CheckConstraint(
+                'inputs IS NOT NULL OR inputs_packed IS NOT NULL',
+                name='ck_calculations_inputs_present',
+            ),
+        )
+
     @declared_attr
     def id(cls):
         """
@@ -73,8 +131,8 @@ class AbstractCalculation:
         return Column(
             UUID(as_uuid=True), 
             ForeignKey('users.id', ondelete='CASCADE'),
-            nullable=False,
-            index=True  # Index for faster queries filtering by user_id
+            nullable=False
+            # Indexed through ix_calculations_user_created_id (see __table_args__)
         )
 
     @declared_attr
@@ -87,20 +145,135 @@ class AbstractCalculation:
         """
         return Column(
             String(50), 
-            nullable=False,
-            index=True  # Index for faster queries filtering by type
+            nullable=False
+            # Indexed per user through ix_calculations_user_type_created_id
         )
 
     @declared_attr
-    def inputs(cls):
+    def inputs_json(cls):
         """
-        JSON column storing the input values for the calculation.
+        JSON column ("inputs") storing the input values for the calculation.
         
         Using JSON type allows flexible storage of any number of inputs.
+        NULL when the inputs are stored packed (see inputs_packed).
         """
         return Column(
-            JSON, 
-            nullable=False
+            'inputs',
+            JSON(none_as_null=True),
+            nullable=True
+        )
+
+    @declared_attr
+    def inputs_packed(cls):
+        """
+        Binary column storing the inputs as packed little-endian float64.
+
+        8 bytes per input, decoded without parsing (see inputs_array).
+        Used when INPUTS_STORAGE_FORMAT is "binary"; NULL otherwise.
+        """
+        return Column(
+            LargeBinary,
+            nullable=True
+        )
+
+    @property
+    def inputs(self) -> Any:
+        """
+        The input values, read from whichever storage column is set.
+
+        Rows written in either format (and rows converted between them)
+        read the same way, so the two can coexist during a migration.
+        Assigning stores the values in the configured INPUTS_STORAGE_FORMAT;
+        values that cannot be packed exactly are always stored as JSON.
+        """
+        if self.inputs_packed is not None:
+            return unpack_floats(self.inputs_packed).tolist()
+        return _decode_decimals(self.inputs_json)
+
+    @inputs.setter
+    def inputs(self, values: Any) -> None:
+        self.inputs_json, self.inputs_packed = self.storage_values(values)
+
+    @property
+    def inputs_array(self) -> np.ndarray:
+        """
+        The input values as a float64 array.
+
+        For packed rows this is a zero-copy, read-only view over the stored
+        bytes; JSON rows are converted.
+        """
+        if self.inputs_packed is not None:
+            return unpack_floats(self.inputs_packed)
+        return np.asarray(_decode_decimals(self.inputs_json), dtype=np.float64)
+
+    @property
+    def kernel_inputs(self) -> Any:
+        """
+        The inputs in the cheapest form for the NumPy kernels: the zero-copy
+        array for packed rows, the stored list otherwise.
+        """
+        if self.inputs_packed is not None:
+            return unpack_floats(self.inputs_packed)
+        return _decode_decimals(self.inputs_json)
+
+    @staticmethod
+    def storage_values(values: Any) -> Tuple[Any, Optional[bytes]]:
+        """
+        Split inputs into (JSON value, packed value) for storage.
+
+        Args:
+            values: The input values
+
+        Returns:
+            Tuple: (inputs_json, inputs_packed), exactly one of them not None
+        """
+        if isinstance(values, list) and any(isinstance(value, Decimal) for value in values):
+            # Exact-mode inputs: JSON has no decimal type, so decimals are
+            # stored as their digit strings (see decode_inputs), never packed
+            return [str(value) if isinstance(value, Decimal) else value for value in values], None
+        if settings.INPUTS_STORAGE_FORMAT == "binary" and can_pack(values):
+            return None, pack_floats(values)
+        if isinstance(values, np.ndarray):
+            return values.tolist(), None
+        return values, None
+
+    def hash_inputs(self) -> Optional[str]:
+        """The canonical inputs hash of the calculation's current type, expression and inputs."""
+        return make_key(self.type, self.kernel_inputs, self.expression)
+
+    @staticmethod
+    def decode_inputs(inputs_json: Any, inputs_packed: Optional[bytes]) -> Any:
+        """Inputs of a raw row (e.g. from a core query) as stored values."""
+        if inputs_packed is not None:
+            return unpack_floats(inputs_packed)
+        return _decode_decimals(inputs_json)
+
+    @declared_attr
+    def expression(cls):
+        """
+        Arithmetic expression text, for the expression calculation type.
+
+        NULL for every other type. The expression's variables are bound to
+        the inputs in order of first appearance.
+        """
+        return Column(
+            Text,
+            nullable=True
+        )
+
+    @declared_attr
+    def inputs_hash(cls):
+        """
+        Canonical hash of the calculation's type, expression and inputs.
+
+        The result cache key (see app.operations.cache.make_key), so
+        identical calculations share it whatever their storage format.
+        Kept current on every insert and update (see hash_inputs); NULL
+        for inputs that cannot be hashed exactly (huge integers).
+        """
+        return Column(
+            String(64),
+            nullable=True
         )
 
     @declared_attr
@@ -116,6 +289,93 @@ class AbstractCalculation:
             nullable=True
         )
 
+    @declared_attr
+    def result_exact(cls):
+        """
+        The exact result, for exact-mode results that float64 cannot hold.
+
+        NUMERIC keeps every digit (up to EXACT_MAX_DIGITS). Deferred: it
+        is only loaded when the digits are asked for (undefer() or first
+        access), so listing rows with huge results stays cheap. NULL when
+        result holds the result exactly.
+        """
+        return deferred(Column(
+            Numeric,
+            nullable=True
+        ))
+
+    @declared_attr
+    def result_exact_summary(cls):
+        """
+        Sign, log10 magnitude, digit count and digest of result_exact
+        (see app.operations.exact.summarize), returned instead of the digits.
+        NULL whenever result_exact is.
+        """
+        return Column(
+            JSON(none_as_null=True),
+            nullable=True
+        )
+
+    @declared_attr
+    def exact(cls):
+        """
+        Whether the calculation is computed in exact mode (?exact=true).
+
+        Set by store_result(). Recomputations (of references, downstream
+        calculations, patched inputs) keep the mode, and identical-result
+        reuse (stored_result) skips exact rows.
+        """
+        return Column(
+            Boolean,
+            nullable=False,
+            default=False,
+            server_default=false()
+        )
+
+    def store_result(self, value: Any, exact: Optional[bool] = None) -> None:
+        """
+        Store a computed result.
+
+        Plain results, and exact-mode results that survive a float64 round
+        trip, go to result alone. Larger or more precise exact-mode results
+        also go to result_exact and result_exact_summary, with result holding
+        the nearest float (NULL when out of float range).
+
+        Args:
+            value: The result (float, int or Decimal), or None
+            exact: Whether the result was computed in exact mode (defaults
+                   to the calculation's current mode)
+
+        Raises:
+            ValueError: If a float result overflowed to infinity or is NaN
+        """
+        exact = bool(self.exact) if exact is None else exact
+        self.exact = exact
+        if exact and exact_kernels.needs_exact_storage(value):
+            self.result = exact_kernels.float_approximation(value)
+            self.result_exact = Decimal(value)
+            self.result_exact_summary = exact_kernels.summarize(value)
+            return
+        if isinstance(value, float) and not np.isfinite(value):
+            raise ValueError(kernels.NOT_FINITE)
+        self.result = float(value) if isinstance(value, Decimal) else value
+        self.result_exact = None
+        self.result_exact_summary = None
+
+    @property
+    def result_value(self) -> Any:
+        """The result at full precision: result_exact when set (loads it if needed), else result."""
+        if self.result_exact_summary is not None:
+            return self.result_exact
+        return self.result
+
+    @property
+    def result_text(self) -> Optional[str]:
+        """The full result as a decimal digit string (loads result_exact if needed)."""
+        if self.result_exact_summary is not None:
+            return exact_kernels.canonical_text(self.result_exact)
+        return None if self.result is None else repr(self.result)
+
     @declared_attr
     def created_at(cls):
         """
@@ -153,8 +413,222 @@ class AbstractCalculation:
         """
         return relationship("User", back_populates="calculations")
 
+    @declared_attr
+    def dependencies(cls):
+        """
+        The inputs that reference other calculations (see app.models.dependency).
+
+        Read-only: edges are written by set_references(). Loaded with one
+        extra query per batch of calculations (selectin), not one per row.
+        """
+        return relationship(
+            CalculationDependency,
+            foreign_keys=[CalculationDependency.calculation_id],
+            primaryjoin=lambda: cls.id == CalculationDependency.calculation_id,
+            order_by=CalculationDependency.position,
+            viewonly=True,
+            lazy="selectin",
+        )
+
+    @property
+    def references(self) -> Dict[int, uuid.UUID]:
+        """The referenced calculation of each referencing input, by input position."""
+        return {dependency.position: dependency.source_id for dependency in self.dependencies}
+
+    def set_references(self, db, references: Dict[int, uuid.UUID]) -> None:
+        """
+        Replace the calculation's references (the row must be flushed).
+
+        Args:
+            db: SQLAlchemy database session
+            references: The referenced calculation id of each referencing
+                        input, by input position
+
+        Raises:
+            DependencyCycleError: If a referenced calculation is this one or
+                                  depends on it
+        """
+        if would_create_cycle(db, self.id, set(references.values())):
+            raise DependencyCycleError("Calculation references would create a cycle.")
+        table = CalculationDependency.__table__
+        db.execute(delete(table).where(table.c.calculation_id == self.id))
+        if references:
+            db.execute(insert(table), [
+                {"calculation_id": self.id, "position": position, "source_id": source_id}
+                for position, source_id in sorted(references.items())
+            ])
+        # References are part of the calculation, so replacing them is a change
+        self.updated_at = datetime.utcnow()
+        db.expire(self, ["dependencies"])
+
+    def resolve_references(
+        self,
+        db,
+        references: Optional[Dict[int, uuid.UUID]] = None,
+        known: Optional[Dict[uuid.UUID, Any]] = None,
+    ) -> List[Any]:
+        """
+        Copy the referenced calculations' results into the inputs.
+
+        Exact-mode calculations take the results at full precision (see
+        result_value), the others their nearest float.
+
+        Args:
+            db: SQLAlchemy database session
+            references: Positions and referenced ids (defaults to the stored
+                        references)
+            known: Full-precision results already at hand, by calculation
+                   id; the others are read in one query (the user's own
+                   calculations only)
+
+        Returns:
+            List: The resolved inputs, also stored on the calculation
+
+        Raises:
+            ValueError: If a referenced calculation does not exist (for this
+                        user), has no result, or a position is out of range
+        """
+        references = self.references if references is None else references
+        inputs = self.kernel_inputs
+        inputs = inputs.tolist() if isinstance(inputs, np.ndarray) else list(inputs)
+        results = dict(known or {})
+        missing = set(references.values()) - results.keys()
+        if missing:
+            rows = (
+                db.query(Calculation.id, Calculation.result, Calculation.result_exact, Calculation.result_exact_summary)
+                .filter(Calculation.id.in_(missing), Calculation.user_id == self.user_id)
+                .all()
+            )
+            results.update(
+                (row.id, row.result if row.result_exact_summary is None else row.result_exact) for row in rows
+            )
+        for position, source_id in references.items():
+            if not 0 <= position < len(inputs):
+                raise ValueError(f"Reference position {position} is out of range.")
+            if source_id not in results:
+                raise ValueError(f"Referenced calculation {source_id} not found.")
+            value = results[source_id]
+            if value is not None and not self.exact:
+                value = exact_kernels.float_approximation(value)
+            if value is None:
+                raise ValueError(f"Referenced calculation {source_id} has no result.")
+            inputs[position] = value
+        self.inputs = inputs
+        return inputs
+
+    @classmethod
+    def recompute_downstream(
+        cls,
+        db,
+        calculation: "Calculation",
+        compute: Optional[Callable[["Calculation", Any, bool], Any]] = None,
+    ) -> int:
+        """
+        Recompute every calculation that depends on calculation, in topological order.
+
+        Only the calculations downstream of the changed one are touched:
+        they are located with one recursive query, locked, and recomputed
+        each after all of its sources, so each sees its sources' new
+        results. Each is recomputed in its own mode (exact or float), and
+        results are passed on at full precision. Nothing is committed; on
+        an error the caller rolls back, so the graph is updated in one
+        transaction or not at all.
+
+        Args:
+            db: SQLAlchemy database session
+            calculation: The calculation whose result changed (flushed)
+            compute: Computes one calculation's result from (calculation,
+                     inputs, exact); defaults to evaluating it inline. The
+                     API passes app.operations.executor.compute_result, so
+                     dependents go through the compute executor too.
+
+        Returns:
+            int: Number of calculations recomputed
+
+        Raises:
+            ValueError: If a downstream calculation can no longer be computed
+            ComputeError: If compute could not schedule or finish one
+        """
+        order = topological_order(db, calculation.id)
+        return cls._recompute_in_order(db, order, {calculation.id: calculation.result_value}, compute)
+
     @classmethod
-    def create(cls, calculation_type: str, user_id: uuid.UUID, inputs: List[float]) -> "Calculation":
+    def _recompute_in_order(
+        cls,
+        db,
+        order: List[uuid.UUID],
+        known: Dict[uuid.UUID, Any],
+        compute: Optional[Callable[["Calculation", Any, bool], Any]] = None,
+        failed: Optional[List[uuid.UUID]] = None,
+    ) -> int:
+        """
+        Recompute calculations from their references, in the given order.
+
+        The rows are locked and recomputed one after the other; known maps
+        the ids of results already at hand to their full-precision values,
+        and grows as rows are recomputed. With failed, a row that cannot be
+        recomputed keeps its previous result and its id is appended to
+        failed; otherwise the ValueError is raised.
+
+        Returns:
+            int: Number of calculations recomputed
+        """
+        if not order:
+            return 0
+        rows = {row.id: row for row in db.query(cls).filter(cls.id.in_(order)).with_for_update()}
+        recomputed = 0
+        for calculation_id in order:
+            row = rows[calculation_id]
+            try:
+                inputs = row.resolve_references(db, known=known)
+                if compute is None:
+                    result = kernels.evaluate(row.type, inputs, row.expression, exact=row.exact)
+                else:
+                    result = compute(row, inputs, row.exact)
+                row.store_result(result)
+            except ValueError as e:
+                if failed is None:
+                    raise ValueError(f"Dependent calculation {calculation_id} could not be recomputed: {e}")
+                db.expire(row)  # drop the half-applied inputs and result
+                failed.append(calculation_id)
+                continue
+            row.updated_at = datetime.utcnow()
+            known[calculation_id] = row.result_value
+            recomputed += 1
+        db.flush()
+        return recomputed
+
+    @classmethod
+    def class_for(cls, calculation_type: str) -> type:
+        """
+        The Calculation subclass mapped to a calculation type.
+
+        Every type in the operation registry has one: the built-in classes
+        below, or a class generated for a plugin operation (see
+        _operation_class()).
+
+        Args:
+            calculation_type: The calculation type (case-insensitive)
+
+        Returns:
+            type: The subclass
+
+        Raises:
+            ValueError: If the calculation_type is not supported
+        """
+        name = calculation_type.lower() if isinstance(calculation_type, str) else None
+        if name not in kernels.operation_names():
+            raise ValueError(f"Unsupported calculation type: {calculation_type}")
+        return _operation_class(name)
+
+    @classmethod
+    def create(
+        cls,
+        calculation_type: str,
+        user_id: uuid.UUID,
+        inputs: List[float],
+        expression: Optional[str] = None,
+    ) -> "Calculation":
         """
         Factory method to create calculation instances of the appropriate type.
         
@@ -166,6 +640,7 @@ class AbstractCalculation:
             calculation_type: The type of calculation to create (e.g., "addition")
             user_id: The UUID of the user who owns this calculation
             inputs: List of numeric inputs for the calculation
+            expression: The expression text (expression calculations only)
             
         Returns:
             An instance of the appropriate Calculation subclass
@@ -173,33 +648,533 @@ class AbstractCalculation:
         Raises:
             ValueError: If the calculation_type is not supported
         """
-        calculation_classes = {
-            'addition': Addition,
-            'subtraction': Subtraction,
-            'multiplication': Multiplication,
-            'division': Division,
-            'exponentiation': Exponentiation,
-            'modulo': Modulo,
-        }
-        calculation_class = calculation_classes.get(calculation_type.lower())
-        if not calculation_class:
-            raise ValueError(f"Unsupported calculation type: {calculation_type}")
+        calculation_class = cls.class_for(calculation_type)
+        if expression is not None:
+            return calculation_class(user_id=user_id, inputs=inputs, expression=expression)
         return calculation_class(user_id=user_id, inputs=inputs)
 
+    @classmethod
+    def filter_query(
+        cls,
+        db,
+        user_id: uuid.UUID,
+        calculation_type: Optional[str] = None,
+        ids: Optional[Collection[uuid.UUID]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        result_min: Optional[float] = None,
+        result_max: Optional[float] = None,
+    ):
+        """
+        Build a query for a user's calculations narrowed by optional filters.
+
+        Every filter is a sargable predicate on an indexed column, so the
+        planner can range-scan one of the (user_id, ...) composite indexes
+        instead of reading the user's whole history.
+
+        Args:
+            db: SQLAlchemy database session
+            user_id: The UUID of the user whose calculations to query
+            calculation_type: Only include calculations of this type
+            ids: Only include calculations with these ids
+            created_after: Only include calculations created at or after this time
+            created_before: Only include calculations created strictly before this time
+            result_min: Only include calculations whose result is >= this value
+            result_max: Only include calculations whose result is <= this value
+
+        Returns:
+            Query: The filtered (unordered) query
+        """
+        query = db.query(cls).filter(cls.user_id == user_id)
+        if calculation_type is not None:
+            query = query.filter(cls.type == calculation_type)
+        if ids is not None:
+            query = query.filter(cls.id.in_(ids))
+        if created_after is not None:
+            query = query.filter(cls.created_at >= created_after)
+        if created_before is not None:
+            query = query.filter(cls.created_at < created_before)
+        if result_min is not None:
+            query = query.filter(cls.result >= result_min)
+        if result_max is not None:
+            query = query.filter(cls.result <= result_max)
+        return query
+
+    @classmethod
+    def listing_version(cls, db, user_id: uuid.UUID) -> int:
+        """
+        A cheap version of a user's calculations, for list ETags.
+
+        Database triggers bump users.calculations_version on every insert,
+        update and delete of the user's calculations (see
+        app.operations.storage.LISTING_VERSION_STATEMENTS), so reading it is
+        one primary-key lookup, however many rows the user has.
+
+        Args:
+            db: SQLAlchemy database session
+            user_id: The UUID of the user
+
+        Returns:
+            int: The version, 0 for a user who never stored a calculation
+        """
+        from app.models.user import User
+        return db.execute(select(User.calculations_version).where(User.id == user_id)).scalar() or 0
+
+    @classmethod
+    def paginate(
+        cls,
+        query,
+        limit: int,
+        sort: str = "-created_at",
+        after: Optional[Tuple[Any, uuid.UUID]] = None,
+    ) -> Tuple[List["Calculation"], Optional[Tuple[Any, uuid.UUID]]]:
+        """
+        Return one page of a calculations query using keyset pagination.
+
+        Instead of OFFSET (which makes the database walk and discard every
+        skipped row), the page starts strictly after the (sort value, id) key
+        of the previous page's last row. Combined with the matching
+        (user_id, ..., id) composite index this is a single index range scan,
+        so deep pages cost the same as the first one.
+
+        When sorting by result, rows without a result are left out, since
+        NULL cannot take part in the keyset comparison.
+
+        Args:
+            query: A query from filter_query()
+            limit: Maximum number of rows to return
+            sort: One of SORT_FIELDS, optionally prefixed with "-" for descending order
+            after: The (sort value, id) key of the last row already seen, if any
+
+        Returns:
+            tuple: (rows, next_key) where next_key is the key to pass as
+                   ``after`` for the following page, or None on the last page
+
+        Raises:
+            ValueError: If the sort field is not supported
+        """
+        descending = sort.startswith("-")
+        field = sort.lstrip("-")
+        if field not in cls.SORT_FIELDS:
+            raise ValueError(f"Unsupported sort field: {field}")
+        column = getattr(cls, field)
+
+        if field == "result":
+            query = query.filter(column.isnot(None))
+        if after is not None:
+            key = tuple_(column, cls.id)
+            query = query.filter(key < tuple_(*after) if descending else key > tuple_(*after))
+
+        if descending:
+            query = query.order_by(column.desc(), cls.id.desc())
+        else:
+            query = query.order_by(column.asc(), cls.id.asc())
+        # Fetch one extra row to learn whether another page exists
+        rows = query.limit(limit + 1).all()
+
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, (getattr(last, field), last.id)
+
+    @classmethod
+    def insert_many(
+        cls,
+        db,
+        user_id: uuid.UUID,
+        rows: List[Tuple[str, List[float], Optional[str], Optional[float]]],
+    ) -> List[dict]:
+        """
+        Insert many calculations with one multi-row INSERT ... RETURNING.
+
+        This bypasses the ORM unit of work: no instances are tracked and no
+        per-row refresh is needed, because the RETURNING clause hands back
+        the server-side values in the same round trip. The caller commits.
+
+        Args:
+            db: SQLAlchemy database session
+            user_id: The UUID of the user who owns the calculations
+            rows: (calculation_type, inputs, expression, result) tuples
+
+        Returns:
+            List[dict]: One dict of column values per inserted row, in input order
+        """
+        if not rows:
+            return []
+        table = cls.__table__
+        now = datetime.utcnow()
+        values_list = []
+        for calculation_type, inputs, expression, result in rows:
+            inputs_json, inputs_packed = cls.storage_values(inputs)
+            values_list.append({
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "type": calculation_type,
+                "inputs": inputs_json,
+                "inputs_packed": inputs_packed,
+                "expression": expression,
+                "inputs_hash": make_key(calculation_type, inputs, expression),
+                "result": result,
+                "created_at": now,
+                "updated_at": now,
+            })
+        returned = db.execute(
+            insert(table).values(values_list).returning(*table.c)
+        ).mappings().all()
+
+        def as_dict(row) -> dict:
+            data = dict(row)
+            packed = data.pop("inputs_packed")
+            if packed is not None:
+                data["inputs"] = unpack_floats(packed).tolist()
+            return data
+
+        # Postgres does not promise RETURNING order, so match rows back by id
+        by_id = {row["id"]: as_dict(row) for row in returned}
+        return [by_id[row["id"]] for row in values_list]
+
+    @classmethod
+    def recompute_results(cls, db, query=None, chunk_size: int = 5000) -> dict:
+        """
+        Recompute and store the results of many calculations in bulk.
+
+        Rows are read in primary-key order in chunks of chunk_size (keyset
+        on id, so each chunk is an index range scan), evaluated together by
+        the vectorized batch engine, and written back with a single
+        UPDATE ... FROM (VALUES ...) statement per chunk. Each chunk is
+        committed on its own so locks are held only briefly.
+
+        Rows whose evaluation fails keep their previous result and are
+        counted as failed. Exact-mode calculations are left alone, since
+        the float batch engine would round their inputs and results.
+
+        When results change, the calculations that reference them (directly
+        or not) are recomputed in the same chunk's transaction, in
+        topological order and each in its own mode, as a single update
+        would (see recompute_downstream()). Dependents that can no longer
+        be computed keep their previous result and are counted as failed.
+
+        Args:
+            db: SQLAlchemy database session
+            query: Optional query (e.g. from filter_query()) restricting the rows
+            chunk_size: Number of rows evaluated and updated per statement
+
+        Returns:
+            dict: {"updated": <rows updated>, "dependents": <dependents
+            recomputed>, "failed": <rows that could not be evaluated>}
+        """
+        from app.operations.batch import evaluate_batch
+
+        base = query if query is not None else db.query(cls)
+        base = base.filter(cls.exact.is_(False))
+        base = base.with_entities(cls.id, cls.type, cls.inputs_json, cls.inputs_packed, cls.expression, cls.result)
+        table = cls.__table__
+        summary = {"updated": 0, "dependents": 0, "failed": 0}
+        last_id = None
+
+        while True:
+            chunk = base if last_id is None else base.filter(cls.id > last_id)
+            rows = chunk.order_by(cls.id).limit(chunk_size).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            outcomes = evaluate_batch([
+                (row.type, cls.decode_inputs(row.inputs_json, row.inputs_packed), row.expression)
+                for row in rows
+            ])
+            data = [(row.id, outcome.result) for row, outcome in zip(rows, outcomes) if outcome.ok]
+            changed = [
+                row.id for row, outcome in zip(rows, outcomes) if outcome.ok and outcome.result != row.result
+            ]
+            summary["failed"] += len(rows) - len(data)
+
+            if data:
+                new_results = values(
+                    column("row_id", table.c.id.type),
+                    column("new_result", table.c.result.type),
+                    name="new_results",
+                ).data(data)
+                db.execute(
+                    update(table)
+                    .where(table.c.id == new_results.c.row_id)
+                    .values(result=new_results.c.new_result, updated_at=datetime.utcnow())
+                )
+                summary["updated"] += len(data)
+            if changed:
+                failed: List[uuid.UUID] = []
+                order = topological_order(db, changed)
+                summary["dependents"] += cls._recompute_in_order(db, order, {}, failed=failed)
+                summary["failed"] += len(failed)
+            db.commit()
+
+        return summary
+
+    @classmethod
+    def delete_many(cls, db, query, chunk_size: int = 5000) -> int:
+        """
+        Delete every calculation matched by a query, in chunks.
+
+        Each chunk is one DELETE ... WHERE id IN (SELECT id ... LIMIT
+        chunk_size) statement, committed on its own, so no lock is held for
+        longer than one chunk and concurrent requests keep being served.
+        Nothing is loaded into the session; dependency edges go with their
+        calculations (ON DELETE CASCADE).
+
+        Args:
+            db: SQLAlchemy database session
+            query: A query (e.g. from filter_query()) selecting the rows to delete
+            chunk_size: Number of rows deleted per statement
+
+        Returns:
+            int: Number of rows deleted
+        """
+        table = cls.__table__
+        ids = query.with_entities(cls.id).order_by(cls.id).limit(chunk_size).statement
+        deleted = 0
+        while True:
+            count = db.execute(
+                delete(table).where(table.c.id.in_(ids)).execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+            deleted += count
+            if count < chunk_size:
+                return deleted
+
+    @classmethod
+    def convert_inputs_storage(cls, db, to_format: str, chunk_size: int = 5000) -> dict:
+        """
+        Convert stored inputs between the JSON and packed float64 formats.
+
+        Rows are converted in primary-key chunks, each written back with one
+        UPDATE ... FROM (VALUES ...) statement and committed on its own, so
+        the conversion can run on a live table and be resumed. Because
+        inputs reads either column, rows are readable throughout.
+
+        Rows whose JSON inputs cannot be packed exactly (e.g. huge integers)
+        stay in JSON and are counted as skipped.
+
+        Args:
+            db: SQLAlchemy database session
+            to_format: "binary" or "json"
+            chunk_size: Number of rows converted per statement
+
+        Returns:
+            dict: {"converted": <rows converted>, "skipped": <rows left as they were>}
+        """
+        if to_format not in ("binary", "json"):
+            raise ValueError(f"Unsupported inputs storage format: {to_format}")
+        table = cls.__table__
+        if to_format == "binary":
+            source = table.c.inputs
+            pending = table.c.inputs_packed.is_(None) & table.c.inputs.isnot(None)
+        else:
+            source = table.c.inputs_packed
+            pending = table.c.inputs_packed.isnot(None)
+
+        summary = {"converted": 0, "skipped": 0}
+        last_id = None
+        while True:
+            condition = pending if last_id is None else pending & (table.c.id > last_id)
+            rows = db.execute(
+                table.select().with_only_columns(table.c.id, source)
+                .where(condition).order_by(table.c.id).limit(chunk_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            if to_format == "binary":
+                data = [(row_id, pack_floats(inputs)) for row_id, inputs in rows if can_pack(inputs)]
+                new_type = table.c.inputs_packed.type
+            else:
+                data = [(row_id, unpack_floats(packed).tolist()) for row_id, packed in rows]
+                new_type = table.c.inputs.type
+            summary["skipped"] += len(rows) - len(data)
+
+            if data:
+                converted = values(
+                    column("row_id", table.c.id.type),
+                    column("new_inputs", new_type),
+                    name="converted_inputs",
+                ).data(data)
+                if to_format == "binary":
+                    changes = {"inputs_packed": converted.c.new_inputs, "inputs": None}
+                else:
+                    # VALUES columns are untyped to Postgres; cast back to json
+                    changes = {"inputs": cast(converted.c.new_inputs, JSON), "inputs_packed": None}
+                db.execute(update(table).where(table.c.id == converted.c.row_id).values(**changes))
+                summary["converted"] += len(data)
+            db.commit()
+
+        return summary
+
+    @classmethod
+    def find_identical(cls, db, inputs_hash: str, user_id: Optional[uuid.UUID] = None):
+        """
+        Query the calculations identical to one with the given inputs hash.
+
+        Both forms are a probe of ix_calculations_inputs_hash_user: on its
+        inputs_hash prefix for every user, on the whole key for one user.
+
+        Args:
+            db: SQLAlchemy database session
+            inputs_hash: The hash to match (see hash_inputs)
+            user_id: Only match this user's calculations, if given
+
+        Returns:
+            Query: The matching calculations (unordered)
+        """
+        query = db.query(cls).filter(cls.inputs_hash == inputs_hash)
+        if user_id is not None:
+            query = query.filter(cls.user_id == user_id)
+        return query
+
+    @classmethod
+    def stored_result(cls, db, inputs_hash: Optional[str]) -> Optional[float]:
+        """
+        The stored result of any calculation with the given inputs hash.
+
+        Exact-mode calculations share the hash of their float counterparts
+        but hold a different result (result is only their approximation),
+        so only float-mode rows are considered.
+
+        Args:
+            db: SQLAlchemy database session
+            inputs_hash: The hash to match, or None (never matches)
+
+        Returns:
+            Optional[float]: A stored result, or None if no identical
+            calculation has one
+        """
+        if inputs_hash is None:
+            return None
+        return db.execute(
+            select(cls.result)
+            .where(cls.inputs_hash == inputs_hash, cls.exact.is_(False), cls.result.isnot(None))
+            .limit(1)
+        ).scalar()
+
+    @classmethod
+    def backfill_inputs_hash(cls, db, chunk_size: int = 5000) -> dict:
+        """
+        Compute inputs_hash for rows stored before the column existed.
+
+        Works like convert_inputs_storage(): primary-key chunks, one
+        UPDATE ... FROM (VALUES ...) per chunk, each committed on its own.
+        Rows whose inputs cannot be hashed keep a NULL hash and are counted
+        as skipped (they are not revisited within one run).
+
+        Args:
+            db: SQLAlchemy database session
+            chunk_size: Number of rows hashed per statement
+
+        Returns:
+            dict: {"hashed": <rows hashed>, "skipped": <rows left without a hash>}
+        """
+        table = cls.__table__
+        pending = table.c.inputs_hash.is_(None)
+        summary = {"hashed": 0, "skipped": 0}
+        last_id = None
+        while True:
+            condition = pending if last_id is None else pending & (table.c.id > last_id)
+            rows = db.execute(
+                table.select().with_only_columns(
+                    table.c.id, table.c.type, table.c.inputs, table.c.inputs_packed, table.c.expression
+                ).where(condition).order_by(table.c.id).limit(chunk_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            data = []
+            for row_id, calculation_type, inputs_json, inputs_packed, expression in rows:
+                key = make_key(calculation_type, cls.decode_inputs(inputs_json, inputs_packed), expression)
+                if key is not None:
+                    data.append((row_id, key))
+            summary["skipped"] += len(rows) - len(data)
+
+            if data:
+                hashes = values(
+                    column("row_id", table.c.id.type),
+                    column("new_hash", table.c.inputs_hash.type),
+                    name="new_hashes",
+                ).data(data)
+                db.execute(update(table).where(table.c.id == hashes.c.row_id).values(inputs_hash=hashes.c.new_hash))
+                summary["hashed"] += len(data)
+            db.commit()
+
+        return summary
+
+    def patch_inputs(self, remove: int = 0, append: Any = ()) -> Optional[float]:
+        """
+        Remove trailing inputs and/or append new ones, keeping the result current.
+
+        Trailing inputs are removed first, then the new ones appended. For the
+        left folds the new result is derived from the stored one: removed
+        inputs are undone with the inverse operation (addition, subtraction,
+        multiplication, division) and appended inputs are folded in
+        (all five folds, including modulo). Packed rows stay packed and are
+        edited as bytes, without decoding every input.
+
+        Args:
+            remove: How many trailing inputs to remove
+            append: Inputs to append (list or float64 array)
+
+        Returns:
+            Optional[float]: The new result, also stored on the calculation,
+            or None if it has to be recomputed from all inputs (e.g.
+            exponentiation); the caller then recomputes and stores it
+
+        Raises:
+            ValueError: If too many inputs are removed, fewer than two would
+                        remain, or an appended input is invalid (e.g. a
+                        zero divisor)
+        """
+        from app.operations.kernels import fold_vector, supports_vector_fold, unfold_vector
+
+        current = self.kernel_inputs
+        if not isinstance(current, (list, np.ndarray)):
+            raise ValueError("Inputs must be a list of numbers.")
+        if remove > len(current):
+            raise ValueError("Cannot remove more inputs than the calculation has.")
+        kept = len(current) - remove
+        appended = statistics.as_vector(append)
+        if kept + len(appended) < 2:
+            raise ValueError("Inputs must be a list with at least two numbers.")
+
+        result = None
+        # Exact results are not derived from their float approximation
+        if supports_vector_fold(self.type) and kept >= 2 and not self.exact:
+            result = unfold_vector(self.type, statistics.as_vector(current[kept:]), self.result)
+            if result is not None and len(appended):
+                outcome = fold_vector(self.type, appended, result)
+                if outcome.error is not None:
+                    raise ValueError(outcome.error)
+                result = outcome.result
+
+        if self.inputs_packed is not None:
+            self.inputs_packed = self.inputs_packed[:kept * 8] + pack_floats(appended)
+        else:
+            self.inputs = list(current[:kept]) + appended.tolist()
+        self.store_result(result)
+        return result
+
     def get_result(self) -> float:
         """
         Method to compute calculation result.
         
-        This is an abstract method that must be implemented by subclasses.
-        It defines the interface that all calculation types must implement.
+        Dispatches to the registered kernel for the calculation's type;
+        subclasses may override it with their own business logic.
         
         Returns:
             float: The result of the calculation
             
         Raises:
-            NotImplementedError: If not implemented by a subclass
+            ValueError: If the type is unknown or the inputs are invalid
         """
-        raise NotImplementedError
+        return kernels.evaluate(self.type, self.kernel_inputs, self.expression)
 
     def __repr__(self):
         """
@@ -227,6 +1202,24 @@ class Calculation(Base, AbstractCalculation):
         #"with_polymorphic": "*"  # Eager load all subclass columns (commented out)
     }
 
+for _statement in LISTING_VERSION_STATEMENTS:
+    event.listen(Calculation.__table__, "after_create", DDL(_statement))
+
+# Columns whose changes invalidate inputs_hash
+_HASHED_COLUMNS = ("type", "inputs_json", "inputs_packed", "expression")
+
+
+@event.listens_for(Calculation, "before_insert", propagate=True)
+def _hash_inputs_on_insert(mapper, connection, target) -> None:
+    target.inputs_hash = target.hash_inputs()
+
+
+@event.listens_for(Calculation, "before_update", propagate=True)
+def _hash_inputs_on_update(mapper, connection, target) -> None:
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in _HASHED_COLUMNS):
+        target.inputs_hash = target.hash_inputs()
+
 class Addition(Calculation):
     """
     Addition calculation subclass.
@@ -250,11 +1243,7 @@ class Addition(Calculation):
         Raises:
             ValueError: If inputs are not a list or if fewer than 2 numbers provided
         """
-        if not isinstance(self.inputs, list):
-            raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
-            raise ValueError("Inputs must be a list with at least two numbers.")
-        return sum(self.inputs)
+        return kernels.evaluate("addition", self.kernel_inputs)
 
 class Subtraction(Calculation):
     """
@@ -279,14 +1268,7 @@ class Subtraction(Calculation):
         Raises:
             ValueError: If inputs are not a list or if fewer than 2 numbers provided
         """
-        if not isinstance(self.inputs, list):
-            raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
-            raise ValueError("Inputs must be a list with at least two numbers.")
-        result = self.inputs[0]
-        for value in self.inputs[1:]:
-            result -= value
-        return result
+        return kernels.evaluate("subtraction", self.kernel_inputs)
 
 class Multiplication(Calculation):
     """
@@ -309,14 +1291,7 @@ class Multiplication(Calculation):
         Raises:
             ValueError: If inputs are not a list or if fewer than 2 numbers provided
         """
-        if not isinstance(self.inputs, list):
-            raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
-            raise ValueError("Inputs must be a list with at least two numbers.")
-        result = 1
-        for value in self.inputs:
-            result *= value
-        return result
+        return kernels.evaluate("multiplication", self.kernel_inputs)
 
 class Division(Calculation):
     """
@@ -346,16 +1321,7 @@ class Division(Calculation):
             ValueError: If inputs are not a list, if fewer than 2 numbers provided,
                         or if attempting to divide by zero
         """
-        if not isinstance(self.inputs, list):
-            raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
-            raise ValueError("Inputs must be a list with at least two numbers.")
-        result = self.inputs[0]
-        for value in self.inputs[1:]:
-            if value == 0:
-                raise ValueError("Cannot divide by zero.")
-            result /= value
-        return result
+        return kernels.evaluate("division", self.kernel_inputs)
 
 class Exponentiation(Calculation):
     """
@@ -381,21 +1347,10 @@ class Exponentiation(Calculation):
 
         Raises:
             ValueError: If inputs are invalid or contain fewer than two numbers,
-                        or if attempting to raise 0 to a negative power.
+                        if attempting to raise 0 to a negative power, or if
+                        the result would exceed the exponentiation budgets.
         """
-        if not isinstance(self.inputs, list):
-            raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
-            raise ValueError("Exponentiation requires at least two inputs.")
-
-        # Start from the right-most exponent
-        result = self.inputs[-1]
-        for base in reversed(self.inputs[:-1]):
-            if base == 0 and result < 0:
-                raise ValueError("Cannot raise 0 to a negative exponent.")
-            result = base ** result
-
-        return result
+        return kernels.evaluate("exponentiation", self.kernel_inputs)
 
 
 class Modulo(Calculation):
@@ -419,13 +1374,202 @@ class Modulo(Calculation):
         Returns:
             float: Result of the modulo operation
         """
-        if not isinstance(self.inputs, list):
-            raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
-            raise ValueError("Modulo requires at least two inputs.")
-        result = self.inputs[0]
-        for value in self.inputs[1:]:
-            if value == 0:
-                raise ValueError("Cannot perform modulo by zero.")
-            result %= value
-        return result
+        return kernels.evaluate("modulo", self.kernel_inputs)
+
+
+class Expression(Calculation):
+    """
+    Arithmetic expression calculation subclass.
+
+    Evaluates an expression over + - * / % ** and parentheses, with its
+    variables bound to the inputs in order of first appearance.
+    Examples:
+        "(a + b) / c ** 2" with [1, 2, 3] → (1 + 2) / 3 ** 2 = 0.333...
+        "x * x - y"        with [4, 6]    → 4 * 4 - 6 = 10
+
+    The expression is compiled once per process (see
+    app.operations.expression) and reused for every row sharing its text.
+
+    Raises:
+        ValueError: If the expression is invalid, the number of inputs does
+                    not match its variables, or evaluation fails.
+    """
+    __mapper_args__ = {"polymorphic_identity": "expression"}
+
+    def get_result(self) -> float:
+        """
+        Calculate the result of the expression for the stored inputs.
+
+        Returns:
+            float: Result of the expression
+        """
+        return kernels.evaluate("expression", self.kernel_inputs, self.expression)
+
+
+class Mean(Calculation):
+    """
+    Mean calculation subclass.
+
+    Computes the arithmetic mean of the inputs in one pass.
+    Examples:
+        [1, 2, 3, 4] → 2.5
+    """
+    __mapper_args__ = {"polymorphic_identity": "mean"}
+
+    def get_result(self) -> float:
+        """
+        Calculate the arithmetic mean of the inputs.
+
+        Returns:
+            float: The mean
+        """
+        return kernels.evaluate("mean", self.kernel_inputs)
+
+
+class Variance(Calculation):
+    """
+    Variance calculation subclass.
+
+    Computes the sample variance (n - 1 denominator) in one pass, with
+    Welford's update.
+    Examples:
+        [2, 4, 4, 4, 5, 5, 7, 9] → 4.571...
+    """
+    __mapper_args__ = {"polymorphic_identity": "variance"}
+
+    def get_result(self) -> float:
+        """
+        Calculate the sample variance of the inputs.
+
+        Returns:
+            float: The variance
+        """
+        return kernels.evaluate("variance", self.kernel_inputs)
+
+
+class StandardDeviation(Calculation):
+    """
+    Standard deviation calculation subclass.
+
+    Computes the sample standard deviation (square root of the variance).
+    Examples:
+        [2, 4, 4, 4, 5, 5, 7, 9] → 2.138...
+    """
+    __mapper_args__ = {"polymorphic_identity": "standard_deviation"}
+
+    def get_result(self) -> float:
+        """
+        Calculate the sample standard deviation of the inputs.
+
+        Returns:
+            float: The standard deviation
+        """
+        return kernels.evaluate("standard_deviation", self.kernel_inputs)
+
+
+class Minimum(Calculation):
+    """
+    Minimum calculation subclass.
+
+    Examples:
+        [3, -1, 2] → -1
+    """
+    __mapper_args__ = {"polymorphic_identity": "minimum"}
+
+    def get_result(self) -> float:
+        """
+        Calculate the smallest input.
+
+        Returns:
+            float: The minimum
+        """
+        return kernels.evaluate("minimum", self.kernel_inputs)
+
+
+class Maximum(Calculation):
+    """
+    Maximum calculation subclass.
+
+    Examples:
+        [3, -1, 2] → 3
+    """
+    __mapper_args__ = {"polymorphic_identity": "maximum"}
+
+    def get_result(self) -> float:
+        """
+        Calculate the largest input.
+
+        Returns:
+            float: The maximum
+        """
+        return kernels.evaluate("maximum", self.kernel_inputs)
+
+
+class Median(Calculation):
+    """
+    Median calculation subclass.
+
+    Uses selection (O(n) on average) rather than sorting.
+    Examples:
+        [5, 1, 3] → 3
+        [4, 1, 3, 2] → 2.5
+    """
+    __mapper_args__ = {"polymorphic_identity": "median"}
+
+    def get_result(self) -> float:
+        """
+        Calculate the median of the inputs.
+
+        Returns:
+            float: The median
+        """
+        return kernels.evaluate("median", self.kernel_inputs)
+
+
+class Quantile(Calculation):
+    """
+    Quantile calculation subclass.
+
+    The first input is the quantile q in [0, 1]; the remaining inputs are
+    the data. Values between data points are linearly interpolated.
+    Examples:
+        [0.5, 5, 1, 3] → 3 (the median)
+        [0.9, 1, 2, 3, 4, 5] → 4.6
+
+    Raises:
+        ValueError: If q is outside [0, 1].
+    """
+    __mapper_args__ = {"polymorphic_identity": "quantile"}
+
+    def get_result(self) -> float:
+        """
+        Calculate the q-quantile of the data.
+
+        Returns:
+            float: The quantile
+        """
+        return kernels.evaluate("quantile", self.kernel_inputs)
+
+
+def _operation_class(name: str) -> type:
+    """
+    The Calculation subclass whose polymorphic identity is name.
+
+    Built-in types have their classes above; for a plugin operation a plain
+    subclass is generated (get_result() dispatches through the registry), so
+    rows of that type load without importing the plugin itself.
+    """
+    mapper = Calculation.__mapper__.polymorphic_map.get(name)
+    if mapper is not None:
+        return mapper.class_
+    class_name = "".join(part.title() for part in name.split("_"))
+    return type(class_name, (Calculation,), {
+        "__module__": __name__,
+        "__doc__": f"{kernels.operation_label(name)} calculation (plugin operation).",
+        "__mapper_args__": {"polymorphic_identity": name},
+    })
+
+
+# Map every registered operation up front, so any stored row can be loaded
+for _name in kernels.operation_names():
+    _operation_class(_name)
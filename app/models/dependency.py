@@ -0,0 +1,127 @@
+# app/models/dependency.py
+"""
+Calculation Dependency Graph Module
+
+A calculation's input can reference another calculation: the input then
+takes the referenced calculation's result. Each reference is one edge of a
+directed acyclic graph, stored as a CalculationDependency row (the
+dependent calculation, the input position and the source calculation).
+
+The referenced result is copied into the dependent's inputs when it is
+computed, so every other code path (kernels, hashing, packed storage)
+sees plain numbers. When a calculation's result changes, only the
+calculations downstream of it are recomputed, in topological order (see
+Calculation.recompute_downstream()):
+
+- downstream_ids() walks the graph in the database with one recursive CTE;
+- topological_order() orders those nodes with Kahn's algorithm over the
+  edges between them, so every node is computed after all of its sources.
+
+New references are rejected if they would close a cycle
+(would_create_cycle()).
+"""
+
+import uuid
+from collections import defaultdict, deque
+from typing import Collection, Dict, List, Set, Union
+
+from sqlalchemy import Column, ForeignKey, Integer, select
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.database import Base
+
+
+class DependencyCycleError(ValueError):
+    """New references would make a calculation depend on itself."""
+
+
+class CalculationDependency(Base):
+    """One input of a calculation that takes another calculation's result."""
+
+    __tablename__ = "calculation_dependencies"
+
+    calculation_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("calculations.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    position = Column(Integer, primary_key=True)
+    source_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("calculations.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+
+def _id_set(calculation_ids: Union[uuid.UUID, Collection[uuid.UUID]]) -> Set[uuid.UUID]:
+    """One calculation id, or a collection of them, as a set."""
+    return {calculation_ids} if isinstance(calculation_ids, uuid.UUID) else set(calculation_ids)
+
+
+def downstream_ids(db, calculation_id: Union[uuid.UUID, Collection[uuid.UUID]]) -> Set[uuid.UUID]:
+    """
+    Every calculation that depends on calculation_id (one id, or any of a
+    collection of ids), directly or not.
+
+    One recursive CTE follows the edges from source to dependent (UNION,
+    not UNION ALL, so it terminates even on a cyclic graph).
+    """
+    edges = CalculationDependency.__table__
+    downstream = (
+        select(edges.c.calculation_id.label("id"))
+        .where(edges.c.source_id.in_(_id_set(calculation_id)))
+        .cte("downstream", recursive=True)
+    )
+    downstream = downstream.union(
+        select(edges.c.calculation_id).join(downstream, edges.c.source_id == downstream.c.id)
+    )
+    return set(db.execute(select(downstream.c.id)).scalars())
+
+
+def topological_order(db, calculation_id: Union[uuid.UUID, Collection[uuid.UUID]]) -> List[uuid.UUID]:
+    """
+    The calculations downstream of calculation_id (one id, or a collection
+    of ids that changed together), each after all of its sources.
+
+    Raises:
+        DependencyCycleError: If the downstream graph has a cycle
+    """
+    nodes = downstream_ids(db, calculation_id)
+    if not nodes:
+        return []
+    edges = CalculationDependency.__table__
+    rows = db.execute(
+        select(edges.c.source_id, edges.c.calculation_id).where(edges.c.calculation_id.in_(nodes))
+    ).all()
+
+    # Kahn's algorithm; edges from outside the downstream set (including
+    # the changed calculations themselves) are already satisfied
+    dependents: Dict[uuid.UUID, List[uuid.UUID]] = defaultdict(list)
+    waiting = dict.fromkeys(nodes, 0)
+    for source_id, dependent_id in rows:
+        if source_id in nodes:
+            dependents[source_id].append(dependent_id)
+            waiting[dependent_id] += 1
+
+    ready = deque(sorted(node for node, count in waiting.items() if count == 0))
+    order = []
+    while ready:
+        node = ready.popleft()
+        order.append(node)
+        for dependent_id in dependents[node]:
+            waiting[dependent_id] -= 1
+            if waiting[dependent_id] == 0:
+                ready.append(dependent_id)
+    if len(order) != len(nodes):
+        raise DependencyCycleError("The calculation dependency graph has a cycle.")
+    return order
+
+
+def would_create_cycle(db, calculation_id: uuid.UUID, source_ids: Collection[uuid.UUID]) -> bool:
+    """Whether calculation_id referencing source_ids would close a cycle."""
+    if not source_ids:
+        return False
+    if calculation_id in source_ids:
+        return True
+    return not downstream_ids(db, calculation_id).isdisjoint(source_ids)
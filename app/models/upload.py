@@ -0,0 +1,211 @@
+# app/models/upload.py
+"""
+Upload Session Models Module
+
+A calculation whose inputs are too large for one request is uploaded in
+chunks through an upload session:
+
+1. open a session for a calculation type (CalculationUpload);
+2. append chunks of packed float64 inputs, in order. Each chunk is folded
+   into the session's running result as it arrives (fold_vector), then
+   stored as its own row (CalculationUploadChunk), so the server never holds
+   more than one chunk in memory;
+3. finalize: one INSERT ... SELECT concatenates the stored chunks inside
+   the database into a new calculation's packed inputs (and hashes them
+   for inputs_hash), with the running result as its result, and the
+   session is deleted.
+
+Only left folds (addition, subtraction, multiplication, division, modulo)
+can be reduced incrementally, so sessions are limited to those types.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import (
+    BigInteger, Column, DateTime, Float, ForeignKey, Integer, LargeBinary, String,
+    delete, func, insert, literal, literal_column, select,
+)
+from sqlalchemy.dialects.postgresql import UUID, aggregate_order_by
+
+from app.core.config import settings
+from app.core.packing import pack_floats
+from app.database import Base
+from app.models.calculation import Calculation
+from app.operations.kernels import NOT_FINITE, fold_vector, supports_vector_fold
+
+
+class UploadOffsetError(ValueError):
+    """A chunk did not start where the upload currently ends (lost or repeated chunk)."""
+
+
+class CalculationUpload(Base):
+    """
+    An open chunked upload of one calculation's inputs.
+
+    running_result is the fold of every input received so far (NULL before
+    the first input), so finalizing never has to read the inputs back.
+    """
+
+    __tablename__ = "calculation_uploads"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    type = Column(String(50), nullable=False)
+    input_count = Column(BigInteger, nullable=False, default=0)
+    chunk_count = Column(Integer, nullable=False, default=0)
+    running_result = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    @classmethod
+    def open(cls, db, user_id: uuid.UUID, calculation_type: str) -> "CalculationUpload":
+        """
+        Start an upload session, purging expired sessions first.
+
+        Args:
+            db: SQLAlchemy database session
+            user_id: The UUID of the user who owns the upload
+            calculation_type: The type of the calculation being uploaded
+
+        Returns:
+            CalculationUpload: The new (flushed, uncommitted) session
+
+        Raises:
+            ValueError: If the type cannot be reduced incrementally
+        """
+        if not supports_vector_fold(calculation_type):
+            raise ValueError(
+                "Upload sessions support addition, subtraction, multiplication, division and modulo."
+            )
+        cls.purge_expired(db)
+        upload = cls(user_id=user_id, type=calculation_type, input_count=0, chunk_count=0)
+        db.add(upload)
+        db.flush()
+        return upload
+
+    @classmethod
+    def purge_expired(cls, db) -> int:
+        """Delete sessions idle for longer than UPLOAD_SESSION_TTL_SECONDS (chunks cascade)."""
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.UPLOAD_SESSION_TTL_SECONDS)
+        return db.execute(delete(cls).where(cls.updated_at < cutoff)).rowcount
+
+    def append(self, db, values: np.ndarray, offset: Optional[int] = None) -> None:
+        """
+        Fold the next chunk of inputs into the running result and store it.
+
+        The caller should hold a row lock on the session (SELECT ... FOR
+        UPDATE) so concurrent appends are applied one at a time, in order.
+
+        Args:
+            db: SQLAlchemy database session
+            values: The chunk's inputs as a 1-D float64 array
+            offset: Index of the chunk's first input, if the client sent one;
+                    it must equal input_count (guards against lost or
+                    repeated chunks)
+
+        Raises:
+            UploadOffsetError: If offset is not where the upload ends
+            ValueError: If the upload grows too large, or the chunk hits an
+                        arithmetic error or overflows the running result
+        """
+        if offset is not None and offset != self.input_count:
+            raise UploadOffsetError(f"Expected the chunk at offset {self.input_count}, got {offset}.")
+        if self.input_count + len(values) > settings.UPLOAD_MAX_INPUTS:
+            raise ValueError(f"Uploads are limited to {settings.UPLOAD_MAX_INPUTS} inputs.")
+        if not len(values):
+            return
+
+        outcome = fold_vector(self.type, values, self.running_result)
+        if outcome.error is not None:
+            raise ValueError(outcome.error)
+        if not np.isfinite(outcome.result):
+            # Once the running result overflows, the finished one would too
+            raise ValueError(NOT_FINITE)
+
+        chunk = CalculationUploadChunk(upload_id=self.id, seq=self.chunk_count, data=pack_floats(values))
+        db.add(chunk)
+        self.running_result = outcome.result
+        self.input_count += len(values)
+        self.chunk_count += 1
+        db.flush()
+        db.expunge(chunk)  # don't keep the chunk's bytes alive in the session
+
+    def finalize(self, db) -> uuid.UUID:
+        """
+        Turn the upload into a calculation and delete the session.
+
+        The chunks are concatenated by Postgres (string_agg over bytea, in
+        upload order) straight into the new row's packed inputs, so the
+        whole vector never passes through the application. The caller
+        commits.
+
+        Args:
+            db: SQLAlchemy database session
+
+        Returns:
+            uuid.UUID: The id of the new calculation
+
+        Raises:
+            ValueError: If fewer than two inputs were uploaded
+        """
+        if self.input_count < 2:
+            raise ValueError("Inputs must be a list with at least two numbers.")
+
+        calculation_id = uuid.uuid4()
+        now = datetime.utcnow()
+        chunk = CalculationUploadChunk
+        packed = (
+            select(func.string_agg(chunk.data, aggregate_order_by(literal_column("''::bytea"), chunk.seq))
+                   .label("data"))
+            .where(chunk.upload_id == self.id)
+            .subquery()
+        )
+        # The inputs hash is make_key()'s SHA-256 of the type prefix and the
+        # packed inputs, computed by Postgres over the concatenated chunks
+        inputs_hash = func.encode(
+            func.sha256(literal(self.type.lower().encode("utf-8") + b"\0", LargeBinary).op("||")(packed.c.data)),
+            "hex",
+        )
+        rows = select(
+            literal(calculation_id, UUID(as_uuid=True)),
+            literal(self.user_id, UUID(as_uuid=True)),
+            literal(self.type),
+            packed.c.data,
+            inputs_hash,
+            literal(self.running_result, Float),
+            literal(now, DateTime),
+            literal(now, DateTime),
+        )
+        table = Calculation.__table__
+        db.execute(
+            insert(table).from_select(
+                [table.c.id, table.c.user_id, table.c.type, table.c.inputs_packed, table.c.inputs_hash,
+                 table.c.result, table.c.created_at, table.c.updated_at],
+                rows,
+            )
+        )
+        db.delete(self)
+        db.flush()
+        return calculation_id
+
+
+class CalculationUploadChunk(Base):
+    """One received chunk of an upload: packed little-endian float64, in upload order."""
+
+    __tablename__ = "calculation_upload_chunks"
+
+    upload_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("calculation_uploads.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    seq = Column(Integer, primary_key=True)
+    data = Column(LargeBinary, nullable=False)
@@ -17,7 +17,7 @@ The User model is designed to follow security best practices:
 
 import uuid
 from datetime import datetime, timezone, timedelta
-from sqlalchemy import Column, String, Boolean, DateTime, or_
+from sqlalchemy import BigInteger, Column, String, Boolean, DateTime, or_
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
 from app.core.config import get_settings
@@ -97,6 +97,12 @@ class User(Base):
     
     last_login = Column(DateTime(timezone=True), 
                         nullable=True)  # Track login activity
+
+    # Bumped by database triggers on every write to the user's calculations
+    calculations_version = Column(BigInteger,
+                                  default=0,
+                                  server_default="0",
+                                  nullable=False)
     
     # Relationships - one-to-many with Calculation model
     calculations = relationship("Calculation", 
@@ -12,6 +12,11 @@ Functions:
 - subtract(a: Union[int, float], b: Union[int, float]) -> Union[int, float]: Returns the difference when b is subtracted from a.
 - multiply(a: Union[int, float], b: Union[int, float]) -> Union[int, float]: Returns the product of a and b.
 - divide(a: Union[int, float], b: Union[int, float]) -> float: Returns the quotient when a is divided by b. Raises ValueError if b is zero.
+- exponentiate(*args) and modulo(*args): Fold any number of inputs, like the calculation types.
+
+Every function delegates to the calculation kernel registry
+(app.operations.kernels), so these helpers, the calculation models and the
+batch engine share one implementation and one set of error messages.
 
 Usage:
 These functions can be imported and used in other modules or integrated into APIs
@@ -20,6 +25,8 @@ to perform arithmetic operations based on user input.
 
 from typing import Union  # Import Union for type hinting multiple possible types
 
+from app.operations.kernels import evaluate
+
 # Define a type alias for numbers that can be either int or float
 Number = Union[int, float]
 
@@ -40,9 +47,7 @@ def add(a: Number, b: Number) -> Number:
     >>> add(2.5, 3)
     5.5
     """
-    # Perform addition of a and b
-    result = a + b
-    return result
+    return evaluate("addition", [a, b])
 
 def subtract(a: Number, b: Number) -> Number:
     """
@@ -61,9 +66,7 @@ def subtract(a: Number, b: Number) -> Number:
     >>> subtract(5.5, 2)
     3.5
     """
-    # Perform subtraction of b from a
-    result = a - b
-    return result
+    return evaluate("subtraction", [a, b])
 
 def multiply(a: Number, b: Number) -> Number:
     """
@@ -82,9 +85,7 @@ def multiply(a: Number, b: Number) -> Number:
     >>> multiply(2.5, 4)
     10.0
     """
-    # Perform multiplication of a and b
-    result = a * b
-    return result
+    return evaluate("multiplication", [a, b])
 
 def divide(a: Number, b: Number) -> float:
     """
@@ -108,40 +109,25 @@ def divide(a: Number, b: Number) -> float:
     >>> divide(5, 0)
     Traceback (most recent call last):
         ...
-    ValueError: Cannot divide by zero!
+    ValueError: Cannot divide by zero.
     """
-    # Check if the divisor is zero to prevent division by zero
-    if b == 0:
-        # Raise a ValueError with a descriptive message
-        raise ValueError("Cannot divide by zero!")
-    
-    # Perform division of a by b and return the result as a float
-    result = a / b
-    return result
-
-def exponentiate(*args: float) -> float:
-    if len(args) < 2:
-        raise ValueError("At least two arguments are required for exponentiation.")
-
-    for arg in args:
-        if not isinstance(arg, (int, float)):
-            raise ValueError("All inputs must be numbers.")
-
-    result = args[-1]
-    for base in reversed(args[:-1]):
-        result = base ** result
-    return result
-
-def modulo(*args: float) -> float:
-    if len(args) < 2:
-        raise ValueError("At least two arguments are required for modulus.")
+    return evaluate("division", [a, b])
 
-    result = args[0]
-    for divisor in args[1:]:
-        if divisor == 0:
-            raise ValueError("Cannot perform modulo by zero.")
-        result %= divisor
+def exponentiate(*args: Number) -> float:
+    """
+    Raise the inputs to each other, right to left (a ** (b ** c)).
 
-    return result
+    Raises:
+    - ValueError: With fewer than two inputs, non-numeric inputs, 0 raised to
+      a negative exponent or a result that is not a real number.
+    """
+    return evaluate("exponentiation", list(args))
 
+def modulo(*args: Number) -> float:
+    """
+    Take the remainder of the inputs, left to right ((a % b) % c).
 
+    Raises:
+    - ValueError: With fewer than two inputs or a zero divisor.
+    """
+    return evaluate("modulo", list(args))
@@ -0,0 +1,239 @@
+# app/operations/batch.py
+"""
+Vectorized batch evaluation of calculations.
+
+Evaluating calculations one at a time through each model's get_result() is a
+Python-level loop per row. This module evaluates many (type, inputs) pairs at
+once: items are grouped by type and input count, each group becomes a 2-D
+float64 matrix (one row per calculation), and the operation is applied one
+input column at a time with NumPy. The fold order is exactly the one the
+scalar kernels use (left-to-right, or right-to-left for exponentiation), so
+every row gets the same float result the scalar kernel would produce.
+
+Errors (division or modulo by zero, 0 raised to a negative power, overflow)
+are detected with masks and reported per row instead of aborting the batch;
+like the scalar kernels, each row reports the first error it hits. Results
+that overflow to infinity (or come out NaN) are reported as errors too,
+since they cannot be stored or returned as JSON.
+
+Inputs are evaluated as float64, the same numeric type the API validates
+them into (List[float]).
+
+Expression calculations are grouped by expression text and evaluated with
+the compiled expression's vectorized path, one binding per row.
+
+The folds themselves live in the kernel registry (app.operations.kernels,
+Kernel.batch). Types without a batch kernel, such as the statistics
+reductions, are evaluated row by row through the registry's scalar entry
+point, which is NumPy-based for them already.
+"""
+
+import argparse
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.operations.expression import compile_expression
+from app.operations.kernels import NOT_A_LIST, NOT_FINITE, TOO_FEW_INPUTS, BatchResult, evaluate, get_kernel
+
+
+def evaluate_batch(items: Sequence[Tuple]) -> List[BatchResult]:
+    """
+    Evaluate many calculations at once.
+
+    Args:
+        items: (calculation_type, inputs) pairs, or (calculation_type,
+               inputs, expression) triples for expression calculations
+
+    Returns:
+        List[BatchResult]: One result per item, in the same order
+    """
+    results: List[Optional[BatchResult]] = [None] * len(items)
+
+    groups: Dict[Tuple[str, int], List[int]] = defaultdict(list)
+    expression_groups: Dict[str, List[int]] = defaultdict(list)
+    for index, item in enumerate(items):
+        calculation_type, inputs = item[0], item[1]
+        kernel_name = calculation_type.lower() if isinstance(calculation_type, str) else calculation_type
+        try:
+            kernel = get_kernel(calculation_type)
+        except ValueError as e:
+            results[index] = BatchResult(None, str(e))
+            continue
+        if kernel is not None and kernel.expression:
+            expression = item[2] if len(item) > 2 else None
+            if not isinstance(inputs, (list, tuple, np.ndarray)):
+                results[index] = BatchResult(None, NOT_A_LIST)
+            elif expression is None:
+                results[index] = BatchResult(None, "Expression calculations require an expression.")
+            else:
+                expression_groups[expression].append(index)
+        elif kernel is None:
+            results[index] = BatchResult(None, f"Unsupported calculation type: {calculation_type}")
+        elif kernel.batch is None:
+            results[index] = _evaluate_row(kernel_name, inputs)
+        elif not isinstance(inputs, (list, tuple, np.ndarray)):
+            results[index] = BatchResult(None, NOT_A_LIST)
+        elif len(inputs) < 2:
+            results[index] = BatchResult(None, TOO_FEW_INPUTS)
+        else:
+            groups[(kernel_name, len(inputs))].append(index)
+
+    for (kernel_name, _), indices in groups.items():
+        try:
+            matrix = np.array([items[i][1] for i in indices], dtype=np.float64)
+        except (TypeError, ValueError):
+            matrix = None
+        if matrix is None or matrix.ndim != 2:
+            # A non-numeric value somewhere in the group: fall back to
+            # checking rows one by one so only the bad ones fail.
+            for i in indices:
+                results[i] = evaluate_batch_row(kernel_name, items[i][1])
+            continue
+
+        errors = np.full(len(indices), None, dtype=object)
+        values = get_kernel(kernel_name).batch(matrix, errors)
+        for position, i in enumerate(indices):
+            if errors[position] is not None:
+                results[i] = BatchResult(None, errors[position])
+            else:
+                results[i] = BatchResult(float(values[position]), None)
+
+    for expression, indices in expression_groups.items():
+        _evaluate_expression_group(expression, [items[i][1] for i in indices], indices, results)
+
+    return [
+        BatchResult(None, NOT_FINITE) if outcome.ok and not np.isfinite(outcome.result) else outcome
+        for outcome in results
+    ]
+
+
+def evaluate_matrix(
+    calculation_type: str,
+    matrix: np.ndarray,
+    expression: Optional[str] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluate one calculation type over every row of a float64 matrix.
+
+    The batch kernel (or, for expressions, the compiled expression) folds
+    all rows at once; types without either are evaluated row by row.
+
+    Args:
+        calculation_type: The calculation type
+        matrix: 2-D float64 array, one row of inputs per calculation
+        expression: The expression text (expression calculations only)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The results, and an object array
+        holding each row's error message (None where it succeeded)
+    """
+    kernel = get_kernel(calculation_type)
+    if kernel.expression:
+        return compile_expression(expression).evaluate_many(matrix)
+    errors = np.full(len(matrix), None, dtype=object)
+    if kernel.batch is not None:
+        return kernel.batch(matrix, errors), errors
+    values = np.full(len(matrix), np.nan)
+    for row, inputs in enumerate(matrix):
+        outcome = _evaluate_row(kernel.name, inputs)
+        values[row], errors[row] = (np.nan if outcome.result is None else outcome.result), outcome.error
+    return values, errors
+
+
+def _evaluate_row(kernel_name: str, inputs) -> BatchResult:
+    """Evaluate one item through the registry's scalar entry point."""
+    try:
+        return BatchResult(evaluate(kernel_name, inputs), None)
+    except ValueError as e:
+        return BatchResult(None, str(e))
+
+
+def _evaluate_expression_group(
+    expression: str,
+    bindings: List[Sequence[float]],
+    indices: List[int],
+    results: List[Optional[BatchResult]],
+) -> None:
+    """Evaluate one expression over every binding in its group."""
+    try:
+        compiled = compile_expression(expression)
+    except ValueError as e:
+        for i in indices:
+            results[i] = BatchResult(None, str(e))
+        return
+
+    arity = len(compiled.variables)
+    rows, positions = [], []
+    for position, binding in enumerate(bindings):
+        try:
+            row = np.asarray(binding, dtype=np.float64)
+        except (TypeError, ValueError):
+            row = None
+        if row is None or row.ndim != 1:
+            results[indices[position]] = BatchResult(None, NOT_A_LIST)
+        elif len(row) != arity:
+            try:
+                compiled.evaluate(row)  # raises the arity error
+            except ValueError as e:
+                results[indices[position]] = BatchResult(None, str(e))
+        else:
+            rows.append(row)
+            positions.append(position)
+    if not rows:
+        return
+
+    matrix = np.array(rows, dtype=np.float64).reshape(len(rows), arity)
+    values, errors = compiled.evaluate_many(matrix)
+    for row_number, position in enumerate(positions):
+        if errors[row_number] is not None:
+            results[indices[position]] = BatchResult(None, errors[row_number])
+        else:
+            results[indices[position]] = BatchResult(float(values[row_number]), None)
+
+
+def evaluate_batch_row(calculation_type: str, inputs: Sequence[float]) -> BatchResult:
+    """
+    Evaluate a single item through the batch kernels.
+
+    Args:
+        calculation_type: The calculation type
+        inputs: The numeric inputs
+
+    Returns:
+        BatchResult: The result or error for this item
+    """
+    try:
+        matrix = np.array([inputs], dtype=np.float64)
+    except (TypeError, ValueError):
+        return BatchResult(None, NOT_A_LIST)
+    if matrix.ndim != 2:
+        return BatchResult(None, NOT_A_LIST)
+    return evaluate_batch([(calculation_type, matrix[0])])[0]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command-line entry point: recompute stored results in bulk."""
+    from app.core.config import settings
+    from app.database import SessionLocal
+    from app.models.user import User  # noqa: F401 - registers the User mapper
+    from app.models.calculation import Calculation
+
+    parser = argparse.ArgumentParser(description="Recompute every stored calculation result in batches.")
+    parser.add_argument("--chunk-size", type=int, default=settings.BATCH_RECOMPUTE_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        summary = Calculation.recompute_results(db, chunk_size=args.chunk_size)
+    finally:
+        db.close()
+    print(
+        f"Recomputed {summary['updated']} calculations and {summary['dependents']} dependents "
+        f"({summary['failed']} failed)."
+    )
+
+
+if __name__ == "__main__":
+    main()  # pragma: no cover
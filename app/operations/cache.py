@@ -0,0 +1,315 @@
+# app/operations/cache.py
+"""
+Result memoization for calculation kernels.
+
+Identical (type, inputs) pairs always produce the same result, so results
+are cached under a canonical key in two tiers:
+
+1. An in-process LRU (bounded by entry count, with a TTL) that answers
+   repeats within one worker without any I/O.
+2. A shared tier in Redis (the client from app.auth.redis, with a TTL) so
+   that workers and instances benefit from each other's work.
+
+The Redis tier is strictly best-effort: every call is bounded by a short
+timeout, and after a failure the tier is skipped for a cool-down period so
+a missing or slow Redis never slows down request handling.
+
+Keys are the SHA-256 of the calculation type (and expression text, for
+expression calculations) plus the inputs packed as little-endian float64, which makes [1, 2], [1.0, 2.0] and (1.0, 2.0) the
+same key. Inputs that do not round-trip through float64 (huge integers) are
+never cached.
+"""
+
+import asyncio
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
+
+import anyio
+
+from app.core.config import get_settings
+from app.core.packing import MAX_EXACT_INT, can_pack, pack_floats
+
+settings = get_settings()
+
+
+def make_key(
+    calculation_type: str,
+    inputs: Sequence[Any],
+    expression: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Build the canonical cache key for a calculation.
+
+    Args:
+        calculation_type: The calculation type (e.g. "addition")
+        inputs: The numeric inputs
+        expression: The expression text (expression calculations only)
+
+    Returns:
+        str: The cache key, or None if the inputs cannot be keyed exactly
+    """
+    if not can_pack(inputs):
+        return None
+    try:
+        packed = pack_floats(inputs)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    prefix = str(calculation_type).lower().encode("utf-8") + b"\0"
+    if expression is not None:
+        prefix += expression.encode("utf-8") + b"\0"
+    digest = hashlib.sha256(prefix + packed)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier (local LRU + Redis) cache of calculation results.
+
+    The async methods are for code running on the event loop; the sync
+    methods are for route handlers running in the threadpool, and reach the
+    Redis tier by hopping back onto the event loop.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = settings.RESULT_CACHE_MAX_ENTRIES,
+        ttl_seconds: int = settings.RESULT_CACHE_TTL_SECONDS,
+        redis_enabled: bool = settings.RESULT_CACHE_REDIS_ENABLED,
+        redis_timeout: float = settings.RESULT_CACHE_REDIS_TIMEOUT_SECONDS,
+        redis_retry_seconds: int = settings.RESULT_CACHE_REDIS_RETRY_SECONDS,
+        prefix: str = "calc:result:",
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis_enabled = redis_enabled
+        self.redis_timeout = redis_timeout
+        self.redis_retry_seconds = redis_retry_seconds
+        self.prefix = prefix
+
+        self._local: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis_down_until = 0.0
+        self._counters = {
+            "local_hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "shared_errors": 0,
+        }
+
+    # --------------------------------------------------------------------------
+    # Local tier
+    # --------------------------------------------------------------------------
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _get_local(self, key: str) -> Optional[float]:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return value
+
+    def _set_local(self, key: str, value: float) -> None:
+        with self._lock:
+            self._local[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    # --------------------------------------------------------------------------
+    # Shared (Redis) tier
+    # --------------------------------------------------------------------------
+    def _shared_available(self) -> bool:
+        return self.redis_enabled and time.monotonic() >= self._redis_down_until
+
+    def _shared_failed(self) -> None:
+        self._redis_down_until = time.monotonic() + self.redis_retry_seconds
+        self._count("shared_errors")
+
+    async def _get_shared(self, key: str) -> Optional[float]:
+        if not self._shared_available():
+            return None
+        from app.auth.redis import get_redis
+        try:
+            redis_conn = await get_redis()
+            raw = await asyncio.wait_for(redis_conn.get(self.prefix + key), self.redis_timeout)
+        except Exception:
+            self._shared_failed()
+            return None
+        return float(raw) if raw is not None else None
+
+    async def _set_shared(self, key: str, value: float) -> None:
+        if not self._shared_available():
+            return
+        from app.auth.redis import get_redis
+        try:
+            redis_conn = await get_redis()
+            await asyncio.wait_for(
+                redis_conn.set(self.prefix + key, repr(value), ex=self.ttl_seconds),
+                self.redis_timeout,
+            )
+        except Exception:
+            self._shared_failed()
+
+    # --------------------------------------------------------------------------
+    # Public API
+    # --------------------------------------------------------------------------
+    async def aget(self, key: str) -> Optional[float]:
+        """Look a key up in the local tier, then the shared tier."""
+        value = self._get_local(key)
+        if value is not None:
+            self._count("local_hits")
+            return value
+        value = await self._get_shared(key)
+        if value is not None:
+            self._count("shared_hits")
+            self._set_local(key, value)
+            return value
+        self._count("misses")
+        return None
+
+    async def aset(self, key: str, value: float) -> None:
+        """Store a result in both tiers."""
+        self._set_local(key, value)
+        await self._set_shared(key, value)
+
+    def _from_thread(self, func: Callable, *args) -> Any:
+        """Run an async shared-tier call from a threadpool worker, if possible."""
+        try:
+            return anyio.from_thread.run(func, *args)
+        except RuntimeError:
+            # Not called from an event-loop worker thread (e.g. a script):
+            # only the local tier is available.
+            return None
+
+    def get(self, key: str) -> Optional[float]:
+        """Synchronous aget() for code running in the threadpool."""
+        value = self._get_local(key)
+        if value is not None:
+            self._count("local_hits")
+            return value
+        value = self._from_thread(self._get_shared, key) if self._shared_available() else None
+        if value is not None:
+            self._count("shared_hits")
+            self._set_local(key, value)
+            return value
+        self._count("misses")
+        return None
+
+    def set(self, key: str, value: float) -> None:
+        """Synchronous aset() for code running in the threadpool."""
+        self._set_local(key, value)
+        if self._shared_available():
+            self._from_thread(self._set_shared, key, value)
+
+    def get_or_compute(self, calculation) -> float:
+        """
+        Return a calculation's result, computing and caching it on a miss.
+
+        Errors raised by get_result() propagate and are never cached.
+
+        Args:
+            calculation: A Calculation instance (type and inputs set)
+
+        Returns:
+            float: The calculation result
+        """
+        key = make_key(calculation.type, calculation.inputs, getattr(calculation, "expression", None))
+        if key is None:
+            return calculation.get_result()
+        value = self.get(key)
+        if value is not None:
+            return value
+        result = calculation.get_result()
+        if _is_cacheable(result):
+            self.set(key, float(result))
+        return result
+
+    async def aget_or_compute(
+        self,
+        calculation,
+        compute: Callable[[], Awaitable[Any]],
+        inputs: Optional[Sequence[Any]] = None,
+    ) -> float:
+        """
+        Async get_or_compute(): on a miss, await compute() for the result.
+
+        Args:
+            calculation: A Calculation instance (type and inputs set)
+            compute: Coroutine function producing the result
+            inputs: The calculation's inputs, if already at hand (e.g. a
+                    decoded float64 array), instead of calculation.inputs
+
+        Returns:
+            float: The calculation result
+        """
+        if inputs is None:
+            inputs = calculation.inputs
+        key = make_key(calculation.type, inputs, getattr(calculation, "expression", None))
+        if key is None:
+            return await compute()
+        value = await self.aget(key)
+        if value is not None:
+            return value
+        result = await compute()
+        if _is_cacheable(result):
+            await self.aset(key, float(result))
+        return result
+
+    def clear(self) -> None:
+        """Drop every local entry (the shared tier expires on its own)."""
+        with self._lock:
+            self._local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size of the local tier."""
+        with self._lock:
+            lookups = self._counters["local_hits"] + self._counters["shared_hits"] + self._counters["misses"]
+            hits = lookups - self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_ratio": hits / lookups if lookups else 0.0,
+                "local_entries": len(self._local),
+                "max_entries": self.max_entries,
+                "shared_tier_available": self._shared_available(),
+            }
+
+
+def _is_cacheable(result: Any) -> bool:
+    """Only real, finite numbers that survive a float round-trip are cached."""
+    if isinstance(result, bool) or not isinstance(result, (int, float)):
+        return False
+    if isinstance(result, int):
+        return abs(result) <= MAX_EXACT_INT
+    return math.isfinite(result)
+
+
+# Process-wide cache used by the API routes
+result_cache = ResultCache()
+
+
+def compute_result(calculation) -> float:
+    """
+    Compute a calculation's result through the result cache (when enabled).
+
+    Args:
+        calculation: A Calculation instance (type and inputs set)
+
+    Returns:
+        float: The calculation result
+    """
+    if not settings.RESULT_CACHE_ENABLED:
+        return calculation.get_result()
+    return result_cache.get_or_compute(calculation)
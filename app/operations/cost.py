@@ -0,0 +1,216 @@
+# app/operations/cost.py
+"""
+Up-front cost estimation for exponentiation.
+
+Right-associative towers grow absurdly fast: with Python integers,
+[10, 10, 10, 10] asks for 10 ** (10 ** 10 ** 10), which pins a CPU and
+exhausts memory long before it finishes. Float towers are cheap to evaluate
+but overflow.
+
+estimate_exponentiation() walks the tower from the right the same way the
+kernel does, but while the running value is small it simply evaluates it.
+Once the value passes SMALL_LOG10 it only tracks log10 of its magnitude,
+using log10|b ** e| = e * log10|b|. That gives, in O(len(inputs)) float
+operations:
+
+- the magnitude of the result (log10),
+- the size of the largest integer intermediate (decimal digits),
+- the work the integer steps would take, in units of digit-operations
+  (Karatsuba multiplication is ~ digits ** 1.585 per step).
+
+check_exponentiation_budget() compares the estimate with the configured
+budgets and either allows exact evaluation, downgrades to float evaluation,
+or rejects the request with a ValueError. The check is deterministic and
+does not depend on how busy the machine is.
+
+Signs that cannot be tracked cheaply are treated as positive, which is the
+expensive direction, so the estimate never under-reports the cost.
+"""
+
+import math
+from typing import Any, NamedTuple, Sequence
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# While log10 of the running value stays below this, the value is evaluated
+# directly (at most ~15 digits, so each step is effectively free).
+SMALL_LOG10 = 15.0
+
+# log10 of the largest finite float64
+FLOAT_MAX_LOG10 = math.log10(1.7976931348623157e308)
+
+# Exponent of the cost of multiplying n-digit integers (Karatsuba)
+_MULTIPLY_COST_EXPONENT = math.log2(3)
+
+
+class PowerEstimate(NamedTuple):
+    """Predicted size and cost of evaluating an exponentiation tower."""
+    log10_magnitude: float  # log10 |result| (-inf for 0, inf if beyond float range of logs)
+    peak_log10: float       # log10 of the largest intermediate (float steps overflow on it)
+    max_digits: float       # decimal digits of the largest integer intermediate
+    work: float             # estimated digit-operations for the integer steps
+    exact: bool             # True if every step is an integer ** non-negative integer
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _log10_abs(value: Any) -> float:
+    """log10 |value|, -inf for zero; works for integers of any size."""
+    if value == 0:
+        return float("-inf")
+    try:
+        return math.log10(abs(value))
+    except (OverflowError, ValueError):
+        return float("inf")
+
+
+def _scaled_log(exponent: Any, log_base: float) -> float:
+    """exponent * log_base, saturating to +/-inf for integers beyond float range."""
+    try:
+        return float(exponent) * log_base
+    except OverflowError:
+        return math.copysign(float("inf"), log_base if exponent > 0 else -log_base)
+
+
+def estimate_exponentiation(inputs: Sequence[Any]) -> PowerEstimate:
+    """
+    Estimate the magnitude and cost of a right-associative exponentiation.
+
+    Args:
+        inputs: The tower, evaluated as inputs[0] ** (inputs[1] ** (...))
+
+    Returns:
+        PowerEstimate: The predicted magnitude, intermediate size and work
+    """
+    exponent = inputs[-1]
+    exponent_is_int = _is_int(exponent)
+    # log10 of the exponent's magnitude once it is too large to keep exactly
+    log_exponent = None
+    exact = exponent_is_int
+    max_digits = max(_log10_abs(exponent), 0.0) + 1 if exponent_is_int else 0.0
+    work = 0.0
+    peak_log10 = _log10_abs(exponent)
+
+    for base in reversed(inputs[:-1]):
+        integer_step = _is_int(base) and exponent_is_int and (
+            log_exponent is not None or exponent >= 0
+        )
+        exact = exact and integer_step
+        log_base = _log10_abs(base)
+
+        # log10 |base ** exponent| = exponent * log10 |base|
+        if log_exponent is None:
+            if exponent == 0 or log_base == 0:
+                log_result = 0.0  # x ** 0 == 1 and |±1| ** e == 1
+            elif log_base == float("-inf"):
+                # 0 ** negative is an error the kernel reports itself
+                log_result = float("-inf") if exponent > 0 else 0.0
+            else:
+                log_result = _scaled_log(exponent, log_base)
+        else:
+            # exponent is huge and (conservatively) positive
+            if log_base == 0:
+                log_result = 0.0
+            elif log_base == float("-inf"):
+                log_result = float("-inf")
+            elif log_exponent > 300:
+                log_result = math.copysign(float("inf"), log_base)
+            else:
+                log_result = (10.0 ** log_exponent) * log_base
+
+        if integer_step and log_result > 0:
+            digits = log_result + 1
+            max_digits = max(max_digits, digits)
+            work += digits ** _MULTIPLY_COST_EXPONENT if math.isfinite(digits) else float("inf")
+
+        if math.isnan(log_result):
+            log_result = float("inf")
+        peak_log10 = max(peak_log10, log_result)
+
+        if log_result <= SMALL_LOG10:
+            # Small enough to evaluate directly (including underflow to ~0)
+            if log_exponent is not None:
+                exponent = 1 if log_result == 0 else 0.0
+            else:
+                try:
+                    exponent = base ** exponent
+                except (OverflowError, ZeroDivisionError):
+                    exponent = 0.0
+                if isinstance(exponent, complex):
+                    exponent = abs(exponent)
+            log_exponent = None
+            exponent_is_int = _is_int(exponent)
+        else:
+            log_exponent = log_result
+            exponent_is_int = integer_step
+
+    if log_exponent is not None:
+        log_magnitude = log_exponent
+    else:
+        log_magnitude = _log10_abs(exponent)
+    return PowerEstimate(
+        log10_magnitude=log_magnitude,
+        peak_log10=peak_log10,
+        max_digits=max_digits,
+        work=work,
+        exact=exact,
+    )
+
+
+def check_exponentiation_budget(inputs: Sequence[Any], exact: bool = False) -> str:
+    """
+    Decide how (and whether) an exponentiation may be evaluated.
+
+    Integer steps (exact big-integer arithmetic) must keep their largest
+    intermediate and total work within EXPONENTIATION_MAX_RESULT_DIGITS and
+    EXPONENTIATION_MAX_WORK. Over budget, with EXPONENTIATION_OVER_BUDGET set
+    to "downgrade", the tower is evaluated in floating point instead (which
+    is O(1) per step); otherwise it is rejected. The result itself must stay
+    within EXPONENTIATION_MAX_LOG10, since results are stored as floats,
+    or within EXACT_MAX_DIGITS digits in exact mode (results stored as
+    NUMERIC, see app.operations.exact).
+
+    Args:
+        inputs: The exponentiation inputs (at least two)
+        exact: Whether the result is kept exact rather than as a float
+
+    Returns:
+        str: "exact" to evaluate with the inputs as given, or "float" to
+             evaluate with the inputs converted to float
+
+    Raises:
+        ValueError: If the evaluation would exceed the configured budgets
+    """
+    estimate = estimate_exponentiation(inputs)
+    max_log10 = min(settings.EXPONENTIATION_MAX_LOG10, FLOAT_MAX_LOG10)
+    # Float evaluation overflows as soon as any intermediate does
+    fits_float = max(estimate.log10_magnitude, estimate.peak_log10) <= max_log10
+
+    if (estimate.max_digits > settings.EXPONENTIATION_MAX_RESULT_DIGITS
+            or estimate.work > settings.EXPONENTIATION_MAX_WORK):
+        if settings.EXPONENTIATION_OVER_BUDGET == "downgrade" and fits_float:
+            return "float"
+        raise ValueError(
+            f"Exponentiation is too expensive: about {_describe(estimate.max_digits)} digits "
+            f"(limit {settings.EXPONENTIATION_MAX_RESULT_DIGITS})"
+        )
+    if exact:
+        # NUMERIC results: bounded by the exact-mode digit budget instead
+        max_log10 = settings.EXACT_MAX_DIGITS
+    if max(estimate.log10_magnitude, estimate.peak_log10) > max_log10:
+        raise ValueError(
+            f"Exponentiation result is out of range: about 10^{_describe(estimate.peak_log10)} "
+            f"(limit 10^{max_log10:.0f})"
+        )
+    return "exact"
+
+
+def _describe(value: float) -> str:
+    """Render a possibly astronomically large estimate for an error message."""
+    if not math.isfinite(value) or value >= 1e15:
+        return "more than 10^15"
+    return f"{value:.0f}"
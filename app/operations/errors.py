@@ -0,0 +1,11 @@
+# app/operations/errors.py
+"""
+Error messages shared by every evaluation path.
+
+The scalar, vectorized, exact and expression kernels (and the request
+validators) raise or report the same conditions; taking the text from here
+keeps the messages identical wherever a calculation fails.
+"""
+
+DIVIDE_BY_ZERO = "Cannot divide by zero."
+MODULO_BY_ZERO = "Cannot perform modulo by zero."
@@ -0,0 +1,208 @@
+# app/operations/exact.py
+"""
+Exact-mode kernels and exact result storage.
+
+In exact mode a calculation keeps its inputs as given (Python ints of any
+size, Decimals parsed straight from the JSON text) instead of float64, and
+the folds run in integer and decimal arithmetic:
+
+- addition, subtraction, multiplication and modulo are exact;
+- exponentiation is exact for integer towers with non-negative exponents
+  (within the exponentiation budgets of app.operations.cost) and uses
+  decimal powers otherwise;
+- division is exact when the quotient has a finite decimal expansion.
+  Quotients (and negative or fractional powers) that have none are rounded
+  to EXACT_DIVISION_DIGITS significant digits.
+
+Results are limited to EXACT_MAX_DIGITS decimal digits. A result that
+float64 cannot represent exactly is stored in the NUMERIC result_exact
+column, with a small summary (sign, log10 magnitude, digit count and a
+digest of the digit string, see summarize()) that listings return instead
+of the digits themselves.
+"""
+
+import hashlib
+import math
+from decimal import (
+    Context, Decimal, DivisionByZero, Inexact, InvalidOperation, Overflow, localcontext,
+)
+from typing import Any, Dict, Optional, Sequence, Union
+
+from app.core.config import get_settings
+from app.operations.cost import check_exponentiation_budget
+from app.operations.errors import DIVIDE_BY_ZERO, MODULO_BY_ZERO
+
+settings = get_settings()
+
+ExactNumber = Union[int, Decimal]
+
+# log10(2): decimal digits per bit of an integer
+_DIGITS_PER_BIT = math.log10(2)
+
+
+def to_exact(value: Any) -> ExactNumber:
+    """An input as an exact number: ints and Decimals as-is, floats by their shortest repr."""
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return Decimal(repr(float(value)))
+
+
+def _context() -> Context:
+    return Context(prec=settings.EXACT_MAX_DIGITS, traps=[InvalidOperation, DivisionByZero, Overflow])
+
+
+def _check_size(value: ExactNumber) -> ExactNumber:
+    """Reject results wider than EXACT_MAX_DIGITS digits (checked per step, before they grow further)."""
+    if isinstance(value, int):
+        too_large = value.bit_length() * _DIGITS_PER_BIT > settings.EXACT_MAX_DIGITS + 1
+    else:
+        too_large = value.adjusted() >= settings.EXACT_MAX_DIGITS
+    if too_large:
+        raise ValueError(f"Exact result is too large (limit {settings.EXACT_MAX_DIGITS} digits).")
+    return value
+
+
+def _fold(inputs: Sequence[Any], step, rounds: bool = False) -> ExactNumber:
+    """
+    Left-fold exact inputs with step(acc, value).
+
+    Decimal steps run at EXACT_MAX_DIGITS precision. If one was inexact, the
+    result either is rounded to EXACT_DIVISION_DIGITS (rounds=True, for
+    quotients and powers) or is rejected, since exact sums and products
+    only lose digits when they outgrow the limit.
+    """
+    values = [to_exact(value) for value in inputs]
+    with localcontext(_context()) as context:
+        result = values[0]
+        for value in values[1:]:
+            result = _check_size(step(result, value))
+        inexact = context.flags[Inexact]
+    if inexact:
+        if not rounds:
+            raise ValueError(f"Exact result is too large (limit {settings.EXACT_MAX_DIGITS} digits).")
+        result = Context(prec=settings.EXACT_DIVISION_DIGITS).plus(result)
+    return result
+
+
+def add(inputs: Sequence[Any]) -> ExactNumber:
+    return _fold([0, *inputs], lambda acc, value: acc + value)
+
+
+def subtract(inputs: Sequence[Any]) -> ExactNumber:
+    return _fold(inputs, lambda acc, value: acc - value)
+
+
+def multiply(inputs: Sequence[Any]) -> ExactNumber:
+    return _fold(inputs, lambda acc, value: acc * value)
+
+
+def _divide_step(acc: ExactNumber, value: ExactNumber) -> ExactNumber:
+    if value == 0:
+        raise ValueError(DIVIDE_BY_ZERO)
+    if isinstance(acc, int) and isinstance(value, int) and acc % value == 0:
+        return acc // value
+    return Decimal(acc) / Decimal(value)
+
+
+def divide(inputs: Sequence[Any]) -> ExactNumber:
+    return _fold(inputs, _divide_step, rounds=True)
+
+
+def _modulo_step(acc: ExactNumber, value: ExactNumber) -> ExactNumber:
+    if value == 0:
+        raise ValueError(MODULO_BY_ZERO)
+    remainder = acc % value
+    # Decimal remainders take the dividend's sign; follow Python's (and the
+    # float kernels') convention of taking the divisor's
+    if remainder and (remainder < 0) != (value < 0):
+        remainder += value
+    return remainder
+
+
+def modulo(inputs: Sequence[Any]) -> ExactNumber:
+    return _fold(inputs, _modulo_step)
+
+
+def exponentiate(inputs: Sequence[Any]) -> Union[ExactNumber, float]:
+    """
+    Right-associative exponentiation, exact for integer towers.
+
+    Over-budget towers that EXPONENTIATION_OVER_BUDGET downgrades are
+    evaluated in floating point, as in the float kernel.
+    """
+    if check_exponentiation_budget(inputs, exact=True) == "float":
+        result = float(inputs[-1])
+        for base in reversed(inputs[:-1]):
+            result = float(base) ** result
+        return result
+
+    values = [to_exact(value) for value in inputs]
+    with localcontext(_context()) as context:
+        result = values[-1]
+        for base in reversed(values[:-1]):
+            if base == 0 and result < 0:
+                raise ValueError("Cannot raise 0 to a negative exponent.")
+            if isinstance(base, int) and isinstance(result, int) and result >= 0:
+                result = base ** result
+            else:
+                try:
+                    result = Decimal(base) ** Decimal(result)
+                except InvalidOperation:
+                    raise ValueError("Exponentiation result is not a real number.")
+                except Overflow:
+                    raise ValueError("Exponentiation result is out of range.")
+            _check_size(result)
+        inexact = context.flags[Inexact]
+    if inexact:
+        result = Context(prec=settings.EXACT_DIVISION_DIGITS).plus(result)
+    return result
+
+
+# ------------------------------------------------------------------------------
+# Exact result storage
+# ------------------------------------------------------------------------------
+def needs_exact_storage(value: Any) -> bool:
+    """Whether a result loses information as float64 (so it is stored as NUMERIC)."""
+    if not isinstance(value, (int, Decimal)) or isinstance(value, bool):
+        return False
+    try:
+        return float(value) != value
+    except OverflowError:
+        return True
+
+
+def float_approximation(value: Any) -> Optional[float]:
+    """The nearest float64 to a result, or None if it is out of float range."""
+    try:
+        approximation = float(value)
+    except OverflowError:
+        return None
+    return approximation if math.isfinite(approximation) else None
+
+
+def canonical_text(value: ExactNumber) -> str:
+    """A result's plain decimal digit string, without exponent or trailing zeros."""
+    text = format(Decimal(value), "f")
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    return "0" if text in ("", "-0") else text
+
+
+def summarize(value: ExactNumber) -> Dict[str, Any]:
+    """
+    The cheap-to-return summary of an exact result.
+
+    Returns:
+        dict: sign (-1, 0 or 1), log10 (of the magnitude), digits (in the
+        digit string) and digest (SHA-256 hex of canonical_text())
+    """
+    text = canonical_text(value)
+    magnitude = abs(Decimal(value))
+    return {
+        "sign": (value > 0) - (value < 0),
+        "log10": float(magnitude.log10(Context(prec=17))) if magnitude else float("-inf"),
+        "digits": sum(character.isdigit() for character in text),
+        "digest": hashlib.sha256(text.encode("ascii")).hexdigest(),
+    }
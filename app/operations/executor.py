@@ -0,0 +1,299 @@
+# app/operations/executor.py
+"""
+Process-pool executor for CPU-heavy calculation kernels.
+
+get_result() is pure Python and holds the GIL, so one heavy calculation
+running in the request threadpool slows every other request in the worker.
+ComputeExecutor routes each calculation by an estimated cost:
+
+- cheap calculations (the vast majority) are evaluated inline, because a
+  round-trip to another process costs far more than they do;
+- heavy calculations are sent to a bounded ProcessPoolExecutor and awaited,
+  so the event loop and the threadpool stay free.
+
+Pool work is bounded three ways:
+
+- a queue-depth limit: when COMPUTE_MAX_PENDING calculations are already
+  waiting on the pool, new ones fail fast with ComputeBusyError (503);
+- a timeout: a calculation that takes longer than COMPUTE_TIMEOUT_SECONDS
+  fails with ComputeTimeoutError (504), and the pool is recycled so the
+  stuck worker process is actually killed;
+- cancellation: when the awaiting request is cancelled (e.g. the client
+  disconnects), a calculation that has not started yet is dropped from the
+  queue.
+
+Calculations are pure functions of (type, inputs), so work that was in
+flight on a recycled pool is safely retried once on the new pool.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Awaitable, Callable, Optional, Sequence
+
+import anyio
+import numpy as np
+
+from app.core.config import get_settings
+from app.operations.cache import result_cache
+from app.operations.cost import estimate_exponentiation
+from app.operations.kernels import evaluate, get_kernel
+
+settings = get_settings()
+
+
+def _weight(calculation_type: str) -> float:
+    """Relative cost of one input of calculation_type (from the kernel registry)."""
+    kernel = get_kernel(str(calculation_type))
+    return kernel.weight if kernel is not None else 1.0
+
+
+class ComputeError(Exception):
+    """A calculation could not be scheduled or finished on the compute pool."""
+    status_code = 503
+
+
+class ComputeBusyError(ComputeError):
+    """The compute pool queue is full."""
+    status_code = 503
+
+
+class ComputeTimeoutError(ComputeError):
+    """A calculation exceeded the compute timeout."""
+    status_code = 504
+
+
+def estimate_cost(
+    calculation_type: str,
+    inputs: Sequence[Any],
+    expression: Optional[str] = None,
+) -> float:
+    """
+    Estimate the cost of evaluating a calculation, in float-operation units.
+
+    Each input costs one unit times the operation's weight; integers wider
+    than a machine word cost proportionally to their size (big-integer
+    arithmetic), integer exponentiation adds the work predicted by the
+    exponentiation cost model, and expressions add one unit per character.
+
+    Args:
+        calculation_type: The calculation type
+        inputs: The numeric inputs
+        expression: The expression text (expression calculations only)
+
+    Returns:
+        float: The estimated cost
+    """
+    weight = _weight(calculation_type)
+    if isinstance(inputs, np.ndarray):
+        # Decoded float64 vectors: one unit per element, no Python loop
+        cost = float(inputs.size) + (len(expression) if expression is not None else 0)
+        cost *= weight
+        if str(calculation_type).lower() == "exponentiation" and inputs.size >= 2:
+            cost += estimate_exponentiation(inputs.tolist()).work
+        return cost
+    if not isinstance(inputs, (list, tuple)):
+        return 0.0  # rejected by get_result() without any work
+    cost = 0.0
+    for value in inputs:
+        if isinstance(value, int) and not isinstance(value, bool):
+            cost += max(1, value.bit_length() // 64)
+        else:
+            cost += 1
+    if expression is not None:
+        cost += len(expression)
+    cost *= weight
+    if str(calculation_type).lower() == "exponentiation" and len(inputs) >= 2:
+        cost += estimate_exponentiation(inputs).work
+    return cost
+
+
+def _evaluate(
+    calculation_type: str,
+    inputs: Sequence[Any],
+    expression: Optional[str] = None,
+    exact: bool = False,
+) -> Any:
+    """Evaluate a calculation (runs inline or in a pool worker process)."""
+    return evaluate(calculation_type, inputs, expression, exact)
+
+
+class ComputeExecutor:
+    """Routes calculations inline or to a bounded process pool."""
+
+    def __init__(
+        self,
+        enabled: bool = settings.COMPUTE_POOL_ENABLED,
+        max_workers: int = settings.COMPUTE_POOL_MAX_WORKERS,
+        inline_max_cost: float = settings.COMPUTE_INLINE_MAX_COST,
+        timeout: float = settings.COMPUTE_TIMEOUT_SECONDS,
+        max_pending: int = settings.COMPUTE_MAX_PENDING,
+    ):
+        self.enabled = enabled
+        self.max_workers = max_workers
+        self.inline_max_cost = inline_max_cost
+        self.timeout = timeout
+        self.max_pending = max_pending
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._generation = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    # --------------------------------------------------------------------------
+    # Pool lifecycle
+    # --------------------------------------------------------------------------
+    def start(self) -> None:
+        """Create the worker pool (workers themselves start on first use)."""
+        with self._lock:
+            if self.enabled and self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    # spawn: never fork a process holding DB connections/threads
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                self._generation += 1
+
+    def shutdown(self) -> None:
+        """Stop the pool, dropping queued work."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _get_pool(self):
+        if self._pool is None:
+            self.start()
+        return self._pool, self._generation
+
+    def _recycle(self, generation: int) -> None:
+        """Kill the workers of a stuck or broken pool and start a fresh one."""
+        with self._lock:
+            if generation != self._generation or self._pool is None:
+                return  # already recycled by another request
+            pool, self._pool = self._pool, None
+        processes = list((getattr(pool, "_processes", None) or {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        self.start()
+
+    # --------------------------------------------------------------------------
+    # Execution
+    # --------------------------------------------------------------------------
+    async def run(
+        self,
+        calculation_type: str,
+        inputs: Sequence[Any],
+        expression: Optional[str] = None,
+        exact: bool = False,
+    ) -> Any:
+        """
+        Evaluate a calculation inline or on the pool, depending on its cost.
+
+        Args:
+            calculation_type: The calculation type
+            inputs: The numeric inputs
+            expression: The expression text (expression calculations only)
+            exact: Whether to evaluate in exact mode (ints and Decimals kept exact)
+
+        Returns:
+            The calculation result
+
+        Raises:
+            ValueError: If the calculation itself is invalid
+            ComputeBusyError: If too many calculations are waiting on the pool
+            ComputeTimeoutError: If the calculation exceeded the timeout
+        """
+        if not self.enabled or estimate_cost(calculation_type, inputs, expression) <= self.inline_max_cost:
+            return _evaluate(calculation_type, inputs, expression, exact)
+
+        if self._pending >= self.max_pending:
+            raise ComputeBusyError("The calculation service is busy; please retry shortly.")
+        self._pending += 1
+        try:
+            for attempt in range(2):
+                pool, generation = self._get_pool()
+                if not isinstance(inputs, np.ndarray):
+                    inputs = list(inputs)
+                future = pool.submit(_evaluate, calculation_type, inputs, expression, exact)
+                try:
+                    # Cancelling the awaiting task (timeout or disconnect)
+                    # also cancels the pool future if it has not started.
+                    return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+                except asyncio.TimeoutError:
+                    self._recycle(generation)
+                    raise ComputeTimeoutError(
+                        f"Calculation did not finish within {self.timeout:g} seconds."
+                    )
+                except BrokenProcessPool:
+                    self._recycle(generation)
+                    if attempt:
+                        raise ComputeError("The calculation service is unavailable; please retry.")
+        finally:
+            self._pending -= 1
+
+    def stats(self) -> dict:
+        """Current pool configuration and queue depth."""
+        return {
+            "enabled": self.enabled,
+            "started": self._pool is not None,
+            "max_workers": self.max_workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "inline_max_cost": self.inline_max_cost,
+            "timeout_seconds": self.timeout,
+        }
+
+
+# Process-wide executor used by the API routes
+compute_executor = ComputeExecutor()
+
+
+async def compute_result_async(
+    calculation,
+    inputs: Optional[Sequence[Any]] = None,
+    exact: bool = False,
+) -> Any:
+    """
+    Compute a calculation's result through the result cache (when enabled)
+    and the compute executor, without blocking the event loop on heavy work.
+
+    Exact-mode results bypass the cache, which holds float results only.
+
+    Args:
+        calculation: A Calculation instance (type and inputs set)
+        inputs: The inputs as received, if already decoded (e.g. a float64
+                array from a packed request body); defaults to
+                calculation.inputs
+        exact: Whether to evaluate in exact mode
+
+    Returns:
+        The calculation result
+    """
+    if inputs is None:
+        inputs = calculation.inputs
+    compute: Callable[[], Awaitable[Any]] = lambda: compute_executor.run(
+        calculation.type, inputs, getattr(calculation, "expression", None), exact
+    )
+    if exact or not settings.RESULT_CACHE_ENABLED:
+        return await compute()
+    return await result_cache.aget_or_compute(calculation, compute, inputs)
+
+
+def compute_result(
+    calculation,
+    inputs: Optional[Sequence[Any]] = None,
+    exact: bool = False,
+) -> Any:
+    """
+    compute_result_async() for code running in the threadpool.
+
+    The computation is handed back to the event loop, so it goes through
+    the result cache and the compute executor (queue limit, timeout) like
+    a request's own calculation.
+    """
+    return anyio.from_thread.run(compute_result_async, calculation, inputs, exact)
@@ -0,0 +1,113 @@
+# app/operations/export.py
+"""
+Streaming export of calculations as NDJSON or CSV.
+
+Rows are read with a server-side cursor (yield_per: psycopg streams the
+result set instead of buffering it) as plain column tuples, never as ORM
+objects or Pydantic models, and are encoded one fixed-size chunk at a time.
+Memory therefore stays proportional to EXPORT_CHUNK_SIZE whatever the
+number of rows, and the first chunk is sent as soon as it is read.
+
+Every export has the same columns: id, type, inputs, expression, result,
+result_exact (the full digits of an exact-mode result, else null),
+created_at and updated_at. In CSV, inputs is the JSON array text.
+"""
+
+import csv
+import io
+import json
+from decimal import Decimal
+from typing import Any, Iterator, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.operations.exact import canonical_text, float_approximation
+
+settings = get_settings()
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_COLUMNS = ("id", "type", "inputs", "expression", "result", "result_exact", "created_at", "updated_at")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def export_rows(db, query, chunk_size: Optional[int] = None) -> Iterator[Sequence[tuple]]:
+    """
+    Read the rows of a calculations query in chunks through a server-side cursor.
+
+    Args:
+        db: SQLAlchemy database session (kept open while iterating)
+        query: A Calculation query (e.g. from Calculation.filter_query())
+        chunk_size: Rows per chunk (defaults to EXPORT_CHUNK_SIZE)
+
+    Yields:
+        Sequence[tuple]: (id, type, inputs, expression, result,
+        result_exact, created_at, updated_at) tuples, oldest first
+    """
+    from app.models.calculation import Calculation
+
+    statement = (
+        query.with_entities(
+            Calculation.id, Calculation.type, Calculation.inputs_json, Calculation.inputs_packed,
+            Calculation.expression, Calculation.result, Calculation.result_exact,
+            Calculation.created_at, Calculation.updated_at,
+        )
+        .order_by(Calculation.created_at, Calculation.id)
+        .statement
+        .execution_options(yield_per=chunk_size or settings.EXPORT_CHUNK_SIZE)
+    )
+    for partition in db.execute(statement).partitions():
+        yield [
+            (row.id, row.type, Calculation.decode_inputs(row.inputs_json, row.inputs_packed), row.expression,
+             row.result, row.result_exact, row.created_at, row.updated_at)
+            for row in partition
+        ]
+
+
+def _values(row: tuple) -> list:
+    calculation_id, calculation_type, inputs, expression, result, result_exact, created_at, updated_at = row
+    return [
+        str(calculation_id),
+        calculation_type,
+        inputs.tolist() if isinstance(inputs, np.ndarray) else [
+            (str(value) if float_approximation(value) is None else float(value)) if isinstance(value, Decimal)
+            else value
+            for value in inputs
+        ],
+        expression,
+        result,
+        None if result_exact is None else canonical_text(result_exact),
+        created_at.isoformat(),
+        updated_at.isoformat(),
+    ]
+
+
+def encode_ndjson(rows: Sequence[tuple]) -> bytes:
+    """One JSON object per row, newline-terminated."""
+    return "".join(json.dumps(dict(zip(EXPORT_COLUMNS, _values(row)))) + "\n" for row in rows).encode("utf-8")
+
+
+def encode_csv(rows: Sequence[tuple], header: bool = False) -> bytes:
+    """CSV lines for the rows (inputs as JSON text, nulls as empty fields), optionally after the header."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        values = _values(row)
+        values[2] = json.dumps(values[2])
+        writer.writerow(["" if value is None else value for value in values])
+    return buffer.getvalue().encode("utf-8")
+
+
+def stream_export(db, query, export_format: str, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+    """
+    A calculations query encoded as NDJSON or CSV, one chunk of rows at a time.
+
+    The CSV header is yielded before the first row is read.
+    """
+    if export_format == "csv":
+        yield encode_csv([], header=True)
+    encode: Any = encode_csv if export_format == "csv" else encode_ndjson
+    for rows in export_rows(db, query, chunk_size):
+        yield encode(rows)
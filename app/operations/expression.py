@@ -0,0 +1,273 @@
+# app/operations/expression.py
+"""
+Compiled arithmetic expressions for the "expression" calculation type.
+
+An expression such as "(a + b) / c ** 2" combines the six operations in one
+calculation. Its variables are bound to the calculation's inputs in order of
+first appearance (a = inputs[0], b = inputs[1], c = inputs[2]).
+
+Expressions are parsed with Python's own parser and then checked against a
+whitelist: numbers, variable names, parentheses, unary +/- and the binary
+operators + - * / % **. Anything else (calls, attributes, subscripts,
+comparisons, names starting with an underscore, ...) is rejected. The checked
+tree is compiled to a Python function with no builtins, in which /, % and
+** go through helpers that raise the same errors as the operation kernels.
+
+compile_expression() is memoized on the expression text, so repeated
+expressions are parsed and compiled once per process. Each CompiledExpression
+has a scalar evaluate() and a vectorized evaluate_many() that evaluates the
+same expression over a matrix of bindings (one row per binding) with NumPy,
+reporting errors per row like app.operations.batch.
+
+All values are evaluated as float64, like the other calculation types.
+"""
+
+import ast
+from functools import lru_cache
+from typing import Callable, List, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.operations.errors import DIVIDE_BY_ZERO, MODULO_BY_ZERO
+
+settings = get_settings()
+
+_BINARY_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod, ast.Pow)
+_UNARY_OPERATORS = (ast.UAdd, ast.USub)
+
+# Operators routed through the error-checking helpers below
+_HELPER_NAMES = {ast.Div: "_div", ast.Mod: "_mod", ast.Pow: "_pow"}
+
+
+# ------------------------------------------------------------------------------
+# Scalar helpers (same errors as the Division/Modulo/Exponentiation kernels)
+# ------------------------------------------------------------------------------
+def _div(a: float, b: float) -> float:
+    if b == 0:
+        raise ValueError(DIVIDE_BY_ZERO)
+    return a / b
+
+
+def _mod(a: float, b: float) -> float:
+    if b == 0:
+        raise ValueError(MODULO_BY_ZERO)
+    return a % b
+
+
+def _pow(a: float, b: float) -> float:
+    if a == 0 and b < 0:
+        raise ValueError("Cannot raise 0 to a negative exponent.")
+    try:
+        result = a ** b
+    except OverflowError:
+        raise ValueError("Expression result is out of range.")
+    if isinstance(result, complex):
+        raise ValueError("Expression result is not a real number.")
+    return result
+
+
+# ------------------------------------------------------------------------------
+# Parsing and compilation
+# ------------------------------------------------------------------------------
+def _check_node(node: ast.AST) -> None:
+    """Reject any syntax outside the arithmetic whitelist."""
+    if isinstance(node, ast.BinOp):
+        if not isinstance(node.op, _BINARY_OPERATORS):
+            raise ValueError(f"Operator not allowed in expression: {type(node.op).__name__}")
+    elif isinstance(node, ast.UnaryOp):
+        if not isinstance(node.op, _UNARY_OPERATORS):
+            raise ValueError(f"Operator not allowed in expression: {type(node.op).__name__}")
+    elif isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError("Only numeric constants are allowed in expressions.")
+    elif isinstance(node, ast.Name):
+        if not isinstance(node.ctx, ast.Load) or node.id.startswith("_"):
+            raise ValueError(f"Invalid variable name in expression: {node.id}")
+    elif not isinstance(node, (ast.Expression, ast.operator, ast.unaryop, ast.expr_context)):
+        raise ValueError(f"Syntax not allowed in expression: {type(node).__name__}")
+
+
+class _Rewriter(ast.NodeTransformer):
+    """Route /, % and ** through the helpers and make every constant a float."""
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+        self.generic_visit(node)
+        helper = _HELPER_NAMES.get(type(node.op))
+        if helper is None:
+            return node
+        return ast.Call(func=ast.Name(id=helper, ctx=ast.Load()), args=[node.left, node.right], keywords=[])
+
+    def visit_Constant(self, node: ast.Constant) -> ast.AST:
+        try:
+            return ast.Constant(value=float(node.value))
+        except OverflowError:
+            raise ValueError("Numeric constant is out of range.")
+
+
+def _arguments(names: Sequence[str]) -> ast.arguments:
+    return ast.arguments(
+        posonlyargs=[],
+        args=[ast.arg(arg=name) for name in names],
+        kwonlyargs=[],
+        kw_defaults=[],
+        defaults=[],
+    )
+
+
+class CompiledExpression:
+    """A parsed, checked and compiled arithmetic expression."""
+
+    def __init__(self, text: str, variables: Tuple[str, ...], factory: Callable):
+        self.text = text
+        self.variables = variables
+        # factory(_div, _mod, _pow) returns the evaluator for those helpers
+        self._factory = factory
+        self._scalar = factory(_div, _mod, _pow)
+
+    def _check_arity(self, count: int) -> None:
+        if count != len(self.variables):
+            names = ", ".join(self.variables) or "none"
+            raise ValueError(
+                f"Expression expects {len(self.variables)} inputs ({names}), got {count}."
+            )
+
+    def evaluate(self, values: Sequence[float]) -> float:
+        """
+        Evaluate the expression for one binding of its variables.
+
+        Args:
+            values: One value per variable, in order of first appearance
+
+        Returns:
+            float: The result
+
+        Raises:
+            ValueError: On a wrong number of values or an arithmetic error
+        """
+        self._check_arity(len(values))
+        try:
+            floats = [float(value) for value in values]
+        except OverflowError:
+            raise ValueError("Expression inputs are out of range.")
+        return self._scalar(*floats)
+
+    def evaluate_many(self, matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate the expression for many bindings at once.
+
+        Args:
+            matrix: 2-D float64 array, one row per binding and one column per variable
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The results, and an object array
+            holding the first error message of each row (None where it succeeded)
+        """
+        from app.operations.kernels import _flag
+
+        matrix = np.asarray(matrix, dtype=np.float64)
+        self._check_arity(matrix.shape[1])
+        rows = matrix.shape[0]
+        errors = np.full(rows, None, dtype=object)
+
+        def flag(mask, message):
+            _flag(errors, np.broadcast_to(mask, (rows,)), message)
+
+        def vdiv(a, b):
+            flag(np.asarray(b) == 0, DIVIDE_BY_ZERO)
+            return np.divide(a, b)
+
+        def vmod(a, b):
+            flag(np.asarray(b) == 0, MODULO_BY_ZERO)
+            return np.remainder(a, b)
+
+        def vpow(a, b):
+            flag((np.asarray(a) == 0) & (np.asarray(b) < 0), "Cannot raise 0 to a negative exponent.")
+            finite_operands = np.isfinite(a) & np.isfinite(b)
+            result = np.power(a, b)
+            flag(finite_operands & np.isinf(result), "Expression result is out of range.")
+            flag(finite_operands & np.isnan(result), "Expression result is not a real number.")
+            return result
+
+        with np.errstate(all="ignore"):
+            values = self._factory(vdiv, vmod, vpow)(*matrix.T)
+        values = np.array(np.broadcast_to(values, (rows,)), dtype=np.float64)
+        return values, errors
+
+    def __repr__(self):
+        return f"<CompiledExpression {self.text!r} variables={self.variables}>"
+
+
+_TOO_DEEP = "Expression is nested too deeply."
+
+
+def _depth(tree: ast.AST) -> int:
+    """The nesting depth of a syntax tree, measured without recursion."""
+    deepest = 0
+    stack = [(tree, 1)]
+    while stack:
+        node, depth = stack.pop()
+        deepest = max(deepest, depth)
+        stack.extend((child, depth + 1) for child in ast.iter_child_nodes(node))
+    return deepest
+
+
+@lru_cache(maxsize=settings.EXPRESSION_CACHE_SIZE)
+def compile_expression(text: str) -> CompiledExpression:
+    """
+    Parse, check and compile an expression (memoized on its text).
+
+    Args:
+        text: The expression, e.g. "(a + b) / c ** 2"
+
+    Returns:
+        CompiledExpression: The compiled expression
+
+    Raises:
+        ValueError: If the expression is too long or too deeply nested,
+                    malformed, or uses anything outside the arithmetic
+                    whitelist
+    """
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError("Expression must be a non-empty string.")
+    if len(text) > settings.EXPRESSION_MAX_LENGTH:
+        raise ValueError(f"Expression is too long (limit {settings.EXPRESSION_MAX_LENGTH} characters).")
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except (SyntaxError, ValueError):
+        raise ValueError("Expression is not valid arithmetic.")
+    except (RecursionError, MemoryError):
+        raise ValueError(_TOO_DEEP)
+    if _depth(tree) > settings.EXPRESSION_MAX_DEPTH:
+        raise ValueError(_TOO_DEEP)
+
+    names: List[ast.Name] = []
+    for node in ast.walk(tree):
+        _check_node(node)
+        if isinstance(node, ast.Name):
+            names.append(node)
+
+    # Variables bind to inputs in order of first appearance in the text
+    variables: List[str] = []
+    for node in sorted(names, key=lambda n: (n.lineno, n.col_offset)):
+        if node.id not in variables:
+            variables.append(node.id)
+
+    try:
+        body = _Rewriter().visit(tree).body
+    except (RecursionError, MemoryError):
+        raise ValueError(_TOO_DEEP)
+    # lambda _div, _mod, _pow: lambda <variables>: <body>
+    factory = ast.Expression(
+        body=ast.Lambda(
+            args=_arguments(["_div", "_mod", "_pow"]),
+            body=ast.Lambda(args=_arguments(variables), body=body),
+        )
+    )
+    try:
+        ast.fix_missing_locations(factory)
+        code = compile(factory, "<expression>", "eval")
+    except (RecursionError, MemoryError):
+        raise ValueError(_TOO_DEEP)
+    return CompiledExpression(text, tuple(variables), eval(code, {"__builtins__": {}}))
+
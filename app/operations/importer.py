@@ -0,0 +1,382 @@
+# app/operations/importer.py
+"""
+Streaming bulk import of calculations from CSV or NDJSON.
+
+The input is read as a stream of byte chunks, in the format GET
+/calculations/export writes: one calculation per line with type, inputs
+and expression (in CSV, inputs is JSON array text), and optionally
+created_at, which is kept so historical data retains its timestamps.
+Other columns (id, result, ...) are ignored: ids are new and results are
+recomputed. The chunks are split into lines of at most
+IMPORT_MAX_LINE_BYTES; CSV lines go through a single csv.reader, so quoted
+fields may span lines.
+
+Lines are handled in chunks of IMPORT_CHUNK_SIZE:
+
+1. each line is parsed and validated with the API's CalculationBase schema;
+2. the valid ones are evaluated together by the vectorized batch engine;
+3. the computed rows are written with COPY ... FROM STDIN into a temporary
+   staging table (dropped on commit), and moved into calculations with one
+   INSERT ... SELECT;
+4. the chunk is committed.
+
+A line that fails to parse, validate or compute, or is too long, is
+reported with its line number and skipped; it never aborts the load.
+Memory is bounded by one chunk and one line, whatever the size of the
+input.
+
+Command line:
+
+    python -m app.operations.importer --user-id <uuid> calculations.csv
+"""
+
+import argparse
+import csv
+import io
+import json
+import logging
+import sys
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import text
+
+from app.core.config import get_settings
+from app.operations.batch import evaluate_batch
+from app.operations.cache import make_key
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("ndjson", "csv")
+
+# Bytes read at a time from a file by the command line
+_READ_SIZE = 1 << 16
+
+_STAGING_TABLE = "calculation_import_staging"
+_STAGING_COLUMNS = (
+    "id", "type", "inputs", "inputs_packed", "inputs_hash", "expression", "result", "created_at", "updated_at",
+)
+_STAGING_DDL = f"""
+    CREATE TEMP TABLE {_STAGING_TABLE} (
+        id UUID,
+        type VARCHAR(50),
+        inputs JSON,
+        inputs_packed BYTEA,
+        inputs_hash VARCHAR(64),
+        expression TEXT,
+        result DOUBLE PRECISION,
+        created_at TIMESTAMP,
+        updated_at TIMESTAMP
+    ) ON COMMIT DROP
+"""
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    """An ISO 8601 created_at as naive UTC (like the stored columns), or None if absent."""
+    if value in (None, ""):
+        return None
+    if not isinstance(value, str):
+        raise ValueError("created_at must be an ISO 8601 timestamp")
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError("created_at must be an ISO 8601 timestamp")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class CalculationImporter:
+    """
+    Imports calculations for one user from a CSV or NDJSON byte stream.
+
+    read() consumes the stream and returns the summary. Each full chunk is
+    validated, computed, loaded and committed as soon as it is complete.
+    """
+
+    def __init__(
+        self,
+        db,
+        user_id: uuid.UUID,
+        import_format: str = "ndjson",
+        chunk_size: Optional[int] = None,
+        on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None,
+        max_line_bytes: Optional[int] = None,
+    ):
+        """
+        Args:
+            db: SQLAlchemy database session
+            user_id: The UUID of the user who will own the calculations
+            import_format: "ndjson" or "csv" (with a header line)
+            chunk_size: Lines per chunk (defaults to IMPORT_CHUNK_SIZE)
+            on_chunk: Called with the running summary after each committed chunk
+            max_line_bytes: Longest line accepted (defaults to IMPORT_MAX_LINE_BYTES)
+        """
+        if import_format not in IMPORT_FORMATS:
+            raise ValueError(f"Import format must be one of: {', '.join(IMPORT_FORMATS)}")
+        self.db = db
+        self.user_id = user_id
+        self.import_format = import_format
+        self.chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+        self.on_chunk = on_chunk
+        self.max_line_bytes = max_line_bytes or settings.IMPORT_MAX_LINE_BYTES
+        self.line_number = 0
+        self.record_start: Optional[int] = None
+        self.header: Optional[List[str]] = None
+        self.pending: List[Tuple[int, Dict[str, Any]]] = []
+        self.summary: Dict[str, Any] = {
+            "processed": 0, "imported": 0, "failed": 0, "chunks": 0, "errors": [], "errors_truncated": False,
+        }
+
+    def _error(self, line_number: int, message: str) -> None:
+        self.summary["failed"] += 1
+        if len(self.summary["errors"]) < settings.IMPORT_MAX_REPORTED_ERRORS:
+            self.summary["errors"].append({"line": line_number, "error": message})
+        else:
+            self.summary["errors_truncated"] = True
+
+    def _unreadable(self, line_number: int, message: Any) -> None:
+        self.summary["processed"] += 1
+        self._error(line_number, f"Unreadable line: {message}")
+
+    def _lines(self, chunks: Iterable[bytes]) -> Iterator[str]:
+        """
+        The stream's lines, decoded, each with its line ending.
+
+        Only the current partial line is buffered: once it grows past
+        max_line_bytes it is dropped, and the line is reported when its end
+        arrives. Lines that are not UTF-8 are reported and skipped too.
+        """
+        buffer = bytearray()
+        too_long = False
+        for data in chunks:
+            scan = len(buffer)
+            buffer += data
+            start = 0
+            while (end := buffer.find(b"\n", scan)) >= 0:
+                line = self._decode(buffer[start:end + 1], too_long)
+                start = scan = end + 1
+                too_long = False
+                if line is not None:
+                    yield line
+            del buffer[:start]
+            if len(buffer) > self.max_line_bytes:
+                buffer.clear()
+                too_long = True
+        if buffer or too_long:
+            line = self._decode(buffer, too_long)
+            if line is not None:
+                yield line
+
+    def _decode(self, data: bytearray, too_long: bool) -> Optional[str]:
+        """One line as text, or None (reported) if it is too long or not UTF-8."""
+        self.line_number += 1
+        if too_long or len(data.rstrip(b"\r\n")) > self.max_line_bytes:
+            self._unreadable(self.line_number, f"longer than {self.max_line_bytes} bytes")
+            return None
+        try:
+            return data.decode("utf-8")
+        except UnicodeDecodeError as e:
+            self._unreadable(self.line_number, e)
+            return None
+
+    def _ndjson_records(self, lines: Iterable[str]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("Each line must be a JSON object")
+            except ValueError as e:
+                self._unreadable(self.line_number, e)
+                continue
+            yield self.line_number, record
+
+    def _mark_record_start(self, lines: Iterable[str]) -> Iterator[str]:
+        """Pass lines to the csv.reader, noting the line number each record starts on."""
+        for line in lines:
+            if self.record_start is None:
+                self.record_start = self.line_number
+            yield line
+
+    def _csv_records(self, lines: Iterable[str]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        reader = csv.reader(self._mark_record_start(lines))
+        while True:
+            try:
+                values = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                line_number, self.record_start = self.record_start, None
+                self._unreadable(line_number, e)
+                continue
+            line_number, self.record_start = self.record_start, None
+            if not values:
+                continue
+            try:
+                record = self._csv_record(values)
+            except ValueError as e:
+                self._unreadable(line_number, e)
+                continue
+            if record is not None:
+                yield line_number, record
+
+    def _csv_record(self, values: List[str]) -> Optional[Dict[str, Any]]:
+        """One CSV record as a record dict, or None for the header."""
+        if self.header is None:
+            if "type" not in values or "inputs" not in values:
+                raise ValueError("The CSV header must name the type and inputs columns")
+            self.header = values
+            return None
+        if len(values) != len(self.header):
+            raise ValueError(f"Expected {len(self.header)} fields, got {len(values)}")
+        record = dict(zip(self.header, values))
+        record["inputs"] = json.loads(record["inputs"])
+        record["expression"] = record.get("expression") or None
+        return record
+
+    def read(self, chunks: Iterable[bytes]) -> Dict[str, Any]:
+        """
+        Import a whole stream, given as byte chunks of any size.
+
+        Args:
+            chunks: The input, in order (e.g. a request body's chunks)
+
+        Returns:
+            dict: The summary (see finish())
+        """
+        lines = self._lines(chunks)
+        records = self._csv_records(lines) if self.import_format == "csv" else self._ndjson_records(lines)
+        for line_number, record in records:
+            self.summary["processed"] += 1
+            self.pending.append((line_number, record))
+            if len(self.pending) >= self.chunk_size:
+                self._load_chunk()
+        return self.finish()
+
+    def finish(self) -> Dict[str, Any]:
+        """Load the last partial chunk and return the summary."""
+        if self.pending:
+            self._load_chunk()
+        return self.summary
+
+    def _load_chunk(self) -> None:
+        from app.models.calculation import Calculation
+        from app.schemas.calculation import CalculationBase
+
+        chunk, self.pending = self.pending, []
+        valid = []
+        for line_number, record in chunk:
+            try:
+                data = CalculationBase.model_validate({
+                    "type": record.get("type"),
+                    "inputs": record.get("inputs"),
+                    "expression": record.get("expression"),
+                })
+                if data.references:
+                    raise ValueError("Inputs referencing other calculations cannot be imported")
+                created_at = _parse_timestamp(record.get("created_at"))
+            except ValidationError as e:
+                self._error(line_number, "; ".join(error["msg"] for error in e.errors()))
+                continue
+            except ValueError as e:
+                self._error(line_number, str(e))
+                continue
+            valid.append((line_number, data, created_at))
+
+        outcomes = evaluate_batch([(data.type.value, data.inputs, data.expression) for _, data, _ in valid])
+        now = datetime.utcnow()
+        rows = []
+        for (line_number, data, created_at), outcome in zip(valid, outcomes):
+            if not outcome.ok:
+                self._error(line_number, outcome.error)
+                continue
+            calculation_type = data.type.value
+            inputs_json, inputs_packed = Calculation.storage_values(data.inputs)
+            rows.append((
+                uuid.uuid4(),
+                calculation_type,
+                None if inputs_json is None else json.dumps(inputs_json),
+                None if inputs_packed is None else "\\x" + inputs_packed.hex(),
+                make_key(calculation_type, data.inputs, data.expression),
+                data.expression,
+                outcome.result,
+                (created_at or now).isoformat(),
+                now.isoformat(),
+            ))
+
+        if rows:
+            self._copy(rows)
+        self.summary["imported"] += len(rows)
+        self.summary["chunks"] += 1
+        logger.info("Import chunk %d: %d lines processed, %d imported, %d failed",
+                    self.summary["chunks"], self.summary["processed"], self.summary["imported"],
+                    self.summary["failed"])
+        if self.on_chunk is not None:
+            self.on_chunk(self.summary)
+
+    def _copy(self, rows: Sequence[tuple]) -> None:
+        """COPY the rows into a staging table, move them into calculations, and commit."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(["" if value is None else value for value in row])  # unquoted empty = NULL
+        buffer.seek(0)
+
+        columns = ", ".join(_STAGING_COLUMNS)
+        try:
+            cursor = self.db.connection().connection.cursor()
+            cursor.execute(_STAGING_DDL)
+            cursor.copy_expert(f"COPY {_STAGING_TABLE} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+            self.db.execute(
+                text(f"INSERT INTO calculations (user_id, {columns}) "
+                     f"SELECT :user_id, {columns} FROM {_STAGING_TABLE}"),
+                {"user_id": self.user_id},
+            )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command-line entry point: import a CSV or NDJSON file for one user."""
+    from app.database import SessionLocal
+    from app.models.user import User  # noqa: F401 - registers the User mapper
+
+    parser = argparse.ArgumentParser(description="Import calculations from a CSV or NDJSON file.")
+    parser.add_argument("path", help="file to import ('-' for standard input)")
+    parser.add_argument("--user-id", required=True, type=uuid.UUID, help="owner of the imported calculations")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="defaults to the file extension (else ndjson)")
+    parser.add_argument("--chunk-size", type=int, default=settings.IMPORT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    import_format = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+
+    def progress(summary: Dict[str, Any]) -> None:
+        print(f"{summary['processed']} lines processed: {summary['imported']} imported, "
+              f"{summary['failed']} failed", flush=True)
+
+    db = SessionLocal()
+    source = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+    try:
+        importer = CalculationImporter(db, args.user_id, import_format, args.chunk_size, on_chunk=progress)
+        summary = importer.read(iter(lambda: source.read(_READ_SIZE), b""))
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        db.close()
+    for error in summary["errors"]:
+        print(f"line {error['line']}: {error['error']}", file=sys.stderr)
+    if summary["errors_truncated"]:
+        print("(more errors not shown)", file=sys.stderr)
+    print(f"Imported {summary['imported']} calculations ({summary['failed']} lines failed).")
+
+
+if __name__ == "__main__":
+    main()  # pragma: no cover
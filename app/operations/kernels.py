@@ -0,0 +1,579 @@
+# app/operations/kernels.py
+"""
+Calculation kernel registry.
+
+Every calculation type's arithmetic is implemented once, here, behind
+three entry points that always agree with each other:
+
+- scalar: evaluate(type, inputs) on Python numbers, with Python semantics
+  (integer folds stay exact). The model get_result() methods and the
+  app.operations helpers both go through it;
+- batch: Kernel.batch(matrix, errors) folds many calculations of the same
+  length at once, one input column at a time (app.operations.batch);
+- streaming: fold_vector() / unfold_vector() continue or undo a left fold
+  over a float64 vector with one ufunc.accumulate. evaluate() uses them for
+  float64 arrays (packed inputs); upload sessions and PATCH use them chunk
+  by chunk.
+
+The arithmetic folds also have an exact entry point (Kernel.exact, see
+app.operations.exact), used by evaluate(..., exact=True) to keep ints and
+Decimals exact instead of rounding through float64.
+
+Validation is shared as well: every entry point rejects the same inputs
+with the same messages (see check_inputs()), and a kernel's validate hook
+holds the type-specific request checks the API schemas run. A new fast
+path for a type is added to its Kernel entry and every caller picks it up.
+
+The registry is the single list of calculation types: the API's
+CalculationType enum, the model classes and the dashboard forms are all
+built from operation_names(). Besides the built-in kernels below, other
+packages can add operations through the "calculator.operations" entry
+point group. Each entry point is named after its operation and refers to a
+Kernel (or a zero-argument callable returning one); only the names are read
+at startup, and the module is imported the first time the operation is
+used (get_kernel()), so unused operations cost nothing.
+
+Expression calculations are registered too, but have no scalar kernel:
+they need their expression text, so evaluate() hands them to
+app.operations.expression.
+"""
+
+import re
+import threading
+from decimal import Decimal
+from importlib.metadata import EntryPoint, entry_points
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from app.operations import exact as exact_kernels
+from app.operations import statistics
+from app.operations.cost import check_exponentiation_budget
+from app.operations.errors import DIVIDE_BY_ZERO, MODULO_BY_ZERO
+from app.operations.expression import compile_expression
+
+NOT_A_LIST = "Inputs must be a list of numbers."
+NOT_NUMBERS = "All inputs must be numbers."
+TOO_FEW_INPUTS = "Inputs must be a list with at least two numbers."
+# JSON has no infinity or NaN, so overflowed results are reported as errors
+NOT_FINITE = "Result is not a finite number."
+
+
+class BatchResult(NamedTuple):
+    """Outcome of one calculation: either a result or an error message."""
+    result: Optional[float]
+    error: Optional[str]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class Kernel(NamedTuple):
+    """
+    Every implementation of one calculation type.
+
+    scalar is required (except for the expression type); the others are
+    optional fast paths. accumulate (and inverse) are only set for left
+    folds, where ufunc.accumulate applies the operation in exactly the
+    scalar loop's order.
+    """
+    name: str
+    scalar: Optional[Callable[[Sequence[Any]], Any]]
+    batch: Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]] = None
+    accumulate: Optional[np.ufunc] = None
+    inverse: Optional[np.ufunc] = None
+    zero_divisor_error: Optional[str] = None
+    # Whether scalar accepts float64 arrays as-is (NumPy-based kernels)
+    takes_arrays: bool = False
+    # Relative cost of one input (see app.operations.executor.estimate_cost)
+    weight: float = 1.0
+    # Request-time checks beyond check_inputs(), run by the API schemas;
+    # raise ValueError with a message for the client
+    validate: Optional[Callable[[Sequence[Any]], None]] = None
+    # Fewest inputs the API accepts
+    min_inputs: int = 2
+    # Whether the calculation is evaluated from expression text
+    expression: bool = False
+    # Name shown in forms (defaults to the name in title case)
+    label: Optional[str] = None
+    # Exact-mode kernel over ints and Decimals (see app.operations.exact)
+    exact: Optional[Callable[[Sequence[Any]], Any]] = None
+
+    @property
+    def display_name(self) -> str:
+        return self.label or operation_label(self.name)
+
+
+# ------------------------------------------------------------------------------
+# Validation
+# ------------------------------------------------------------------------------
+def check_inputs(inputs: Any, minimum: int = 2, exact: bool = False) -> Any:
+    """
+    Apply the input rules shared by every kernel.
+
+    Args:
+        inputs: A list/tuple of numbers or a 1-D float64 array
+        minimum: The smallest number of inputs allowed
+        exact: Whether Decimals are accepted too (exact kernels)
+
+    Returns:
+        The inputs, unchanged
+
+    Raises:
+        ValueError: If inputs is not a flat sequence of numbers or too short
+    """
+    if isinstance(inputs, np.ndarray):
+        if inputs.ndim != 1:
+            raise ValueError(NOT_A_LIST)
+    elif not isinstance(inputs, (list, tuple)):
+        raise ValueError(NOT_A_LIST)
+    elif not all(isinstance(value, (int, float, Decimal) if exact else (int, float)) for value in inputs):
+        raise ValueError(NOT_NUMBERS)
+    if len(inputs) < minimum:
+        raise ValueError(TOO_FEW_INPUTS if minimum == 2 else f"Inputs must be a list with at least {minimum} numbers.")
+    return inputs
+
+
+# ------------------------------------------------------------------------------
+# Scalar kernels (Python numbers, validated inputs)
+# ------------------------------------------------------------------------------
+def _add(inputs: Sequence[Any]) -> Any:
+    return sum(inputs)
+
+
+def _subtract(inputs: Sequence[Any]) -> Any:
+    result = inputs[0]
+    for value in inputs[1:]:
+        result -= value
+    return result
+
+
+def _multiply(inputs: Sequence[Any]) -> Any:
+    result = 1
+    for value in inputs:
+        result *= value
+    return result
+
+
+def _divide(inputs: Sequence[Any]) -> Any:
+    result = inputs[0]
+    for value in inputs[1:]:
+        if value == 0:
+            raise ValueError(DIVIDE_BY_ZERO)
+        result /= value
+    return result
+
+
+def _modulo(inputs: Sequence[Any]) -> Any:
+    result = inputs[0]
+    for value in inputs[1:]:
+        if value == 0:
+            raise ValueError(MODULO_BY_ZERO)
+        result %= value
+    return result
+
+
+def _exponentiate(inputs: Sequence[Any]) -> Any:
+    # Check the predicted size and cost before doing any work; over-budget
+    # integer towers may be downgraded to float evaluation.
+    if check_exponentiation_budget(inputs) == "float":
+        inputs = [float(x) for x in inputs]
+    # Right-associative: start from the right-most exponent
+    result = inputs[-1]
+    for base in reversed(inputs[:-1]):
+        if base == 0 and result < 0:
+            raise ValueError("Cannot raise 0 to a negative exponent.")
+        try:
+            result = base ** result
+        except OverflowError:
+            raise ValueError("Exponentiation result is out of range.")
+        if isinstance(result, complex):
+            raise ValueError("Exponentiation result is not a real number.")
+    return result
+
+
+# ------------------------------------------------------------------------------
+# Request validators (Kernel.validate)
+# ------------------------------------------------------------------------------
+def _validate_division(inputs: Sequence[Any]) -> None:
+    # Checked on a float64 array, so large vectors need no Python loop
+    if (np.asarray(inputs, dtype=np.float64)[1:] == 0).any():
+        raise ValueError(DIVIDE_BY_ZERO)
+
+
+def _validate_exponentiation(inputs: Sequence[Any]) -> None:
+    values = np.asarray(inputs, dtype=np.float64)
+    if ((values[:-1] == 0) & (values[1:] <= 0)).any():
+        raise ValueError("Exponentiation with base 0 and zero or negative exponent is invalid")
+    # Reject results that would blow past the size/CPU budgets
+    check_exponentiation_budget(inputs)
+
+
+def _validate_quantile(inputs: Sequence[Any]) -> None:
+    if not 0 <= inputs[0] <= 1:
+        raise ValueError("The quantile (first input) must be between 0 and 1")
+
+
+# ------------------------------------------------------------------------------
+# Batch kernels (one row per calculation, folded column by column)
+# ------------------------------------------------------------------------------
+def _flag(errors: np.ndarray, mask: np.ndarray, message: str) -> None:
+    """Record message for rows in mask that have not failed yet (first error wins)."""
+    errors[mask & (errors == None)] = message  # noqa: E711 - elementwise comparison
+
+
+def _fold_addition(matrix: np.ndarray, errors: np.ndarray) -> np.ndarray:
+    # sum() starts from 0, which turns a leading -0.0 into 0.0
+    acc = 0.0 + matrix[:, 0]
+    for j in range(1, matrix.shape[1]):
+        acc += matrix[:, j]
+    return acc
+
+
+def _fold_subtraction(matrix: np.ndarray, errors: np.ndarray) -> np.ndarray:
+    acc = matrix[:, 0].copy()
+    for j in range(1, matrix.shape[1]):
+        acc -= matrix[:, j]
+    return acc
+
+
+def _fold_multiplication(matrix: np.ndarray, errors: np.ndarray) -> np.ndarray:
+    acc = matrix[:, 0].copy()
+    for j in range(1, matrix.shape[1]):
+        acc *= matrix[:, j]
+    return acc
+
+
+def _fold_division(matrix: np.ndarray, errors: np.ndarray) -> np.ndarray:
+    _flag(errors, (matrix[:, 1:] == 0).any(axis=1), DIVIDE_BY_ZERO)
+    acc = matrix[:, 0].copy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for j in range(1, matrix.shape[1]):
+            acc /= matrix[:, j]
+    return acc
+
+
+def _fold_modulo(matrix: np.ndarray, errors: np.ndarray) -> np.ndarray:
+    _flag(errors, (matrix[:, 1:] == 0).any(axis=1), MODULO_BY_ZERO)
+    acc = matrix[:, 0].copy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for j in range(1, matrix.shape[1]):
+            acc = np.remainder(acc, matrix[:, j])
+    return acc
+
+
+def _fold_exponentiation(matrix: np.ndarray, errors: np.ndarray) -> np.ndarray:
+    # Right-associative: start from the right-most exponent
+    acc = matrix[:, -1].copy()
+    with np.errstate(all="ignore"):
+        for j in range(matrix.shape[1] - 2, -1, -1):
+            base = matrix[:, j]
+            _flag(errors, (base == 0) & (acc < 0), "Cannot raise 0 to a negative exponent.")
+            finite_operands = np.isfinite(base) & np.isfinite(acc)
+            acc = np.power(base, acc)
+            # Python raises OverflowError where NumPy returns +/-inf, and
+            # returns a complex number where NumPy returns NaN.
+            _flag(errors, finite_operands & np.isinf(acc), "Exponentiation result is out of range.")
+            _flag(errors, finite_operands & np.isnan(acc), "Exponentiation result is not a real number.")
+    return acc
+
+
+# ------------------------------------------------------------------------------
+# Registry
+# ------------------------------------------------------------------------------
+KERNELS: Dict[str, Kernel] = {
+    "addition": Kernel(
+        "addition", _add, _fold_addition, accumulate=np.add, inverse=np.subtract,
+        exact=exact_kernels.add,
+    ),
+    "subtraction": Kernel(
+        "subtraction", _subtract, _fold_subtraction, accumulate=np.subtract, inverse=np.add,
+        exact=exact_kernels.subtract,
+    ),
+    "multiplication": Kernel(
+        "multiplication", _multiply, _fold_multiplication, accumulate=np.multiply, inverse=np.divide,
+        exact=exact_kernels.multiply,
+    ),
+    "division": Kernel(
+        "division", _divide, _fold_division, accumulate=np.divide, inverse=np.multiply,
+        zero_divisor_error=DIVIDE_BY_ZERO, validate=_validate_division,
+        exact=exact_kernels.divide,
+    ),
+    "exponentiation": Kernel(
+        "exponentiation", _exponentiate, _fold_exponentiation, weight=4.0, validate=_validate_exponentiation,
+        exact=exact_kernels.exponentiate,
+    ),
+    "modulo": Kernel(
+        "modulo", _modulo, _fold_modulo, accumulate=np.remainder,
+        zero_divisor_error=MODULO_BY_ZERO, weight=2.0,
+        exact=exact_kernels.modulo,
+    ),
+    "mean": Kernel("mean", statistics.mean, takes_arrays=True),
+    "variance": Kernel("variance", statistics.variance, takes_arrays=True, weight=2.0),
+    "standard_deviation": Kernel(
+        "standard_deviation", statistics.standard_deviation, takes_arrays=True, weight=2.0,
+    ),
+    "minimum": Kernel("minimum", statistics.minimum, takes_arrays=True),
+    "maximum": Kernel("maximum", statistics.maximum, takes_arrays=True),
+    "median": Kernel("median", statistics.median, takes_arrays=True, weight=2.0),
+    "quantile": Kernel(
+        "quantile", statistics.quantile, takes_arrays=True, weight=2.0, validate=_validate_quantile,
+    ),
+    "expression": Kernel("expression", None, weight=4.0, min_inputs=0, expression=True),
+}
+BUILTIN_OPERATIONS = frozenset(KERNELS)
+
+# Entry point group other packages register operations under
+ENTRY_POINT_GROUP = "calculator.operations"
+
+# Operation names double as enum member names and the 50-character type column
+_OPERATION_NAME = re.compile(r"^[a-z][a-z0-9_]{0,49}$")
+
+_discovered: Optional[Dict[str, EntryPoint]] = None
+_load_lock = threading.Lock()
+
+
+def operation_label(name: str) -> str:
+    """Default display name of an operation ("standard_deviation" -> "Standard Deviation")."""
+    return name.replace("_", " ").title()
+
+
+def register_kernel(kernel: Kernel) -> Kernel:
+    """
+    Add an operation to the registry (or replace a plugin's entry).
+
+    Args:
+        kernel: The operation's kernels
+
+    Returns:
+        Kernel: The registered kernel
+
+    Raises:
+        ValueError: If the name is not a valid operation name, the kernel
+                    has no scalar entry point, or it would replace a
+                    built-in operation
+    """
+    if not _OPERATION_NAME.match(kernel.name):
+        raise ValueError(f"Invalid operation name: {kernel.name!r}")
+    if kernel.scalar is None:
+        raise ValueError(f"Operation {kernel.name} has no scalar kernel.")
+    if kernel.name in BUILTIN_OPERATIONS:
+        raise ValueError(f"Operation {kernel.name} is built in.")
+    KERNELS[kernel.name] = kernel
+    return kernel
+
+
+def _entry_points() -> Dict[str, EntryPoint]:
+    """Operation entry points by name (read once; nothing is imported)."""
+    global _discovered
+    if _discovered is None:
+        found: Dict[str, EntryPoint] = {}
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            name = entry_point.name.lower()
+            if name not in BUILTIN_OPERATIONS and _OPERATION_NAME.match(name):
+                found.setdefault(name, entry_point)
+        _discovered = found
+    return _discovered
+
+
+def operation_names() -> List[str]:
+    """
+    Every calculation type: the built-ins, then registered and installed
+    plugin operations. Plugins are listed without being imported.
+    """
+    names = list(KERNELS)
+    names += [name for name in _entry_points() if name not in KERNELS]
+    return names
+
+
+def operation_labels() -> Dict[str, str]:
+    """
+    Display names of the operations evaluated from their inputs alone
+    (everything but expressions), for forms. Plugins are not imported.
+    """
+    labels = {}
+    for name in operation_names():
+        kernel = KERNELS.get(name)
+        if kernel is None:
+            labels[name] = operation_label(name)
+        elif not kernel.expression:
+            labels[name] = kernel.display_name
+    return labels
+
+
+def _load_entry_point(name: str) -> Optional[Kernel]:
+    """Import a plugin operation on first use and register it."""
+    entry_point = _entry_points().get(name)
+    if entry_point is None:
+        return None
+    with _load_lock:
+        if name in KERNELS:
+            return KERNELS[name]
+        try:
+            kernel = entry_point.load()
+            if not isinstance(kernel, Kernel) and callable(kernel):
+                kernel = kernel()
+        except Exception as e:
+            raise ValueError(f"Operation {name} could not be loaded: {e}")
+        if not isinstance(kernel, Kernel) or kernel.name != name:
+            raise ValueError(f"Entry point {name} does not provide a Kernel named {name!r}.")
+        return register_kernel(kernel)
+
+
+def get_kernel(calculation_type: str) -> Optional[Kernel]:
+    """
+    The registered kernel for calculation_type (case-insensitive), or None.
+
+    Plugin operations are imported here, the first time they are asked for.
+
+    Raises:
+        ValueError: If a plugin operation fails to load
+    """
+    name = calculation_type.lower() if isinstance(calculation_type, str) else calculation_type
+    kernel = KERNELS.get(name)
+    if kernel is None and isinstance(name, str):
+        kernel = _load_entry_point(name)
+    return kernel
+
+
+# ------------------------------------------------------------------------------
+# Streaming kernels (left folds over float64 vectors)
+# ------------------------------------------------------------------------------
+def supports_vector_fold(calculation_type: str) -> bool:
+    """Whether calculation_type can be folded incrementally by fold_vector()."""
+    kernel = get_kernel(calculation_type)
+    return kernel is not None and kernel.accumulate is not None
+
+
+def fold_vector(
+    calculation_type: str,
+    values: np.ndarray,
+    initial: Optional[float] = None,
+) -> Optional[BatchResult]:
+    """
+    Continue a left fold over the next part of a calculation's inputs.
+
+    Folding a vector in consecutive chunks, passing each chunk's result as
+    the next chunk's initial value, gives exactly the result of folding the
+    whole vector at once, which is also the scalar kernel's result.
+
+    Args:
+        calculation_type: The calculation type
+        values: The next inputs, as a 1-D float64 array
+        initial: The running result of the inputs before values, or None
+                 if values starts the vector
+
+    Returns:
+        Optional[BatchResult]: The running result or the first error, or
+        None if the type cannot be folded left to right
+    """
+    kernel = get_kernel(calculation_type)
+    if kernel is None or kernel.accumulate is None:
+        return None
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim != 1:
+        return BatchResult(None, NOT_A_LIST)
+    if initial is None and kernel.name == "addition":
+        initial = 0.0  # sum() starts from 0, like _fold_addition
+    divisors = values if initial is not None else values[1:]
+    if kernel.zero_divisor_error and (divisors == 0).any():
+        return BatchResult(None, kernel.zero_divisor_error)
+    if initial is not None:
+        values = np.concatenate(([initial], values))
+    if not len(values):
+        return BatchResult(None, None)
+    with np.errstate(all="ignore"):
+        result = kernel.accumulate.accumulate(values)[-1]
+    return BatchResult(float(result), None)
+
+
+def unfold_vector(calculation_type: str, values: np.ndarray, result: float) -> Optional[float]:
+    """
+    Undo the last steps of a left fold: the result before values were folded in.
+
+    The inverse is exact algebraically but not bit-for-bit in floating point,
+    so the outcome can differ from a full recompute in the last bits.
+
+    Args:
+        calculation_type: The calculation type
+        values: The trailing inputs to take back out, in input order
+        result: The fold's result including values
+
+    Returns:
+        Optional[float]: The result without values, or None when the fold
+        cannot be undone (modulo, a zero factor, a non-finite result); the
+        caller recomputes from the remaining inputs instead
+    """
+    kernel = get_kernel(calculation_type)
+    values = np.asarray(values, dtype=np.float64)
+    if kernel is None or result is None or not np.isfinite(result):
+        return None
+    if not len(values):
+        return float(result)
+    if kernel.inverse is None:
+        return None
+    if kernel.inverse in (np.divide, np.multiply) and (values == 0).any():
+        return None  # a factor of zero cannot be divided back out
+    with np.errstate(all="ignore"):
+        unfolded = kernel.inverse.accumulate(np.concatenate(([result], values[::-1])))[-1]
+    return float(unfolded) if np.isfinite(unfolded) else None
+
+
+# ------------------------------------------------------------------------------
+# Scalar entry point
+# ------------------------------------------------------------------------------
+def evaluate(
+    calculation_type: str,
+    inputs: Any,
+    expression: Optional[str] = None,
+    exact: bool = False,
+) -> Any:
+    """
+    Evaluate one calculation through its kernel.
+
+    Lists are evaluated by the scalar kernel with Python semantics. Float64
+    arrays take the fastest registered path: the streaming fold for left
+    folds, the NumPy statistics kernels as-is, and the scalar kernel
+    otherwise. In exact mode, the kernel's exact entry point keeps ints and
+    Decimals exact; kernels without one get the inputs as floats.
+
+    Args:
+        calculation_type: The calculation type
+        inputs: The inputs (list, tuple or 1-D float64 array; in exact
+                mode, the lists may hold Decimals)
+        expression: The expression text (expression calculations only)
+        exact: Whether to evaluate in exact mode
+
+    Returns:
+        The calculation result
+
+    Raises:
+        ValueError: If the type is unknown, the inputs break the shared
+                    rules, or the arithmetic fails
+    """
+    kernel = get_kernel(calculation_type)
+    if kernel is None:
+        raise ValueError(f"Unsupported calculation type: {calculation_type}")
+    if exact and not isinstance(inputs, np.ndarray):
+        check_inputs(inputs, kernel.min_inputs, exact=True)
+        if kernel.exact is not None:
+            return kernel.exact(inputs)
+        inputs = [float(value) if isinstance(value, Decimal) else value for value in inputs]
+    if kernel.expression:
+        check_inputs(inputs, minimum=0)
+        if expression is None:
+            raise ValueError("Expression calculations require an expression.")
+        values = inputs.tolist() if isinstance(inputs, np.ndarray) else inputs
+        return compile_expression(expression).evaluate(values)
+
+    check_inputs(inputs, kernel.min_inputs)
+    if isinstance(inputs, np.ndarray):
+        if kernel.accumulate is not None:
+            outcome = fold_vector(kernel.name, inputs)
+            if outcome.error is not None:
+                raise ValueError(outcome.error)
+            return outcome.result
+        if not kernel.takes_arrays:
+            inputs = inputs.tolist()
+    return kernel.scalar(inputs)
@@ -0,0 +1,166 @@
+# app/operations/statistics.py
+"""
+Statistics kernels for the statistics calculation types.
+
+Every kernel takes the inputs as a list or a NumPy array and works on a
+float64 array, so large inputs (packed storage, packed request bodies) are
+reduced in compiled code without a Python object per element.
+
+- mean, variance and standard deviation come from one pass over the
+  inputs: each cache-sized block contributes its (count, mean, M2) and the
+  blocks are merged with the pairwise form of Welford's update (Chan et
+  al.), which stays accurate where the textbook sum-of-squares formula
+  cancels catastrophically;
+- median and quantile use selection (np.partition, O(n) on average)
+  instead of a full sort;
+- minimum and maximum are plain reductions.
+
+variance and standard_deviation are the sample statistics (n - 1
+denominator), like the statistics module. For quantile, the first input is
+the quantile q in [0, 1] and the remaining inputs are the data; values
+between data points are linearly interpolated (statistics.quantiles'
+"inclusive" method, NumPy's default).
+"""
+
+import math
+from typing import Any, Callable, Dict, NamedTuple
+
+import numpy as np
+
+# Inputs per block of the one-pass moments: small enough to stay in cache
+MOMENTS_BLOCK_SIZE = 65536
+
+
+class Moments(NamedTuple):
+    """Count, mean and sum of squared deviations (M2) of some inputs."""
+    count: int
+    mean: float
+    m2: float
+
+    def merge(self, other: "Moments") -> "Moments":
+        """Combine the moments of two disjoint parts of the inputs."""
+        if not self.count:
+            return other
+        if not other.count:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        mean = self.mean + delta * other.count / count
+        m2 = self.m2 + other.m2 + delta * delta * self.count * other.count / count
+        return Moments(count, mean, m2)
+
+
+def as_vector(values: Any) -> np.ndarray:
+    """
+    Convert inputs to a 1-D float64 array (zero-copy for float64 arrays).
+
+    Raises:
+        ValueError: If values is not a flat list/array of numbers
+    """
+    if not isinstance(values, (list, tuple, np.ndarray)):
+        raise ValueError("Inputs must be a list of numbers.")
+    try:
+        vector = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("Inputs must be a list of numbers.")
+    if vector.ndim != 1:
+        raise ValueError("Inputs must be a list of numbers.")
+    return vector
+
+
+def moments(values: Any) -> Moments:
+    """
+    One-pass count, mean and M2 of the inputs.
+
+    Args:
+        values: The inputs (list or array)
+
+    Returns:
+        Moments: The merged moments of every block
+    """
+    vector = as_vector(values)
+    total = Moments(0, 0.0, 0.0)
+    for start in range(0, len(vector), MOMENTS_BLOCK_SIZE):
+        block = vector[start:start + MOMENTS_BLOCK_SIZE]
+        block_mean = float(block.mean())
+        deviations = block - block_mean
+        total = total.merge(Moments(len(block), block_mean, float(np.dot(deviations, deviations))))
+    return total
+
+
+def _require(vector: np.ndarray, minimum: int = 2) -> np.ndarray:
+    if len(vector) < minimum:
+        raise ValueError("Inputs must be a list with at least two numbers.")
+    return vector
+
+
+def mean(values: Any) -> float:
+    """Arithmetic mean of the inputs."""
+    return moments(_require(as_vector(values))).mean
+
+
+def variance(values: Any) -> float:
+    """Sample variance of the inputs (n - 1 denominator)."""
+    result = moments(_require(as_vector(values)))
+    return result.m2 / (result.count - 1)
+
+
+def standard_deviation(values: Any) -> float:
+    """Sample standard deviation of the inputs."""
+    return math.sqrt(variance(values))
+
+
+def minimum(values: Any) -> float:
+    """Smallest input."""
+    return float(_require(as_vector(values)).min())
+
+
+def maximum(values: Any) -> float:
+    """Largest input."""
+    return float(_require(as_vector(values)).max())
+
+
+def _select(data: np.ndarray, q: float) -> float:
+    """The q-quantile of data by selection, linearly interpolated."""
+    position = q * (len(data) - 1)
+    lower = math.floor(position)
+    upper = min(lower + 1, len(data) - 1)
+    # One partition places both neighbours: everything left of lower is
+    # smaller, and the smallest value right of it is the upper neighbour.
+    partitioned = np.partition(data, lower)
+    low_value = float(partitioned[lower])
+    if upper == lower or position == lower:
+        return low_value
+    high_value = float(partitioned[upper:].min())
+    return low_value + (high_value - low_value) * (position - lower)
+
+
+def median(values: Any) -> float:
+    """Median of the inputs (mean of the two middle values for even counts)."""
+    return _select(_require(as_vector(values)), 0.5)
+
+
+def quantile(values: Any) -> float:
+    """
+    The q-quantile of the data, where q is the first input.
+
+    Raises:
+        ValueError: If q is outside [0, 1] or there is no data
+    """
+    vector = _require(as_vector(values))
+    q = float(vector[0])
+    if not 0.0 <= q <= 1.0:
+        raise ValueError("Quantile must be between 0 and 1.")
+    return _select(vector[1:], q)
+
+
+# Statistics kernels by calculation type
+STATISTICS: Dict[str, Callable[[Any], float]] = {
+    "mean": mean,
+    "variance": variance,
+    "standard_deviation": standard_deviation,
+    "minimum": minimum,
+    "maximum": maximum,
+    "median": median,
+    "quantile": quantile,
+}
@@ -0,0 +1,154 @@
+# app/operations/storage.py
+"""
+Migration helpers for the calculation inputs storage format.
+
+Calculation inputs live either in the JSON "inputs" column or, packed as
+little-endian float64, in the BYTEA "inputs_packed" column (see
+AbstractCalculation.inputs). Tables created before the binary format need
+the new column and a nullable JSON column; upgrade_schema() applies both
+idempotently. Existing rows are then converted in chunks with
+Calculation.convert_inputs_storage(), while the application keeps reading
+both formats.
+
+The same upgrade also adds:
+
+- the inputs_hash column (identical-calculation lookups) and its index;
+  rows stored before it are hashed with --backfill-hash
+  (Calculation.backfill_inputs_hash())
+- the result_exact and result_exact_summary columns of exact-mode results,
+  and the exact flag (set on rows that already have an exact result)
+- the keyset listing indexes (see AbstractCalculation.__table_args__)
+- the users.calculations_version counter behind list ETags, and the
+  triggers that bump it (LISTING_VERSION_STATEMENTS)
+
+Typical rollout:
+
+    python -m app.operations.storage --upgrade-schema --backfill-hash
+    INPUTS_STORAGE_FORMAT=binary   (new rows are written packed)
+    python -m app.operations.storage --to binary
+"""
+
+import argparse
+from typing import Optional, Sequence
+
+from sqlalchemy import text
+
+# Keep users.calculations_version (see Calculation.listing_version()) moving:
+# one statement-level trigger per write kind bumps the version of every user
+# whose calculations the statement inserted, updated or deleted, whatever
+# the write path (ORM, bulk statements, the importer's staging INSERT).
+LISTING_VERSION_STATEMENTS = (
+    """
+    CREATE OR REPLACE FUNCTION bump_calculations_version() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE users SET calculations_version = calculations_version + 1
+            WHERE id IN (SELECT user_id FROM new_rows);
+        ELSIF TG_OP = 'UPDATE' THEN
+            UPDATE users SET calculations_version = calculations_version + 1
+            WHERE id IN (SELECT user_id FROM new_rows UNION SELECT user_id FROM old_rows);
+        ELSE
+            UPDATE users SET calculations_version = calculations_version + 1
+            WHERE id IN (SELECT user_id FROM old_rows);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER calculations_version_insert AFTER INSERT ON calculations
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_calculations_version()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER calculations_version_update AFTER UPDATE ON calculations
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_calculations_version()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER calculations_version_delete AFTER DELETE ON calculations
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_calculations_version()
+    """,
+)
+
+# Idempotent DDL bringing an existing calculations table up to date
+UPGRADE_STATEMENTS = (
+    "ALTER TABLE calculations ADD COLUMN IF NOT EXISTS expression TEXT",
+    "ALTER TABLE calculations ADD COLUMN IF NOT EXISTS inputs_packed BYTEA",
+    "ALTER TABLE calculations ALTER COLUMN inputs DROP NOT NULL",
+    "ALTER TABLE calculations ADD COLUMN IF NOT EXISTS inputs_hash VARCHAR(64)",
+    "ALTER TABLE calculations ADD COLUMN IF NOT EXISTS result_exact NUMERIC",
+    "ALTER TABLE calculations ADD COLUMN IF NOT EXISTS result_exact_summary JSON",
+    "ALTER TABLE calculations ADD COLUMN IF NOT EXISTS exact BOOLEAN NOT NULL DEFAULT false",
+    "UPDATE calculations SET exact = true WHERE result_exact_summary IS NOT NULL AND NOT exact",
+    "CREATE INDEX IF NOT EXISTS ix_calculations_user_created_id ON calculations (user_id, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_calculations_user_type_created_id ON calculations (user_id, type, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_calculations_user_result_id ON calculations (user_id, result, id)",
+    "CREATE INDEX IF NOT EXISTS ix_calculations_inputs_hash_user ON calculations (inputs_hash, user_id)",
+    "DROP INDEX IF EXISTS ix_calculations_user_updated",
+    "ALTER TABLE users ADD COLUMN IF NOT EXISTS calculations_version BIGINT NOT NULL DEFAULT 0",
+    *LISTING_VERSION_STATEMENTS,
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_constraint WHERE conname = 'ck_calculations_inputs_present'
+        ) THEN
+            ALTER TABLE calculations ADD CONSTRAINT ck_calculations_inputs_present
+                CHECK (inputs IS NOT NULL OR inputs_packed IS NOT NULL);
+        END IF;
+    END
+    $$
+    """,
+)
+
+
+def upgrade_schema(engine) -> None:
+    """
+    Add the columns, index and constraint the inputs storage formats and
+    the inputs hash need.
+
+    Args:
+        engine: SQLAlchemy engine bound to the application database
+    """
+    with engine.begin() as connection:
+        for statement in UPGRADE_STATEMENTS:
+            connection.execute(text(statement))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command-line entry point: upgrade the schema and/or convert stored inputs."""
+    from app.core.config import settings
+    from app.database import SessionLocal, engine
+    from app.models.user import User  # noqa: F401 - registers the User mapper
+    from app.models.calculation import Calculation
+
+    parser = argparse.ArgumentParser(description="Migrate calculation inputs between storage formats.")
+    parser.add_argument("--upgrade-schema", action="store_true", help="add the inputs_packed column first")
+    parser.add_argument("--to", choices=["binary", "json"], help="convert stored inputs to this format")
+    parser.add_argument("--backfill-hash", action="store_true", help="hash the inputs of rows without inputs_hash")
+    parser.add_argument("--chunk-size", type=int, default=settings.BATCH_RECOMPUTE_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    if args.upgrade_schema:
+        upgrade_schema(engine)
+        print("Schema upgraded.")
+    if args.to:
+        db = SessionLocal()
+        try:
+            summary = Calculation.convert_inputs_storage(db, args.to, chunk_size=args.chunk_size)
+        finally:
+            db.close()
+        print(f"Converted {summary['converted']} calculations to {args.to} ({summary['skipped']} skipped).")
+    if args.backfill_hash:
+        db = SessionLocal()
+        try:
+            summary = Calculation.backfill_inputs_hash(db, chunk_size=args.chunk_size)
+        finally:
+            db.close()
+        print(f"Hashed {summary['hashed']} calculations ({summary['skipped']} skipped).")
+
+
+if __name__ == "__main__":
+    main()  # pragma: no cover
@@ -0,0 +1,141 @@
+# app/operations/sweep.py
+"""
+Parameter sweeps: one calculation evaluated over a grid of inputs.
+
+A sweep is a calculation whose inputs are a mix of fixed numbers and axes.
+Each axis is a range (start/stop with num points or a step) or an explicit
+list of values, and the sweep covers the Cartesian product of all axes,
+with the last axis varying fastest.
+
+The product is never materialized. Points are generated chunk by chunk:
+the flat point indices of a chunk are unravelled into one index per axis,
+the chunk's inputs matrix is filled in column by column, and the whole
+chunk is folded at once by the batch kernels (evaluate_matrix()). Memory
+therefore stays proportional to SWEEP_CHUNK_POINTS, whatever the sweep
+size, and results can be streamed as they are produced.
+"""
+
+import json
+import math
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.operations.batch import evaluate_matrix
+from app.operations.kernels import NOT_FINITE
+
+settings = get_settings()
+
+
+class SweepAxis(NamedTuple):
+    """One swept input: its position among the inputs and its values."""
+    position: int
+    values: np.ndarray
+
+
+def axis_size(start: float, stop: float, num: Optional[int] = None, step: Optional[float] = None) -> int:
+    """
+    Number of points of a range axis, without building it.
+
+    Ranges include both ends: num evenly spaced points from start to stop,
+    or start, start + step, ... up to stop.
+
+    Raises:
+        ValueError: If step is zero or points away from stop, or the
+                    number of points is not finite
+    """
+    if num is not None:
+        return num
+    if step == 0 or (stop - start) * step < 0:
+        raise ValueError("A range step must be non-zero and point from start towards stop")
+    intervals = (stop - start) / step
+    if not math.isfinite(intervals):
+        raise ValueError("A sweep range has too many points")
+    # A little slack so that stop is included despite float rounding
+    return math.floor(intervals + 1e-9) + 1
+
+
+def axis_values(
+    start: Optional[float] = None,
+    stop: Optional[float] = None,
+    num: Optional[int] = None,
+    step: Optional[float] = None,
+    values: Optional[Sequence[float]] = None,
+) -> np.ndarray:
+    """The float64 values of an axis given as a range or as explicit values."""
+    if values is not None:
+        return np.asarray(values, dtype=np.float64)
+    if num is not None:
+        return np.linspace(start, stop, num)
+    return start + step * np.arange(axis_size(start, stop, step=step), dtype=np.float64)
+
+
+def sweep_size(axes: Sequence[SweepAxis]) -> int:
+    """Number of points in the Cartesian product of the axes."""
+    return math.prod(len(axis.values) for axis in axes)
+
+
+def sweep_chunks(
+    calculation_type: str,
+    inputs: Sequence[Union[float, np.ndarray]],
+    expression: Optional[str] = None,
+    chunk_points: Optional[int] = None,
+) -> Iterator[tuple]:
+    """
+    Evaluate a sweep one chunk of points at a time.
+
+    Args:
+        calculation_type: The calculation type
+        inputs: The inputs, each a fixed number or an axis's values
+        expression: The expression text (expression calculations only)
+        chunk_points: Points per chunk (defaults to SWEEP_CHUNK_POINTS)
+
+    Yields:
+        tuple: (start, points, values, errors) per chunk, where start is the
+        index of the chunk's first point, points holds the swept inputs of
+        each point (one column per axis), values the results and errors
+        each point's error message (None where it succeeded)
+    """
+    chunk_points = chunk_points or settings.SWEEP_CHUNK_POINTS
+    axes = [SweepAxis(position, value) for position, value in enumerate(inputs) if isinstance(value, np.ndarray)]
+    template = np.array([0.0 if isinstance(value, np.ndarray) else value for value in inputs], dtype=np.float64)
+    shape = tuple(len(axis.values) for axis in axes)
+    total = sweep_size(axes)
+
+    for start in range(0, total, chunk_points):
+        indices = np.unravel_index(np.arange(start, min(start + chunk_points, total)), shape)
+        matrix = np.tile(template, (len(indices[0]), 1))
+        points = np.empty((len(indices[0]), len(axes)), dtype=np.float64)
+        for column, (axis, axis_indices) in enumerate(zip(axes, indices)):
+            points[:, column] = axis.values[axis_indices]
+            matrix[:, axis.position] = points[:, column]
+        values, errors = evaluate_matrix(calculation_type, matrix, expression)
+        yield start, points, values, errors
+
+
+def sweep_ndjson(
+    calculation_type: str,
+    inputs: Sequence[Union[float, np.ndarray]],
+    expression: Optional[str] = None,
+) -> Iterator[bytes]:
+    """
+    A sweep's results as NDJSON, one chunk of lines at a time.
+
+    Each line is {"index", "point", "result"} or, for a point that failed,
+    {"index", "point", "error"}; point holds the point's swept inputs, in
+    input order. JSON has no infinity or NaN, so points whose result
+    overflowed are reported as errors.
+    """
+    for start, points, values, errors in sweep_chunks(calculation_type, inputs, expression):
+        lines: List[str] = []
+        for offset, (point, value, error) in enumerate(zip(points.tolist(), values.tolist(), errors)):
+            line = {"index": start + offset, "point": point}
+            if error is None and not math.isfinite(value):
+                error = NOT_FINITE
+            if error is None:
+                line["result"] = value
+            else:
+                line["error"] = error
+            lines.append(json.dumps(line))
+        yield ("\n".join(lines) + "\n").encode("utf-8")
@@ -11,10 +11,31 @@ from .user import (
 from .token import Token, TokenData, TokenResponse
 from .calculation import (
     CalculationType,
+    CalculationSort,
+    CalculationLookupScope,
     CalculationBase,
     CalculationCreate,
     CalculationUpdate,
-    CalculationResponse
+    CalculationInputsPatch,
+    CalculationResponse,
+    ExactResult,
+    CalculationBatchItemResult,
+    CalculationBatchResponse,
+    EvaluationResponse,
+    EvaluationBatchItemResult,
+    EvaluationBatchResponse,
+    SweepRange,
+    CalculationSweepRequest,
+    CalculationLookupResponse,
+    CalculationImportLineError,
+    CalculationImportResponse,
+    CalculationBulkFilter,
+    CalculationBulkDeleteRequest,
+    CalculationBulkDeleteResponse,
+    CalculationRecomputeResponse,
+    CalculationUploadCreate,
+    CalculationUploadResponse,
+    CalculationUploadFinalizeResponse
 )
 
 __all__ = [
@@ -28,8 +49,29 @@ __all__ = [
     'TokenData',
     'TokenResponse',
     'CalculationType',
+    'CalculationSort',
+    'CalculationLookupScope',
     'CalculationBase',
     'CalculationCreate',
     'CalculationUpdate',
+    'CalculationInputsPatch',
     'CalculationResponse',
+    'ExactResult',
+    'CalculationBatchItemResult',
+    'CalculationBatchResponse',
+    'EvaluationResponse',
+    'EvaluationBatchItemResult',
+    'EvaluationBatchResponse',
+    'SweepRange',
+    'CalculationSweepRequest',
+    'CalculationLookupResponse',
+    'CalculationImportLineError',
+    'CalculationImportResponse',
+    'CalculationBulkFilter',
+    'CalculationBulkDeleteRequest',
+    'CalculationBulkDeleteResponse',
+    'CalculationRecomputeResponse',
+    'CalculationUploadCreate',
+    'CalculationUploadResponse',
+    'CalculationUploadFinalizeResponse',
 ]
\ No newline at end of file
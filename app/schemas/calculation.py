@@ -12,32 +12,168 @@ The schemas use Pydantic's validation system to ensure data integrity and provid
 clear error messages when validation fails.
 """
 
+import math
+from decimal import Decimal
 from enum import Enum
-from pydantic import BaseModel, Field, ConfigDict, model_validator, field_validator
-from typing import List, Optional
+from pydantic import (
+    BaseModel, Field, ConfigDict, PlainSerializer, ValidationInfo, WrapValidator, model_validator, field_validator,
+)
+from typing import Any, Dict, List, Optional, Union
+from typing_extensions import Annotated
 from uuid import UUID
 from datetime import datetime
 
-class CalculationType(str, Enum):
+import numpy as np
+
+from app.core.config import get_settings
+from app.core.packing import decode_packed_b64
+from app.operations.exact import float_approximation
+from app.operations.expression import compile_expression
+from app.operations.kernels import get_kernel, operation_names
+from app.operations.sweep import axis_size, axis_values
+
+settings = get_settings()
+
+
+def _is_exact(info: ValidationInfo) -> bool:
+    """Whether the request is validated in exact mode (context={"exact": True})."""
+    return bool(info.context and info.context.get("exact"))
+
+
+def _validate_input_vector(value, handler, info: ValidationInfo):
     """
-    Enumeration of valid calculation types.
-    
-    Using an Enum provides type safety and ensures that only valid
-    calculation types are accepted. The str base class ensures that
-    the values are serialized as strings in JSON.
-    
-    Benefits of using Enum:
-    - Type checking at compile time
-    - Documentation of valid values
-    - Prevents typos and invalid values
-    - Self-documenting code
-    """
-    ADDITION = "addition"
-    SUBTRACTION = "subtraction"
-    MULTIPLICATION = "multiplication"
-    DIVISION = "division"
-    EXPONENTIATION = "exponentiation"
-    MODULO = "modulo" 
+    Pass decoded float64 arrays through as-is; validate anything else as List[float].
+
+    In exact mode, integers and Decimals (parsed from the JSON text) are
+    kept as they are instead of being rounded to float64.
+    """
+    if isinstance(value, np.ndarray):
+        # Standard JSON cannot carry NaN or infinity, so neither may packed inputs
+        if value.ndim != 1 or not np.isfinite(value).all():
+            raise ValueError("Inputs must be a list of finite numbers")
+        return value
+    if _is_exact(info) and isinstance(value, list):
+        for item in value:
+            if isinstance(item, bool) or not isinstance(item, (int, float, Decimal)):
+                raise ValueError("Inputs must be a list of finite numbers")
+            if isinstance(item, float) and not math.isfinite(item) or isinstance(item, Decimal) and not item.is_finite():
+                raise ValueError("Inputs must be a list of finite numbers")
+        return value
+    return handler(value)
+
+
+def _serialize_input_vector(value):
+    return value.tolist() if isinstance(value, np.ndarray) else value
+
+
+# List[float] that also accepts an already-decoded float64 array (from
+# inputs_b64 or an application/octet-stream body) without building a Python
+# float per element.
+InputVector = Annotated[
+    List[float],
+    WrapValidator(_validate_input_vector),
+    PlainSerializer(_serialize_input_vector, return_type=List[float]),
+]
+
+
+def _validate_stored_input_vector(value, handler):
+    """Stored inputs as they are: float64 arrays, and the ints and Decimals of exact-mode rows unrounded."""
+    if isinstance(value, np.ndarray):
+        return value
+    if isinstance(value, list) and all(
+        isinstance(item, (int, float, Decimal)) and not isinstance(item, bool) for item in value
+    ):
+        return value
+    return handler(value)
+
+
+def _serialize_stored_input_vector(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    # Decimals go out as their nearest float, or as their digits when no float can hold them
+    return [
+        (str(item) if float_approximation(item) is None else float(item)) if isinstance(item, Decimal) else item
+        for item in value
+    ]
+
+
+# The inputs of a stored calculation, in responses: like InputVector, but
+# the integers and decimals of exact-mode rows are not coerced to float
+# (integers of any size are JSON numbers).
+StoredInputVector = Annotated[
+    List[float],
+    WrapValidator(_validate_stored_input_vector),
+    PlainSerializer(_serialize_stored_input_vector, return_type=List[Union[int, float, str]]),
+]
+
+
+def _extract_references(data: Any) -> Any:
+    """
+    Move {"ref": <calculation id>} inputs in raw request data to references.
+
+    Each referencing input is replaced by a 0 placeholder; the server fills
+    in the referenced calculation's result before computing.
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("inputs"), list):
+        return data
+    if not any(isinstance(value, dict) for value in data["inputs"]):
+        return data
+    references = dict(data.get("references") or {})
+    inputs = []
+    for position, value in enumerate(data["inputs"]):
+        if isinstance(value, dict):
+            if set(value) != {"ref"}:
+                raise ValueError('A referencing input must look like {"ref": "<calculation id>"}')
+            references[position] = value["ref"]
+            value = 0.0
+        inputs.append(value)
+    return {**data, "inputs": inputs, "references": references}
+
+
+def _check_reference_positions(references: Optional[Dict[int, Any]], inputs: Any) -> None:
+    if references and inputs is not None:
+        if any(not 0 <= position < len(inputs) for position in references):
+            raise ValueError("Reference positions must index the inputs")
+
+
+def _decode_inputs_b64(data: Any, field: str = "inputs") -> Any:
+    """Replace <field>_b64 in raw request data with the decoded float64 array."""
+    packed_field = f"{field}_b64"
+    if isinstance(data, dict) and data.get(packed_field) is not None:
+        if data.get(field) is not None:
+            raise ValueError(f"Provide either {field} or {packed_field}, not both")
+        data = {**data, field: decode_packed_b64(data[packed_field]), packed_field: None}
+    return data
+
+
+# Valid calculation types, one member per registered operation
+# (CalculationType.ADDITION == "addition", ...). The members come from the
+# operation registry (app.operations.kernels), so installed plugin
+# operations are accepted without being imported. The str base class
+# ensures that the values are serialized as strings in JSON.
+CalculationType = Enum(
+    "CalculationType",
+    [(name.upper(), name) for name in operation_names()],
+    type=str,
+    module=__name__,
+)
+
+class CalculationSort(str, Enum):
+    """
+    Sort orders accepted by the calculation listing.
+
+    A leading "-" means descending. Each order is backed by a
+    (user_id, <field>, id) index so pages are read in index order.
+    """
+    CREATED_AT_DESC = "-created_at"
+    CREATED_AT_ASC = "created_at"
+    RESULT_DESC = "-result"
+    RESULT_ASC = "result"
+
+class CalculationLookupScope(str, Enum):
+    """Which calculations an identical-calculation lookup searches."""
+    USER = "user"
+    GLOBAL = "global"
 
 class CalculationBase(BaseModel):
     """
@@ -46,20 +182,38 @@ class CalculationBase(BaseModel):
     This schema defines the common fields that all calculation operations share:
     - type: The type of calculation (addition, subtraction, etc.)
     - inputs: A list of numeric values to operate on
+    - expression: The expression text, for the expression type only
     
     It also implements validation rules to ensure data integrity.
     """
     type: CalculationType = Field(
         ...,  # The ... means this field is required
-        description="Type of calculation (addition, subtraction, multiplication, division, exponentiation, modulo)",
-
+        description=f"Type of calculation ({', '.join(operation_names())})",
         example="addition"
     )
-    inputs: List[float] = Field(
+    inputs: InputVector = Field(
         ...,  # The ... means this field is required
-        description="List of numeric inputs for the calculation",
+        description="List of numeric inputs for the calculation (the variable values, for expressions)",
         example=[10.5, 3, 2],
-        min_items=2  # Ensures at least 2 numbers are provided
+        # At least 2 numbers are required except for expressions (see validate_inputs)
+    )
+    inputs_b64: Optional[str] = Field(
+        None,
+        exclude=True,
+        description="Alternative to inputs for large vectors: base64 of the inputs "
+                    "packed as little-endian float64 (8 bytes per number)",
+    )
+    expression: Optional[str] = Field(
+        None,
+        description="Arithmetic expression over + - * / % ** (expression type only); "
+                    "its variables take the inputs in order of first appearance",
+        example="(a + b) / c ** 2",
+    )
+    references: Dict[int, UUID] = Field(
+        default_factory=dict,
+        description="Inputs that take another calculation's result, as {position: calculation id}; "
+                    'in requests an input can also be given as {"ref": "<calculation id>"}',
+        example={},
     )
 
     @field_validator("type", mode="before")
@@ -107,12 +261,23 @@ class CalculationBase(BaseModel):
         Raises:
             ValueError: If the input is not a list
         """
-        if not isinstance(v, list):
+        if not isinstance(v, (list, np.ndarray)):
             raise ValueError("Input should be a valid list")
         return v
 
+    @model_validator(mode='before')
+    @classmethod
+    def decode_packed_inputs(cls, data: Any) -> Any:
+        """
+        Decodes inputs_b64 (if given) straight into a float64 array.
+
+        The array then goes through the same validation as a JSON list.
+        Referencing inputs ({"ref": id}) are moved to references.
+        """
+        return _extract_references(_decode_inputs_b64(data))
+
     @model_validator(mode='after')
-    def validate_inputs(self) -> "CalculationBase":
+    def validate_inputs(self, info: ValidationInfo) -> "CalculationBase":
         """
         Validates the inputs based on calculation type.
         
@@ -120,6 +285,16 @@ class CalculationBase(BaseModel):
         business logic validation:
         1. Ensures there are at least 2 numbers for any calculation
         2. For division, ensures that no divisor is zero
+        3. For exponentiation, ensures the result fits the cost budgets
+        4. For expressions, ensures the expression compiles and there is
+           exactly one input per variable
+        5. For quantiles, ensures the first input (q) is between 0 and 1
+
+        Steps 2, 3 and 5 are the operation's Kernel.validate hook. In exact
+        mode, operations with an exact kernel skip it: the exact kernel
+        checks its own inputs (and budgets) as it evaluates them. So do
+        inputs with references, whose values are only known once the
+        referenced results are filled in.
         
         Returns:
             CalculationBase: The validated model
@@ -127,21 +302,32 @@ class CalculationBase(BaseModel):
         Raises:
             ValueError: If validation fails
         """
-        if len(self.inputs) < 2:
+        _check_reference_positions(self.references, self.inputs)
+        kernel = get_kernel(self.type.value)
+        if kernel.expression:
+            if self.expression is None:
+                raise ValueError("An expression is required for the expression type")
+            variables = compile_expression(self.expression).variables
+            if len(self.inputs) != len(variables):
+                raise ValueError(
+                    f"Expression expects {len(variables)} inputs ({', '.join(variables) or 'none'}), "
+                    f"got {len(self.inputs)}"
+                )
+            return self
+
+        if self.expression is not None:
+            raise ValueError("An expression is only allowed for the expression type")
+
+        if len(self.inputs) < kernel.min_inputs:
             raise ValueError("At least two numbers are required for calculation")
-        
-        if self.type == CalculationType.DIVISION:
-            # Prevent division by zero (skip the first value as numerator)
-            if any(x == 0 for x in self.inputs[1:]):
-                raise ValueError("Cannot divide by zero")
-        
-        if self.type == CalculationType.EXPONENTIATION:
-        # Check for 0 base with zero or negative exponent
-            for i in range(len(self.inputs) - 1):
-                base = self.inputs[i]
-                exponent = self.inputs[i + 1]
-                if base == 0 and exponent <= 0:
-                    raise ValueError("Exponentiation with base 0 and zero or negative exponent is invalid")
+
+        # Type-specific checks (zero divisors, exponentiation budgets,
+        # quantile range) live with the operation's kernels
+        exact = _is_exact(info)
+        if self.references:
+            return self
+        if kernel.validate is not None and not (exact and kernel.exact is not None):
+            kernel.validate(self.inputs)
         return self
 
 
@@ -155,7 +341,8 @@ class CalculationBase(BaseModel):
                 {"type": "addition", "inputs": [10.5, 3, 2]},
                 {"type": "division", "inputs": [100, 2]},
                 {"type": "exponentiation", "inputs": [2, 3]},
-                {"type": "modulo", "inputs": [10, 3]} 
+                {"type": "modulo", "inputs": [10, 3]},
+                {"type": "expression", "inputs": [1, 2, 3], "expression": "(a + b) / c ** 2"}
             ]
         }
     )
@@ -200,11 +387,26 @@ class CalculationUpdate(BaseModel):
         description="Updated operation type for the calculation",
         example="multiplication"
     )
-    inputs: Optional[List[float]] = Field(
+    inputs: Optional[InputVector] = Field(
         None,  # None means this field is optional
         description="Updated list of numeric inputs for the calculation",
         example=[42, 7],
-        min_items=2  # If provided, at least 2 items are required
+        min_length=1  # If provided, at least 1 item; validate_inputs requires 2 except for expressions
+    )
+    inputs_b64: Optional[str] = Field(
+        None,
+        exclude=True,
+        description="Alternative to inputs: base64 of the inputs packed as little-endian float64",
+    )
+    expression: Optional[str] = Field(
+        None,
+        description="Updated expression (expression type only)",
+        example="a * b - 1",
+    )
+    references: Optional[Dict[int, UUID]] = Field(
+        None,
+        description="References of the updated inputs, as {position: calculation id} "
+                    '(or give inputs as {"ref": "<calculation id>"}); new inputs replace the old references',
     )
 
     @model_validator(mode='after')
@@ -214,10 +416,13 @@ class CalculationUpdate(BaseModel):
         
         This validator only runs if inputs are provided in the update request.
         It ensures that:
-        - At least two numbers are provided for the calculation
-        
-        Note: Division-by-zero validation is handled at the model level
-        when the result is calculated.
+        - At least two numbers are provided for the calculation (except for expressions)
+        - An updated expression compiles, and is only given for the expression type
+        - When the new type is given too, the inputs pass its Kernel.validate hook
+
+        Note: When only the inputs change, the type-specific checks (e.g.
+        division by zero) happen at the model level when the result is
+        calculated.
         
         Returns:
             CalculationUpdate: The validated model
@@ -225,20 +430,94 @@ class CalculationUpdate(BaseModel):
         Raises:
             ValueError: If validation fails
         """
-        allowed_types = {"addition", "subtraction", "multiplication", "division", "exponentiation", "modulo"}
+        if self.inputs is not None and len(self.inputs) < 1:
+            raise ValueError("At least one number is required for calculation")
+
+        allowed_types = operation_names()
 
         if self.type is not None and self.type not in allowed_types:
             raise ValueError(f"Invalid type '{self.type}'. Must be one of: {', '.join(allowed_types)}")
-        
-        if self.inputs is not None and len(self.inputs) < 2:
+
+        if self.expression is not None:
+            if self.type is not None and self.type != "expression":
+                raise ValueError("An expression is only allowed for the expression type")
+            compile_expression(self.expression)
+
+        is_expression = self.type == "expression" or self.expression is not None
+        if self.inputs is not None and len(self.inputs) < 2 and not is_expression:
             raise ValueError("At least two numbers are required for calculation")
+
+        if self.references is not None and self.inputs is None:
+            raise ValueError("References can only be given with the inputs")
+        _check_reference_positions(self.references, self.inputs)
+
+        if self.type is not None and self.inputs is not None and not self.references:
+            kernel = get_kernel(self.type)
+            if kernel.validate is not None:
+                kernel.validate(self.inputs)
         return self
 
+    @model_validator(mode='before')
+    @classmethod
+    def decode_packed_inputs(cls, data: Any) -> Any:
+        """Decodes inputs_b64 (if given) straight into a float64 array, and moves {"ref": id} inputs to references."""
+        return _extract_references(_decode_inputs_b64(data))
+
     model_config = ConfigDict(
         from_attributes=True,
         json_schema_extra={"example": {"type": "multiplication","inputs": [42, 7]}}
     )
 
+class CalculationInputsPatch(BaseModel):
+    """
+    Schema for editing the tail of a calculation's inputs (PATCH).
+
+    The trailing inputs are removed first, then the new ones appended; the
+    result is updated from the stored one where the operation allows it.
+    """
+    remove: int = Field(0, ge=0, description="Number of trailing inputs to remove", example=1)
+    append: InputVector = Field(
+        default_factory=list,
+        description="Inputs to append after the removal",
+        example=[4, 5],
+    )
+    append_b64: Optional[str] = Field(
+        None,
+        exclude=True,
+        description="Alternative to append: base64 of the inputs packed as little-endian float64",
+    )
+
+    @model_validator(mode='before')
+    @classmethod
+    def decode_packed_append(cls, data: Any) -> Any:
+        """Decodes append_b64 (if given) straight into a float64 array."""
+        return _decode_inputs_b64(data, "append")
+
+    @model_validator(mode='after')
+    def validate_change(self) -> "CalculationInputsPatch":
+        """Rejects a patch that neither removes nor appends anything."""
+        if not self.remove and not len(self.append):
+            raise ValueError("Nothing to change: give append and/or remove")
+        return self
+
+    model_config = ConfigDict(
+        json_schema_extra={"example": {"remove": 1, "append": [4, 5]}}
+    )
+
+class ExactResult(BaseModel):
+    """
+    An exact-mode result that float64 cannot hold.
+
+    Listings return only the summary; value (the full digit string) is
+    filled in by GET /calculations/{id}?materialize=true.
+    """
+    sign: int = Field(..., description="Sign of the result (-1, 0 or 1)", example=1)
+    log10: float = Field(..., description="log10 of the result's magnitude", example=47.71)
+    digits: int = Field(..., description="Number of digits in the full result", example=48)
+    digest: str = Field(..., description="SHA-256 hex digest of the full digit string")
+    value: Optional[str] = Field(None, description="The full result as a decimal string, when materialized")
+
+
 class CalculationResponse(CalculationBase):
     """
     Schema for reading a Calculation from the database.
@@ -265,6 +544,12 @@ class CalculationResponse(CalculationBase):
         description="UUID of the user who owns this calculation",
         example="123e4567-e89b-12d3-a456-426614174000"
     )
+    inputs: StoredInputVector = Field(
+        ...,
+        description="The calculation's inputs (exact-mode integers in full; decimals beyond "
+                    "float range as digit strings)",
+        example=[10.5, 3, 2],
+    )
     created_at: datetime = Field(
         ..., 
         description="Time when the calculation was created"
@@ -273,11 +558,29 @@ class CalculationResponse(CalculationBase):
         ..., 
         description="Time when the calculation was last updated"
     )
-    result: float = Field(
+    result: Optional[float] = Field(
         ...,
-        description="Result of the calculation",
+        description="Result of the calculation (the nearest float for exact results; "
+                    "null if an exact result is out of float range)",
         example=15.5
     )
+    result_exact: Optional[ExactResult] = Field(
+        None,
+        validation_alias="result_exact_summary",
+        description="Summary of the exact result, for exact-mode results float64 cannot hold",
+    )
+
+    @model_validator(mode='after')
+    def validate_inputs(self) -> "CalculationResponse":
+        """
+        Skips the request-side input checks of CalculationBase.
+
+        A response describes a stored calculation, whose inputs were
+        validated (in the mode they were computed in) when it was written;
+        re-running the operation's validate hook on them would reject exact
+        rows the float checks do not allow, and costs a kernel call per row.
+        """
+        return self
 
     model_config = ConfigDict(
         # Allow conversion from SQLAlchemy models to this Pydantic model
@@ -296,3 +599,364 @@ class CalculationResponse(CalculationBase):
             }
         }
     )
+
+
+class CalculationBatchItemResult(BaseModel):
+    """
+    Outcome of one item of a batch create request.
+
+    Exactly one of calculation (on success) or error (on failure) is set.
+    """
+    index: int = Field(..., description="Position of the item in the request list")
+    calculation: Optional[CalculationResponse] = Field(
+        None, description="The stored calculation, if the item was created"
+    )
+    error: Optional[str] = Field(None, description="Why the item was rejected, if it failed")
+
+
+class CalculationBatchResponse(BaseModel):
+    """
+    Response for POST /calculations/batch.
+
+    Items are validated and evaluated independently, so one bad item does
+    not prevent the others from being stored.
+    """
+    created: int = Field(..., description="Number of calculations stored")
+    failed: int = Field(..., description="Number of items rejected")
+    results: List[CalculationBatchItemResult] = Field(
+        ..., description="Per-item outcomes, in request order"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "created": 1,
+                "failed": 1,
+                "results": [
+                    {
+                        "index": 0,
+                        "calculation": {
+                            "id": "123e4567-e89b-12d3-a456-426614174999",
+                            "user_id": "123e4567-e89b-12d3-a456-426614174000",
+                            "type": "addition",
+                            "inputs": [1, 2],
+                            "result": 3,
+                            "created_at": "2025-01-01T00:00:00",
+                            "updated_at": "2025-01-01T00:00:00"
+                        },
+                        "error": None
+                    },
+                    {"index": 1, "calculation": None, "error": "Cannot divide by zero."}
+                ]
+            }
+        }
+    )
+
+
+class EvaluationResponse(BaseModel):
+    """
+    Response for POST/GET /evaluate: a result computed without storing anything.
+
+    inputs_hash is the calculation's canonical hash (as stored calculations'
+    inputs_hash); GET /evaluate also sends it as the ETag.
+    """
+    type: str = Field(..., description="Calculation type", example="addition")
+    result: float = Field(..., description="Result of the calculation", example=15.5)
+    inputs_hash: Optional[str] = Field(
+        None, description="Canonical hash of the type, expression and inputs (None if they cannot be hashed)"
+    )
+
+
+class EvaluationBatchItemResult(BaseModel):
+    """
+    Outcome of one item of a batch evaluation.
+
+    Exactly one of result (on success) or error (on failure) is set.
+    """
+    index: int = Field(..., description="Position of the item in the request list")
+    result: Optional[float] = Field(None, description="Result of the calculation, if it succeeded")
+    error: Optional[str] = Field(None, description="Why the item was rejected, if it failed")
+
+
+class EvaluationBatchResponse(BaseModel):
+    """Response for POST /evaluate with a list of calculations."""
+    evaluated: int = Field(..., description="Number of items evaluated")
+    failed: int = Field(..., description="Number of items rejected")
+    results: List[EvaluationBatchItemResult] = Field(
+        ..., description="Per-item outcomes, in request order"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "evaluated": 1,
+                "failed": 1,
+                "results": [
+                    {"index": 0, "result": 3, "error": None},
+                    {"index": 1, "result": None, "error": "Cannot divide by zero."}
+                ]
+            }
+        }
+    )
+
+
+class SweepRange(BaseModel):
+    """
+    One swept input of a parameter sweep.
+
+    Either an explicit list of values, or a range from start to stop (both
+    included) with num evenly spaced points or a fixed step.
+    """
+    start: Optional[float] = Field(None, description="First value of the range", example=0)
+    stop: Optional[float] = Field(None, description="Last value of the range", example=1)
+    num: Optional[int] = Field(None, ge=1, description="Number of evenly spaced points", example=11)
+    step: Optional[float] = Field(None, description="Distance between consecutive points")
+    values: Optional[List[float]] = Field(None, min_length=1, description="Explicit values (a grid axis)")
+
+    @model_validator(mode='after')
+    def validate_range(self) -> "SweepRange":
+        """Ensures the axis is either values, or start and stop with exactly one of num and step, all finite."""
+        bounds = (self.start, self.stop, self.step, *(self.values or ()))
+        if any(value is not None and not math.isfinite(value) for value in bounds):
+            raise ValueError("Sweep values must be finite numbers")
+        if self.values is not None:
+            if any(value is not None for value in (self.start, self.stop, self.num, self.step)):
+                raise ValueError("A sweep axis takes either values or a range, not both")
+        elif self.start is None or self.stop is None or (self.num is None) == (self.step is None):
+            raise ValueError("A sweep range needs start, stop and exactly one of num or step")
+        return self
+
+    @property
+    def size(self) -> int:
+        """Number of points on this axis."""
+        if self.values is not None:
+            return len(self.values)
+        return axis_size(self.start, self.stop, self.num, self.step)
+
+
+class CalculationSweepRequest(BaseModel):
+    """
+    Request body for POST /evaluate/sweep.
+
+    Each input is a fixed number or a SweepRange; the calculation is
+    evaluated at every point of the ranges' Cartesian product (at most
+    SWEEP_MAX_POINTS points).
+    """
+    type: CalculationType = Field(..., description="Type of calculation", example="exponentiation")
+    inputs: List[Union[float, SweepRange]] = Field(
+        ...,
+        description="Fixed inputs and swept ranges, in input order",
+        example=[{"start": 1, "stop": 2, "num": 11}, 2],
+    )
+    expression: Optional[str] = Field(None, description="Expression (expression type only)")
+
+    @model_validator(mode='after')
+    def validate_sweep(self) -> "CalculationSweepRequest":
+        """
+        Validates the sweep's size and the inputs' count.
+
+        Type-specific checks (zero divisors, exponentiation overflow) are
+        reported per point in the results instead.
+        """
+        ranges = [value for value in self.inputs if isinstance(value, SweepRange)]
+        if not ranges:
+            raise ValueError("A sweep needs at least one range")
+        points = 1
+        for sweep_range in ranges:
+            points *= sweep_range.size
+            if points > settings.SWEEP_MAX_POINTS:
+                raise ValueError(f"A sweep is limited to {settings.SWEEP_MAX_POINTS} points")
+
+        kernel = get_kernel(self.type.value)
+        if kernel.expression:
+            if self.expression is None:
+                raise ValueError("An expression is required for the expression type")
+            variables = compile_expression(self.expression).variables
+            if len(self.inputs) != len(variables):
+                raise ValueError(f"Expression expects {len(variables)} inputs, got {len(self.inputs)}")
+        elif self.expression is not None:
+            raise ValueError("An expression is only allowed for the expression type")
+        elif len(self.inputs) < kernel.min_inputs:
+            raise ValueError("At least two numbers are required for calculation")
+        return self
+
+    @property
+    def points(self) -> int:
+        """Number of points in the sweep."""
+        return math.prod(value.size for value in self.inputs if isinstance(value, SweepRange))
+
+    def sweep_inputs(self) -> List[Any]:
+        """The inputs with each range replaced by its float64 values (see app.operations.sweep)."""
+        return [
+            axis_values(value.start, value.stop, value.num, value.step, value.values)
+            if isinstance(value, SweepRange) else value
+            for value in self.inputs
+        ]
+
+
+class CalculationLookupResponse(BaseModel):
+    """
+    Response for POST /calculations/lookup.
+
+    count covers the requested scope; calculations only ever lists the
+    current user's own matches, even in the global scope.
+    """
+    inputs_hash: Optional[str] = Field(
+        None, description="Canonical hash of the type, expression and inputs (None if they cannot be hashed)"
+    )
+    count: int = Field(..., description="Number of identical calculations in the scope")
+    result: Optional[float] = Field(None, description="Stored result of an identical calculation, if any")
+    calculations: List[CalculationResponse] = Field(
+        ..., description="The current user's identical calculations, newest first"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "inputs_hash": "6f1ed002ab5595859014ebf0951522d9a6f7a0e0e5f1b0dd9e8cbb8f0c6a4a1d",
+                "count": 3,
+                "result": 3,
+                "calculations": [
+                    {
+                        "id": "123e4567-e89b-12d3-a456-426614174999",
+                        "user_id": "123e4567-e89b-12d3-a456-426614174000",
+                        "type": "addition",
+                        "inputs": [1, 2],
+                        "result": 3,
+                        "created_at": "2025-01-01T00:00:00",
+                        "updated_at": "2025-01-01T00:00:00"
+                    }
+                ]
+            }
+        }
+    )
+
+
+class CalculationImportLineError(BaseModel):
+    """A line of an import that was skipped."""
+    line: int = Field(..., description="Line number in the uploaded file (1-based)")
+    error: str = Field(..., description="Why the line was skipped")
+
+
+class CalculationImportResponse(BaseModel):
+    """
+    Response for POST /calculations/import.
+
+    Bad lines are skipped and reported; every other line is imported.
+    """
+    processed: int = Field(..., description="Number of calculation lines read")
+    imported: int = Field(..., description="Number of calculations stored")
+    failed: int = Field(..., description="Number of lines skipped")
+    chunks: int = Field(..., description="Number of chunks loaded (each committed on its own)")
+    errors: List[CalculationImportLineError] = Field(
+        ..., description="The skipped lines, up to IMPORT_MAX_REPORTED_ERRORS of them"
+    )
+    errors_truncated: bool = Field(False, description="Whether more lines failed than are listed")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "processed": 3,
+                "imported": 2,
+                "failed": 1,
+                "chunks": 1,
+                "errors": [{"line": 3, "error": "Value error, Cannot divide by zero."}],
+                "errors_truncated": False
+            }
+        }
+    )
+
+
+class CalculationBulkFilter(BaseModel):
+    """
+    Selects a set of the current user's calculations for a bulk operation.
+
+    Criteria combine with AND; none selects every calculation.
+    """
+    ids: Optional[List[UUID]] = Field(
+        None,
+        max_length=settings.BULK_MAX_IDS,
+        description=f"Only calculations with these ids (up to {settings.BULK_MAX_IDS})",
+    )
+    type: Optional[CalculationType] = Field(None, description="Only calculations of this type")
+    created_after: Optional[datetime] = Field(
+        None, description="Only calculations created at or after this time"
+    )
+    created_before: Optional[datetime] = Field(
+        None, description="Only calculations created before this time"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={"example": {"type": "division", "created_before": "2025-01-01T00:00:00Z"}}
+    )
+
+
+class CalculationBulkDeleteRequest(CalculationBulkFilter):
+    """Request body for POST /calculations/bulk-delete."""
+
+    @model_validator(mode='after')
+    def require_criterion(self) -> "CalculationBulkDeleteRequest":
+        """Refuse to delete everything by accident: at least one criterion is required."""
+        criteria = (self.ids, self.type, self.created_after, self.created_before)
+        if all(criterion is None for criterion in criteria):
+            raise ValueError("Give ids or at least one filter (type, created_after, created_before)")
+        return self
+
+
+class CalculationBulkDeleteResponse(BaseModel):
+    """Response for POST /calculations/bulk-delete."""
+    deleted: int = Field(..., description="Number of calculations deleted")
+
+
+class CalculationRecomputeResponse(BaseModel):
+    """
+    Response for POST /calculations/recompute.
+
+    Calculations that can no longer be evaluated keep their previous result.
+    """
+    updated: int = Field(..., description="Number of results recomputed and stored")
+    dependents: int = Field(
+        ...,
+        description="Number of calculations recomputed because a result they reference changed",
+    )
+    failed: int = Field(..., description="Number of calculations that could not be evaluated")
+
+
+class CalculationUploadCreate(BaseModel):
+    """Request body for opening a chunked upload session."""
+    type: CalculationType = Field(
+        ...,
+        description="Type of the calculation being uploaded (addition, subtraction, "
+                    "multiplication, division or modulo)",
+        example="addition",
+    )
+
+
+class CalculationUploadResponse(BaseModel):
+    """
+    State of a chunked upload session.
+
+    running_result is the calculation's result over the inputs received so
+    far (None before the first input).
+    """
+    id: UUID = Field(..., description="Upload session id")
+    type: str = Field(..., description="Type of the calculation being uploaded")
+    input_count: int = Field(..., description="Number of inputs received so far")
+    chunk_count: int = Field(..., description="Number of chunks received so far")
+    running_result: Optional[float] = Field(None, description="Result over the inputs received so far")
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CalculationUploadFinalizeResponse(BaseModel):
+    """
+    The calculation created by finalizing an upload.
+
+    The inputs are not echoed back; fetch the calculation to read them.
+    """
+    id: UUID = Field(..., description="Id of the new calculation")
+    type: str = Field(..., description="Calculation type")
+    input_count: int = Field(..., description="Number of inputs uploaded")
+    result: float = Field(..., description="The calculation's result")
@@ -1,5 +1,8 @@
 # test_fastapi_calculator.py
 
+import base64
+import json
+import struct
 from datetime import datetime, timezone
 from uuid import uuid4
 import pytest
@@ -51,6 +54,13 @@ def test_health_endpoint(base_url: str):
     assert response.status_code == 200, f"Expected status code 200 but got {response.status_code}. Response: {response.text}"
     assert response.json() == {"status": "ok"}, "Unexpected response from /health."
 
+def test_result_cache_stats_endpoint(base_url: str):
+    response = requests.get(f"{base_url}/health/result-cache")
+    assert response.status_code == 200, f"Unexpected response: {response.text}"
+    stats = response.json()
+    for key in ["local_hits", "shared_hits", "misses", "evictions", "hit_ratio", "local_entries"]:
+        assert key in stats, f"Missing cache counter: {key}"
+
 def test_user_registration(base_url: str):
     url = f"{base_url}/auth/register"
     payload = {
@@ -231,6 +241,40 @@ def test_create_calculation_division(base_url: str):
     # Expected result: 100 / 2 / 5 = 10
     assert "result" in data and data["result"] == 10, f"Expected result 10, got {data.get('result')}"
 
+def test_create_rejects_results_that_overflow(base_url: str):
+    user_data = {
+        "first_name": "Calc",
+        "last_name": "Overflow",
+        "email": f"calc.overflow{uuid4()}@example.com",
+        "username": f"calc_overflow_{uuid4()}",
+        "password": "SecurePass123!",
+        "confirm_password": "SecurePass123!"
+    }
+    token_data = register_and_login(base_url, user_data)
+    headers = {"Authorization": f"Bearer {token_data['access_token']}"}
+    url = f"{base_url}/calculations"
+
+    for payload in (
+        {"type": "multiplication", "inputs": [1e200, 1e200]},
+        {"type": "addition", "inputs": [1e308, 1e308]},
+    ):
+        response = requests.post(url, json=payload, headers=headers)
+        assert response.status_code == 400, f"Overflow should be rejected: {response.text}"
+        assert response.json()["detail"] == "Result is not a finite number."
+
+    response = requests.post(f"{base_url}/calculations/batch", json=[
+        {"type": "multiplication", "inputs": [1e200, 1e200]},
+        {"type": "multiplication", "inputs": [1e100, 1e100]},
+    ], headers=headers)
+    assert response.status_code == 200, f"Batch creation failed: {response.text}"
+    assert response.json()["created"] == 1
+    assert response.json()["results"][0]["error"] == "Result is not a finite number."
+
+    # Nothing non-finite was stored, so the listing still serializes
+    listed = requests.get(url, headers=headers)
+    assert listed.status_code == 200, f"Listing failed: {listed.text}"
+    assert [c["result"] for c in listed.json()] == [1e200]
+
 def test_list_get_update_delete_calculation(base_url: str):
     user_data = {
         "first_name": "Calc",
@@ -289,6 +333,678 @@ def test_list_get_update_delete_calculation(base_url: str):
     get_response_after_delete = requests.get(get_url, headers=headers)
     assert get_response_after_delete.status_code == 404, "Expected 404 after deletion"
 
+def test_create_calculations_batch(base_url: str):
+    user_data = {
+        "first_name": "Calc",
+        "last_name": "Batcher",
+        "email": f"calc.batch{uuid4()}@example.com",
+        "username": f"calc_batch_{uuid4()}",
+        "password": "SecurePass123!",
+        "confirm_password": "SecurePass123!"
+    }
+    token_data = register_and_login(base_url, user_data)
+    headers = {"Authorization": f"Bearer {token_data['access_token']}"}
+
+    payload = [
+        {"type": "addition", "inputs": [1, 2, 3]},
+        {"type": "division", "inputs": [1, 0]},
+        {"type": "square_root", "inputs": [9, 1]},
+        {"type": "exponentiation", "inputs": [2, 3, 2]},
+    ]
+    response = requests.post(f"{base_url}/calculations/batch", json=payload, headers=headers)
+    assert response.status_code == 200, f"Batch creation failed: {response.text}"
+    data = response.json()
+
+    assert data["created"] == 2
+    assert data["failed"] == 2
+    results = data["results"]
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert results[0]["calculation"]["result"] == 6
+    assert "divide by zero" in results[1]["error"].lower()
+    assert results[2]["calculation"] is None and results[2]["error"]
+    assert results[3]["calculation"]["result"] == 512
+
+    # Stored rows are visible through the regular API
+    listed = requests.get(f"{base_url}/calculations", headers=headers).json()
+    assert {c["id"] for c in listed} == {results[0]["calculation"]["id"], results[3]["calculation"]["id"]}
+
+def test_list_calculations_keyset_pagination(base_url: str):
+    user_data = {
+        "first_name": "Calc",
+        "last_name": "Pager",
+        "email": f"calc.pager{uuid4()}@example.com",
+        "username": f"calc_pager_{uuid4()}",
+        "password": "SecurePass123!",
+        "confirm_password": "SecurePass123!"
+    }
+    token_data = register_and_login(base_url, user_data)
+    headers = {"Authorization": f"Bearer {token_data['access_token']}"}
+    url = f"{base_url}/calculations"
+
+    created_ids = []
+    for i in range(5):
+        response = requests.post(url, json={"type": "addition", "inputs": [i, 1]}, headers=headers)
+        assert response.status_code == 201, f"Calculation creation failed: {response.text}"
+        created_ids.append(response.json()["id"])
+
+    # Walk the pages two rows at a time, following X-Next-Cursor
+    seen = []
+    params = {"limit": 2}
+    while True:
+        page = requests.get(url, params=params, headers=headers)
+        assert page.status_code == 200, f"List calculations failed: {page.text}"
+        rows = page.json()
+        assert len(rows) <= 2
+        seen.extend(row["id"] for row in rows)
+        next_cursor = page.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            break
+        params = {"limit": 2, "cursor": next_cursor}
+
+    # Every row exactly once, newest first
+    assert seen == list(reversed(created_ids)), f"Unexpected page order: {seen}"
+
+    bad_cursor = requests.get(url, params={"cursor": "not-a-cursor"}, headers=headers)
+    assert bad_cursor.status_code == 400, f"Expected 400 for a bad cursor, got {bad_cursor.status_code}"
+
+def test_list_calculations_filter_and_sort(base_url: str):
+    user_data = {
+        "first_name": "Calc",
+        "last_name": "Filter",
+        "email": f"calc.filter{uuid4()}@example.com",
+        "username": f"calc_filter_{uuid4()}",
+        "password": "SecurePass123!",
+        "confirm_password": "SecurePass123!"
+    }
+    token_data = register_and_login(base_url, user_data)
+    headers = {"Authorization": f"Bearer {token_data['access_token']}"}
+    url = f"{base_url}/calculations"
+
+    payloads = [
+        {"type": "addition", "inputs": [1, 2]},          # 3
+        {"type": "multiplication", "inputs": [4, 5]},    # 20
+        {"type": "addition", "inputs": [10, 20]},        # 30
+        {"type": "subtraction", "inputs": [10, 3]},      # 7
+    ]
+    for payload in payloads:
+        response = requests.post(url, json=payload, headers=headers)
+        assert response.status_code == 201, f"Calculation creation failed: {response.text}"
+
+    by_type = requests.get(url, params={"type": "addition"}, headers=headers).json()
+    assert sorted(c["result"] for c in by_type) == [3, 30]
+
+    in_range = requests.get(url, params={"result_min": 5, "result_max": 25}, headers=headers).json()
+    assert sorted(c["result"] for c in in_range) == [7, 20]
+
+    ascending = requests.get(url, params={"sort": "result"}, headers=headers).json()
+    assert [c["result"] for c in ascending] == [3, 7, 20, 30]
+
+    # Cursor pagination follows the requested sort order
+    first = requests.get(url, params={"sort": "-result", "limit": 3}, headers=headers)
+    assert [c["result"] for c in first.json()] == [30, 20, 7]
+    cursor = first.headers["X-Next-Cursor"]
+    second = requests.get(url, params={"sort": "-result", "limit": 3, "cursor": cursor}, headers=headers)
+    assert [c["result"] for c in second.json()] == [3]
+    assert "X-Next-Cursor" not in second.headers
+
+    # A cursor is only valid for the sort order it was issued for
+    mismatched = requests.get(url, params={"sort": "created_at", "cursor": cursor}, headers=headers)
+    assert mismatched.status_code == 400
+
+    future = requests.get(url, params={"created_after": "2999-01-01T00:00:00Z"}, headers=headers).json()
+    assert future == []
+
+def test_create_and_update_expression_calculation(base_url: str):
+    user_data = {
+        "first_name": "Calc",
+        "last_name": "Expression",
+        "email": f"calc.expr{uuid4()}@example.com",
+        "username": f"calc_expr_{uuid4()}",
+        "password": "SecurePass123!",
+        "confirm_password": "SecurePass123!"
+    }
+    token_data = register_and_login(base_url, user_data)
+    headers = {"Authorization": f"Bearer {token_data['access_token']}"}
+    url = f"{base_url}/calculations"
+
+    payload = {"type": "expression", "inputs": [1, 2, 4], "expression": "(a + b) / c ** 2"}
+    response = requests.post(url, json=payload, headers=headers)
+    assert response.status_code == 201, f"Expression creation failed: {response.text}"
+    data = response.json()
+    assert data["expression"] == "(a + b) / c ** 2"
+    assert data["result"] == 3 / 16
+
+    update = requests.put(f"{url}/{data['id']}", json={"inputs": [3], "expression": "x * x"}, headers=headers)
+    assert update.status_code == 200, f"Expression update failed: {update.text}"
+    assert update.json()["result"] == 9
+
+    unsafe = requests.post(url, json={"type": "expression", "inputs": [1], "expression": "__import__('os')"}, headers=headers)
+    assert unsafe.status_code == 422
+
+def test_create_and_update_with_packed_inputs(base_url: str):
+    user_data = {
+        "first_name": "Calc",
+        "last_name": "Packed",
+        "email": f"calc.packed{uuid4()}@example.com",
+        "username": f"calc_packed_{uuid4()}",
+        "password": "SecurePass123!",
+        "confirm_password": "SecurePass123!"
+    }
+    token_data = register_and_login(base_url, user_data)
+    headers = {"Authorization": f"Bearer {token_data['access_token']}"}
+    url = f"{base_url}/calculations"
+
+    values = [0.5 * i for i in range(1, 2001)]
+    packed = struct.pack(f"<{len(values)}d", *values)
+
+    response = requests.post(
+        url,
+        params={"type": "addition"},
+        data=packed,
+        headers={**headers, "Content-Type": "application/octet-stream"},
+    )
+    assert response.status_code == 201, f"Packed creation failed: {response.text}"
+    data = response.json()
+    assert data["inputs"] == values
+    assert data["result"] == sum(values)
+
+    update = requests.put(
+        f"{url}/{data['id']}",
+        json={"type": "multiplication", "inputs_b64": base64.b64encode(struct.pack("<3d", 2, 3, 4)).decode()},
+        headers=headers,
+    )
+    assert update.status_code == 200, f"Packed update failed: {update.text}"
+    assert update.json()["inputs"] == [2, 3, 4]
+    assert update.json()["result"] == 24
+
+    # Same validation rules as JSON inputs
+    zero = requests.post(
+        url,
+        params={"type": "division"},
+        data=struct.pack("<2d", 1, 0),
+        headers={**headers, "Content-Type": "application/octet-stream"},
+    )
+    assert zero.status_code == 422
+    assert "Cannot divide by zero" in zero.text
+    ragged = requests.post(
+        url,
+        params={"type": "addition"},
+        data=b"\x00" * 12,
+        headers={**headers, "Content-Type": "application/octet-stream"},
+    )
+    assert ragged.status_code == 422
+    both = requests.post(
+        url,
+        json={"type": "addition", "inputs": [1, 2], "inputs_b64": base64.b64encode(packed).decode()},
+        headers=headers,
+    )
+    assert both.status_code == 422
+
+def test_chunked_upload_session(base_url: str):
+    user_data = {
+        "first_name": "Calc",
+        "last_name": "Upload",
+        "email": f"calc.upload{uuid4()}@example.com",
+        "username": f"calc_upload_{uuid4()}",
+        "password": "SecurePass123!",
+        "confirm_password": "SecurePass123!"
+    }
+    token_data = register_and_login(base_url, user_data)
+    headers = {"Authorization": f"Bearer {token_data['access_token']}"}
+    packed_headers = {**headers, "Content-Type": "application/octet-stream"}
+    url = f"{base_url}/calculations/uploads"
+
+    opened = requests.post(url, json={"type": "addition"}, headers=headers)
+    assert opened.status_code == 201, f"Upload open failed: {opened.text}"
+    upload_id = opened.json()["id"]
+
+    values = [0.25 * i for i in range(3000)]
+    for start in range(0, len(values), 1000):
+        chunk = values[start:start + 1000]
+        response = requests.post(
+            f"{url}/{upload_id}/chunks",
+            params={"offset": start},
+            data=struct.pack(f"<{len(chunk)}d", *chunk),
+            headers=packed_headers,
+        )
+        assert response.status_code == 200, f"Chunk append failed: {response.text}"
+    assert response.json()["input_count"] == 3000
+    assert response.json()["running_result"] == sum(values)
+
+    repeated = requests.post(
+        f"{url}/{upload_id}/chunks", params={"offset": 0}, data=struct.pack("<d", 1), headers=packed_headers
+    )
+    assert repeated.status_code == 409
+
+    finalized = requests.post(f"{url}/{upload_id}/finalize", headers=headers)
+    assert finalized.status_code == 201, f"Upload finalize failed: {finalized.text}"
+    summary = finalized.json()
+    assert summary["input_count"] == 3000 and summary["result"] == sum(values)
+
+    calc = requests.get(f"{base_url}/calculations/{summary['id']}", headers=headers)
+    assert calc.status_code == 200
+    assert calc.json()["inputs"] == values
+    assert requests.get(f"{url}/{upload_id}", headers=headers).status_code == 404
+
+    unsupported = requests.post(url, json={"type": "exponentiation"}, headers=headers)
+    assert unsupported.status_code == 400
+
+def test_patch_calculation_inputs(base_url: str):
+    user_data = {
+        "first_name": "Calc",
+        "last_name": "Patch",
+        "email": f"calc.patch{uuid4()}@example.com",
+        "username": f"calc_patch_{uuid4()}",
+        "password": "SecurePass123!",
+        "confirm_password": "SecurePass123!"
+    }
+    token_data = register_and_login(base_url, user_data)
+    headers = {"Authorization": f"Bearer {token_data['access_token']}"}
+    url = f"{base_url}/calculations"
+
+    created = requests.post(url, json={"type": "multiplication", "inputs": [2, 3]}, headers=headers)
+    assert created.status_code == 201
+    calc_id = created.json()["id"]
+
+    appended = requests.patch(f"{url}/{calc_id}", json={"append": [4, 5]}, headers=headers)
+    assert appended.status_code == 200, f"Append failed: {appended.text}"
+    assert appended.json()["inputs"] == [2, 3, 4, 5]
+    assert appended.json()["result"] == 120
+
+    trimmed = requests.patch(
+        f"{url}/{calc_id}",
+        json={"remove": 2, "append_b64": base64.b64encode(struct.pack("<d", 10)).decode()},
+        headers=headers,
+    )
+    assert trimmed.status_code == 200, f"Remove failed: {trimmed.text}"
+    assert trimmed.json()["inputs"] == [2, 3, 10]
+    assert trimmed.json()["result"] == 60
+
+    assert requests.patch(f"{url}/{calc_id}", json={"remove": 5}, headers=headers).status_code == 400
+    assert requests.patch(f"{url}/{calc_id}", json={}, headers=headers).status_code == 422
+
+    power = requests.post(url, json={"type": "exponentiation", "inputs": [2, 3]}, headers=headers).json()
+    recomputed = requests.patch(f"{url}/{power['id']}", json={"append": [2]}, headers=headers)
+    assert recomputed.status_code == 200
+    assert recomputed.json()["result"] == 2 ** 9
+
+def test_lookup_and_dedupe_identical_calculations(base_url: str):
+    tokens = []
+    for name in ("owner", "other"):
+        user_data = {
+            "first_name": "Calc",
+            "last_name": "Lookup",
+            "email": f"calc.lookup.{name}{uuid4()}@example.com",
+            "username": f"lookup_{name}_{uuid4()}",
+            "password": "SecurePass123!",
+            "confirm_password": "SecurePass123!"
+        }
+        tokens.append(register_and_login(base_url, user_data)["access_token"])
+    owner, other = ({"Authorization": f"Bearer {token}"} for token in tokens)
+    url = f"{base_url}/calculations"
+    inputs = [uuid4().int % 1000 + 0.5, 7, 11]
+
+    first = requests.post(url, json={"type": "addition", "inputs": inputs}, headers=owner).json()
+    requests.post(url, json={"type": "addition", "inputs": inputs}, headers=other)
+
+    # Packed and JSON inputs of the same values are identical
+    packed = requests.post(
+        f"{url}/lookup",
+        params={"type": "addition"},
+        data=struct.pack("<3d", *inputs),
+        headers={**owner, "Content-Type": "application/octet-stream"},
+    )
+    assert packed.status_code == 200, f"Lookup failed: {packed.text}"
+    body = packed.json()
+    assert body["count"] == 1
+    assert [calc["id"] for calc in body["calculations"]] == [first["id"]]
+    assert body["result"] == first["result"]
+
+    everyone = requests.post(f"{url}/lookup?scope=global", json={"type": "addition", "inputs": inputs}, headers=owner)
+    assert everyone.json()["count"] == 2
+    assert len(everyone.json()["calculations"]) == 1
+    assert everyone.json()["inputs_hash"] == body["inputs_hash"]
+
+    missing = requests.post(f"{url}/lookup", json={"type": "subtraction", "inputs": inputs}, headers=owner)
+    assert missing.json()["count"] == 0 and missing.json()["result"] is None
+
+    deduped = requests.post(f"{url}?dedupe=true", json={"type": "addition", "inputs": inputs}, headers=other)
+    assert deduped.status_code == 201
+    assert deduped.json()["result"] == first["result"]
+    assert deduped.json()["id"] != first["id"]
+
+
+def test_exact_results_are_stored_and_materialized(base_url: str):
+    user_data = {
+        "first_name": "Calc",
+        "last_name": "Exact",
+        "email": f"calc.exact{uuid4()}@example.com",
+        "username": f"exact_{uuid4()}",
+        "password": "SecurePass123!",
+        "confirm_password": "SecurePass123!"
+    }
+    headers = {"Authorization": f"Bearer {register_and_login(base_url, user_data)['access_token']}"}
+    url = f"{base_url}/calculations"
+
+    created = requests.post(f"{url}?exact=true", json={"type": "exponentiation", "inputs": [3, 100]}, headers=headers)
+    assert created.status_code == 201, f"Exact create failed: {created.text}"
+    body = created.json()
+    assert body["result"] == pytest.approx(float(3 ** 100))
+    assert body["result_exact"]["digits"] == 48 and body["result_exact"]["value"] is None
+
+    listed = requests.get(url, headers=headers).json()
+    assert listed[0]["result_exact"]["digest"] == body["result_exact"]["digest"]
+    assert listed[0]["result_exact"]["value"] is None
+
+    materialized = requests.get(f"{url}/{body['id']}?materialize=true", headers=headers).json()
+    assert materialized["result_exact"]["value"] == str(3 ** 100)
+
+    decimal = requests.post(
+        f"{url}?exact=true",
+        data='{"type": "addition", "inputs": [0.1, 0.2]}',
+        headers={**headers, "Content-Type": "application/json"},
+    ).json()
+    fetched = requests.get(f"{url}/{decimal['id']}?materialize=true", headers=headers).json()
+    assert fetched["result_exact"]["value"] == "0.3"
+    assert fetched["inputs"] == [0.1, 0.2]
+
+    # Without new inputs, the stored decimals are recomputed exactly
+    retyped = requests.put(f"{url}/{decimal['id']}", json={"type": "subtraction"}, headers=headers)
+    assert retyped.status_code == 200, retyped.text
+    fetched = requests.get(f"{url}/{decimal['id']}?materialize=true", headers=headers).json()
+    assert fetched["result_exact"]["value"] == "-0.1"
+
+    # Integers no float can hold are returned in full, in the listing too
+    huge = requests.post(f"{url}?exact=true", json={"type": "multiplication", "inputs": [10 ** 400, 2]}, headers=headers)
+    assert huge.status_code == 201, huge.text
+    assert huge.json()["inputs"] == [10 ** 400, 2] and huge.json()["result"] is None
+    listing = requests.get(url, headers=headers)
+    assert listing.status_code == 200, listing.text
+    assert listing.json()[0]["inputs"] == [10 ** 400, 2]
+
+    # Without exact, the same calculation is a plain float result
+    plain = requests.post(url, json={"type": "exponentiation", "inputs": [3, 100]}, headers=headers).json()
+    assert plain["result_exact"] is None
+
+
+def test_evaluate_computes_without_storing(base_url: str):
+    user_data = {
+        "first_name": "Calc",
+        "last_name": "Evaluate",
+        "email": f"calc.evaluate{uuid4()}@example.com",
+        "username": f"evaluate_{uuid4()}",
+        "password": "SecurePass123!",
+        "confirm_password": "SecurePass123!"
+    }
+    headers = {"Authorization": f"Bearer {register_and_login(base_url, user_data)['access_token']}"}
+    url = f"{base_url}/evaluate"
+
+    single = requests.post(url, json={"type": "multiplication", "inputs": [2, 3, 4]}, headers=headers)
+    assert single.status_code == 200, f"Evaluate failed: {single.text}"
+    assert single.json()["result"] == 24
+    assert "cache-control" not in single.headers
+
+    packed = requests.post(
+        url,
+        params={"type": "addition"},
+        data=struct.pack("<2d", 1.5, 2.5),
+        headers={**headers, "Content-Type": "application/octet-stream"},
+    )
+    assert packed.json()["result"] == 4.0
+
+    batch = requests.post(url, json=[
+        {"type": "addition", "inputs": [1, 2]},
+        {"type": "division", "inputs": [1, 0]},
+        {"type": "addition", "inputs": [1]},
+    ], headers=headers).json()
+    assert batch["evaluated"] == 1 and batch["failed"] == 2
+    assert batch["results"][0]["result"] == 3
+    assert "divide by zero" in batch["results"][1]["error"]
+
+    bad = requests.post(url, json={"type": "division", "inputs": [1, 0]}, headers=headers)
+    assert bad.status_code == 422
+
+    query = {"type": "subtraction", "inputs": [10, 4, 1]}
+    first = requests.get(url, params=query, headers=headers)
+    assert first.status_code == 200 and first.json()["result"] == 5
+    assert first.headers["Cache-Control"].startswith("private, max-age=")
+    etag = first.headers["ETag"]
+    assert etag == f'"{first.json()["inputs_hash"]}"'
+
+    repeat = requests.get(url, params=query, headers={**headers, "If-None-Match": etag})
+    assert repeat.status_code == 304 and repeat.headers["ETag"] == etag
+    changed = requests.get(url, params={**query, "inputs": [10, 4, 2]}, headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+
+    assert requests.get(f"{base_url}/calculations", headers=headers).json() == []
+
+
+def test_sweep_streams_ndjson(base_url: str):
+    user_data = {
+        "first_name": "Calc",
+        "last_name": "Sweep",
+        "email": f"calc.sweep{uuid4()}@example.com",
+        "username": f"sweep_{uuid4()}",
+        "password": "SecurePass123!",
+        "confirm_password": "SecurePass123!"
+    }
+    headers = {"Authorization": f"Bearer {register_and_login(base_url, user_data)['access_token']}"}
+    url = f"{base_url}/evaluate/sweep"
+
+    response = requests.post(url, json={
+        "type": "multiplication",
+        "inputs": [{"start": 1, "stop": 3, "num": 3}, 10, {"values": [1, -1]}],
+    }, headers=headers, stream=True)
+    assert response.status_code == 200, f"Sweep failed: {response.text}"
+    assert response.headers["Content-Type"].startswith("application/x-ndjson")
+    assert response.headers["X-Sweep-Points"] == "6"
+    lines = [json.loads(line) for line in response.iter_lines() if line]
+    assert [line["result"] for line in lines] == [10, -10, 20, -20, 30, -30]
+    assert lines[3]["point"] == [2.0, -1.0]
+
+    too_large = requests.post(url, json={
+        "type": "addition", "inputs": [{"start": 0, "stop": 1, "num": 10 ** 7}, 1],
+    }, headers=headers)
+    assert too_large.status_code == 422
+    assert requests.get(f"{base_url}/calculations", headers=headers).json() == []
+
+
+def test_references_recompute_dependents_on_update(base_url: str):
+    user_data = {
+        "first_name": "Calc",
+        "last_name": "Graph",
+        "email": f"calc.graph{uuid4()}@example.com",
+        "username": f"graph_{uuid4()}",
+        "password": "SecurePass123!",
+        "confirm_password": "SecurePass123!"
+    }
+    headers = {"Authorization": f"Bearer {register_and_login(base_url, user_data)['access_token']}"}
+    url = f"{base_url}/calculations"
+
+    def create(payload):
+        response = requests.post(url, json=payload, headers=headers)
+        assert response.status_code == 201, f"Create failed: {response.text}"
+        return response.json()
+
+    source = create({"type": "addition", "inputs": [1, 2]})
+    scaled = create({"type": "multiplication", "inputs": [{"ref": source["id"]}, 10]})
+    total = create({"type": "addition", "inputs": [{"ref": scaled["id"]}, {"ref": source["id"]}]})
+    ratio = create({"type": "division", "inputs": [100, {"ref": source["id"]}]})
+    assert (scaled["result"], total["result"]) == (30, 33)
+    assert scaled["references"] == {"0": source["id"]}
+
+    updated = requests.put(f"{url}/{source['id']}", json={"inputs": [5, 5]}, headers=headers)
+    assert updated.status_code == 200, f"Update failed: {updated.text}"
+    assert requests.get(f"{url}/{scaled['id']}", headers=headers).json()["result"] == 100
+    fetched = requests.get(f"{url}/{total['id']}", headers=headers).json()
+    assert fetched["result"] == 110 and fetched["inputs"] == [100, 10]
+
+    cycle = requests.put(f"{url}/{source['id']}", json={"inputs": [{"ref": total["id"]}, 1]}, headers=headers)
+    assert cycle.status_code == 400 and "cycle" in cycle.json()["detail"]
+
+    # A dependent that can no longer be computed rolls the whole update back
+    failing = requests.put(f"{url}/{source['id']}", json={"inputs": [0, 0]}, headers=headers)
+    assert failing.status_code == 400 and ratio["id"] in failing.json()["detail"]
+    assert requests.get(f"{url}/{source['id']}", headers=headers).json()["result"] == 10
+
+    missing = requests.post(url, json={"type": "addition", "inputs": [{"ref": str(uuid4())}, 1]}, headers=headers)
+    assert missing.status_code == 400 and "not found" in missing.json()["detail"]
+    batch = requests.post(f"{url}/batch", json=[{"type": "addition", "inputs": [{"ref": source["id"]}, 1]}],
+                          headers=headers).json()
+    assert batch["failed"] == 1
+
+    # Plain new inputs drop the references
+    detached = requests.put(f"{url}/{scaled['id']}", json={"inputs": [1, 1]}, headers=headers).json()
+    assert detached["references"] == {}
+
+
+def test_export_streams_ndjson_and_csv(base_url: str):
+    user_data = {
+        "first_name": "Calc",
+        "last_name": "Export",
+        "email": f"calc.export{uuid4()}@example.com",
+        "username": f"export_{uuid4()}",
+        "password": "SecurePass123!",
+        "confirm_password": "SecurePass123!"
+    }
+    headers = {"Authorization": f"Bearer {register_and_login(base_url, user_data)['access_token']}"}
+    url = f"{base_url}/calculations"
+    created = [
+        requests.post(url, json=payload, headers=headers).json()
+        for payload in (
+            {"type": "addition", "inputs": [1, 2]},
+            {"type": "expression", "inputs": [2, 3], "expression": "a * b"},
+        )
+    ]
+
+    ndjson = requests.get(f"{url}/export", headers=headers, stream=True)
+    assert ndjson.status_code == 200
+    assert ndjson.headers["Content-Type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in ndjson.iter_lines() if line]
+    assert [row["id"] for row in rows] == [calc["id"] for calc in created]
+    assert rows[1]["expression"] == "a * b" and rows[1]["result"] == 6
+
+    exported = requests.get(f"{url}/export", params={"format": "csv", "type": "addition"}, headers=headers)
+    assert exported.headers["Content-Type"].startswith("text/csv")
+    assert 'filename="calculations.csv"' in exported.headers["Content-Disposition"]
+    lines = exported.text.splitlines()
+    assert lines[0].startswith("id,type,inputs") and len(lines) == 2
+
+    assert requests.get(f"{url}/export", params={"format": "xml"}, headers=headers).status_code == 422
+
+
+def test_import_round_trips_an_export(base_url: str):
+    tokens = []
+    for name in ("source", "target"):
+        user_data = {
+            "first_name": "Calc",
+            "last_name": "Import",
+            "email": f"calc.import.{name}{uuid4()}@example.com",
+            "username": f"import_{name}_{uuid4()}",
+            "password": "SecurePass123!",
+            "confirm_password": "SecurePass123!"
+        }
+        tokens.append(register_and_login(base_url, user_data)["access_token"])
+    source, target = ({"Authorization": f"Bearer {token}"} for token in tokens)
+    url = f"{base_url}/calculations"
+    for payload in ({"type": "addition", "inputs": [1, 2]}, {"type": "median", "inputs": [5, 1, 3]}):
+        requests.post(url, json=payload, headers=source)
+
+    exported = requests.get(f"{url}/export", params={"format": "csv"}, headers=source).text
+    broken = exported + 'division,"[1, 0]"\n'
+    imported = requests.post(
+        f"{url}/import", data=broken.encode(), headers={**target, "Content-Type": "text/csv"}
+    )
+    assert imported.status_code == 200, f"Import failed: {imported.text}"
+    summary = imported.json()
+    assert (summary["imported"], summary["failed"]) == (2, 1)
+    assert summary["errors"][0]["line"] == 4
+
+    copied = requests.get(url, params={"sort": "created_at"}, headers=target).json()
+    original = requests.get(url, params={"sort": "created_at"}, headers=source).json()
+    assert [(calc["type"], calc["result"], calc["created_at"]) for calc in copied] == \
+        [(calc["type"], calc["result"], calc["created_at"]) for calc in original]
+
+    ndjson = requests.post(f"{url}/import", data='{"type": "subtraction", "inputs": [9, 4]}\n', headers=target)
+    assert ndjson.json()["imported"] == 1
+
+
+def test_bulk_delete_and_recompute(base_url: str):
+    user_data = {
+        "first_name": "Calc",
+        "last_name": "Bulk",
+        "email": f"calc.bulk{uuid4()}@example.com",
+        "username": f"bulk_{uuid4()}",
+        "password": "SecurePass123!",
+        "confirm_password": "SecurePass123!"
+    }
+    headers = {"Authorization": f"Bearer {register_and_login(base_url, user_data)['access_token']}"}
+    url = f"{base_url}/calculations"
+    created = [
+        requests.post(url, json=payload, headers=headers).json()
+        for payload in (
+            {"type": "addition", "inputs": [1, 2]},
+            {"type": "addition", "inputs": [3, 4]},
+            {"type": "division", "inputs": [8, 2]},
+            {"type": "multiplication", "inputs": [2, 5]},
+        )
+    ]
+
+    refused = requests.post(f"{url}/bulk-delete", json={}, headers=headers)
+    assert refused.status_code == 422, "An empty bulk delete must be refused"
+
+    recomputed = requests.post(f"{url}/recompute", json={"type": "addition"}, headers=headers)
+    assert recomputed.status_code == 200, f"Recompute failed: {recomputed.text}"
+    assert recomputed.json() == {"updated": 2, "dependents": 0, "failed": 0}
+    assert requests.post(f"{url}/recompute", headers=headers).json()["updated"] == 4
+
+    by_type = requests.post(f"{url}/bulk-delete", json={"type": "addition"}, headers=headers)
+    assert by_type.status_code == 200 and by_type.json() == {"deleted": 2}
+    by_ids = requests.post(
+        f"{url}/bulk-delete", json={"ids": [created[0]["id"], created[2]["id"]]}, headers=headers
+    )
+    assert by_ids.json() == {"deleted": 1}
+
+    remaining = requests.get(url, headers=headers).json()
+    assert [calc["id"] for calc in remaining] == [created[3]["id"]]
+
+
+def test_conditional_get_of_list_and_detail(base_url: str):
+    user_data = {
+        "first_name": "Calc",
+        "last_name": "ETag",
+        "email": f"calc.etag{uuid4()}@example.com",
+        "username": f"etag_{uuid4()}",
+        "password": "SecurePass123!",
+        "confirm_password": "SecurePass123!"
+    }
+    headers = {"Authorization": f"Bearer {register_and_login(base_url, user_data)['access_token']}"}
+    url = f"{base_url}/calculations"
+    first = requests.post(url, json={"type": "addition", "inputs": [1, 2]}, headers=headers).json()
+
+    listing = requests.get(url, headers=headers)
+    list_etag = listing.headers["ETag"]
+    assert list_etag.startswith('W/"') and listing.headers["Cache-Control"] == "private, no-cache"
+    unchanged = requests.get(url, headers={**headers, "If-None-Match": list_etag})
+    assert unchanged.status_code == 304 and unchanged.content == b""
+    filtered = requests.get(url, params={"type": "addition"}, headers={**headers, "If-None-Match": list_etag})
+    assert filtered.status_code == 200, "Each query string has its own ETag"
+
+    detail = requests.get(f"{url}/{first['id']}", headers=headers)
+    detail_etag = detail.headers["ETag"]
+    assert requests.get(f"{url}/{first['id']}", headers={**headers, "If-None-Match": detail_etag}).status_code == 304
+
+    requests.put(f"{url}/{first['id']}", json={"inputs": [5, 5]}, headers=headers)
+    changed = requests.get(f"{url}/{first['id']}", headers={**headers, "If-None-Match": detail_etag})
+    assert changed.status_code == 200 and changed.json()["result"] == 10
+    assert requests.get(url, headers={**headers, "If-None-Match": list_etag}).status_code == 200
+
+    second = requests.post(url, json={"type": "addition", "inputs": [3, 4]}, headers=headers).json()
+    list_etag = requests.get(url, headers=headers).headers["ETag"]
+    requests.delete(f"{url}/{second['id']}", headers=headers)
+    after_delete = requests.get(url, headers={**headers, "If-None-Match": list_etag})
+    assert after_delete.status_code == 200 and len(after_delete.json()) == 1
+
 # ---------------------------------------------------------------------------
 # Direct Model Tests for Calculation Operations
 # ---------------------------------------------------------------------------
@@ -199,7 +199,7 @@ def test_exponentiation_with_empty_list():
     Test that empty input list raises a ValueError.
     """
     exponentiation = Exponentiation(user_id=dummy_user_id(), inputs=[])
-    with pytest.raises(ValueError, match="Exponentiation requires at least two inputs."):
+    with pytest.raises(ValueError, match="Inputs must be a list with at least two numbers."):
         exponentiation.get_result()
 
 def test_modulo_get_result():
@@ -250,7 +250,7 @@ def test_invalid_inputs_for_modulo():
     Test that providing fewer than two numbers to Modulo.get_result raises a ValueError.
     """
     modulo = Modulo(user_id=dummy_user_id(), inputs=[10])
-    with pytest.raises(ValueError, match="Modulo requires at least two inputs."):
+    with pytest.raises(ValueError, match="Inputs must be a list with at least two numbers."):
         modulo.get_result()
 
 def test_modulo_with_empty_input_list():
@@ -258,5 +258,500 @@ def test_modulo_with_empty_input_list():
     Test that providing an empty list to Modulo.get_result raises a ValueError.
     """
     modulo = Modulo(user_id=dummy_user_id(), inputs=[])
-    with pytest.raises(ValueError, match="Modulo requires at least two inputs."):
+    with pytest.raises(ValueError, match="Inputs must be a list with at least two numbers."):
         modulo.get_result()
+
+def test_recompute_results_updates_stored_results(db_session, test_user):
+    """
+    Test that Calculation.recompute_results rewrites stale results in chunks
+    and leaves rows that cannot be evaluated untouched.
+    """
+    good = [
+        Calculation.create("addition", test_user.id, [1, 2, 3]),
+        Calculation.create("multiplication", test_user.id, [2, 5]),
+        Calculation.create("subtraction", test_user.id, [10, 4]),
+    ]
+    bad = Calculation.create("division", test_user.id, [1, 0])
+    for calc in good + [bad]:
+        calc.result = -1.0  # stale value
+    db_session.add_all(good + [bad])
+    db_session.commit()
+
+    query = Calculation.filter_query(db_session, user_id=test_user.id)
+    summary = Calculation.recompute_results(db_session, query=query, chunk_size=2)
+
+    assert summary == {"updated": 3, "dependents": 0, "failed": 1}
+    for calc in good + [bad]:
+        db_session.refresh(calc)
+    assert [calc.result for calc in good] == [6, 10, 6]
+    assert bad.result == -1.0
+
+def test_delete_many_deletes_by_filter_in_chunks(db_session, test_user):
+    """
+    Test that Calculation.delete_many deletes exactly the rows of a filtered
+    query, chunk by chunk, and returns the row count.
+    """
+    divisions = [Calculation.create("division", test_user.id, [i + 1, 2]) for i in range(5)]
+    kept = [Calculation.create("addition", test_user.id, [1, 2]), Calculation.create("addition", test_user.id, [3, 4])]
+    for calc in divisions + kept:
+        calc.result = calc.get_result()
+    db_session.add_all(divisions + kept)
+    db_session.commit()
+    kept_ids = [calc.id for calc in kept]
+
+    query = Calculation.filter_query(db_session, user_id=test_user.id, calculation_type="division")
+    assert Calculation.delete_many(db_session, query, chunk_size=2) == 5
+
+    query = Calculation.filter_query(db_session, user_id=test_user.id, ids=[kept_ids[0], uuid.uuid4()])
+    assert Calculation.delete_many(db_session, query, chunk_size=2) == 1
+    remaining = Calculation.filter_query(db_session, user_id=test_user.id).with_entities(Calculation.id).all()
+    assert [row.id for row in remaining] == kept_ids[1:]
+
+def test_binary_inputs_storage_round_trip(db_session, test_user, monkeypatch):
+    """
+    Test that inputs written in the binary format are stored packed, read
+    back as lists, and expose a zero-copy float64 view.
+    """
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "INPUTS_STORAGE_FORMAT", "binary")
+
+    calc = Calculation.create("addition", test_user.id, [1.5, 2, 3])
+    assert calc.inputs_json is None
+    assert len(calc.inputs_packed) == 3 * 8
+    calc.result = calc.get_result()
+    # Huge integers cannot be packed exactly and stay JSON
+    big = Calculation.create("addition", test_user.id, [2 ** 60, 1])
+    big.result = 0.0
+    db_session.add_all([calc, big])
+    db_session.commit()
+    db_session.expire_all()
+
+    assert calc.inputs == [1.5, 2.0, 3.0]
+    assert calc.inputs_array.tolist() == [1.5, 2.0, 3.0]
+    assert not calc.inputs_array.flags.writeable
+    assert big.inputs == [2 ** 60, 1] and big.inputs_packed is None
+
+    summary = Calculation.recompute_results(
+        db_session, query=db_session.query(Calculation).filter(Calculation.id == calc.id)
+    )
+    assert summary == {"updated": 1, "dependents": 0, "failed": 0}
+
+def test_exact_inputs_are_stored_losslessly(db_session, test_user, monkeypatch):
+    """
+    Test that exact-mode decimal inputs read back as the same Decimals,
+    and that exact rows are neither reused as float results nor
+    recomputed by the float batch engine.
+    """
+    from decimal import Decimal
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "INPUTS_STORAGE_FORMAT", "binary")
+
+    decimal = Calculation.create("addition", test_user.id, [Decimal("0.1"), Decimal("0.2")])
+    decimal.store_result(Decimal("0.3"), exact=True)
+    assert decimal.inputs_packed is None
+    integers = Calculation.create("division", test_user.id, [7, 3])
+    integers.store_result(Decimal("2.333333333333333333333333333"), exact=True)
+    db_session.add_all([decimal, integers])
+    db_session.commit()
+    db_session.expire_all()
+
+    assert decimal.exact and decimal.inputs == [Decimal("0.1"), Decimal("0.2")]
+    assert decimal.kernel_inputs == [Decimal("0.1"), Decimal("0.2")]
+    assert Calculation.stored_result(db_session, integers.inputs_hash) is None
+
+    summary = Calculation.recompute_results(
+        db_session, query=db_session.query(Calculation).filter(Calculation.user_id == test_user.id)
+    )
+    assert summary == {"updated": 0, "dependents": 0, "failed": 0}
+
+    plain = Calculation.create("division", test_user.id, [7, 3])
+    plain.store_result(plain.get_result())
+    db_session.add(plain)
+    db_session.commit()
+    assert not plain.exact and plain.inputs_hash == integers.inputs_hash
+    assert Calculation.stored_result(db_session, integers.inputs_hash) == 7 / 3
+
+def test_convert_inputs_storage_between_formats(db_session, test_user, monkeypatch):
+    """
+    Test that Calculation.convert_inputs_storage migrates JSON rows to the
+    packed format and back, skipping values that cannot be packed exactly.
+    """
+    json_rows = [Calculation.create("multiplication", test_user.id, [i, 2.5]) for i in range(5)]
+    unpackable = Calculation.create("addition", test_user.id, [2 ** 60, 1])
+    for calc in json_rows + [unpackable]:
+        calc.result = 0.0
+    db_session.add_all(json_rows + [unpackable])
+    db_session.commit()
+
+    summary = Calculation.convert_inputs_storage(db_session, "binary", chunk_size=2)
+    assert summary["converted"] >= 5
+    assert summary["skipped"] >= 1
+    db_session.expire_all()
+    assert all(calc.inputs_packed is not None and calc.inputs_json is None for calc in json_rows)
+    assert [calc.inputs for calc in json_rows] == [[float(i), 2.5] for i in range(5)]
+    assert unpackable.inputs_packed is None
+
+    summary = Calculation.convert_inputs_storage(db_session, "json", chunk_size=2)
+    assert summary["converted"] >= 5
+    db_session.expire_all()
+    assert all(calc.inputs_packed is None for calc in json_rows)
+    assert [calc.inputs for calc in json_rows] == [[float(i), 2.5] for i in range(5)]
+
+def test_chunked_upload_folds_incrementally_and_finalizes(db_session, test_user):
+    """
+    Test that an upload folded chunk by chunk gives the scalar kernel's
+    result, and that finalizing stores the concatenated inputs packed.
+    """
+    import numpy as np
+    from app.models.upload import CalculationUpload, CalculationUploadChunk, UploadOffsetError
+
+    values = np.linspace(0.5, 2.0, 1000)
+    upload = CalculationUpload.open(db_session, test_user.id, "multiplication")
+    for start in range(0, len(values), 300):
+        upload.append(db_session, values[start:start + 300], offset=start)
+    assert upload.input_count == 1000 and upload.chunk_count == 4
+    with pytest.raises(UploadOffsetError):
+        upload.append(db_session, values[:10], offset=0)
+
+    calculation_id = upload.finalize(db_session)
+    db_session.commit()
+
+    calc = db_session.query(Calculation).filter(Calculation.id == calculation_id).one()
+    assert calc.inputs == values.tolist()
+    assert calc.result == Calculation.create("multiplication", test_user.id, values.tolist()).get_result()
+    assert db_session.query(CalculationUploadChunk).filter_by(upload_id=upload.id).count() == 0
+
+    with pytest.raises(ValueError, match="support addition"):
+        CalculationUpload.open(db_session, test_user.id, "exponentiation")
+    division = CalculationUpload.open(db_session, test_user.id, "division")
+    division.append(db_session, np.array([0.0, 2.0]))
+    with pytest.raises(ValueError, match="Cannot divide by zero"):
+        division.append(db_session, np.array([0.0]))
+    assert division.input_count == 2 and division.running_result == 0.0
+
+@pytest.mark.parametrize("storage_format", ["json", "binary"])
+def test_patch_inputs_derives_result_incrementally(db_session, test_user, monkeypatch, storage_format):
+    """
+    Test that appending folds the new inputs into the stored result exactly,
+    removal undoes trailing inputs, and non-invertible cases ask for a
+    recompute.
+    """
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "INPUTS_STORAGE_FORMAT", storage_format)
+
+    calc = Calculation.create("subtraction", test_user.id, [100.5, 3.25, 7.0])
+    calc.result = calc.get_result()
+    db_session.add(calc)
+    db_session.commit()
+    db_session.expire_all()
+
+    assert calc.patch_inputs(append=[1.5, 2.0]) == calc.get_result() == 100.5 - 3.25 - 7.0 - 1.5 - 2.0
+    db_session.commit()
+    db_session.expire_all()
+    assert calc.inputs == [100.5, 3.25, 7.0, 1.5, 2.0]
+    assert (calc.inputs_packed is not None) == (storage_format == "binary")
+
+    assert calc.patch_inputs(remove=3, append=[0.5]) == pytest.approx(100.5 - 3.25 - 0.5)
+    assert calc.inputs == [100.5, 3.25, 0.5]
+
+    modulo = Calculation.create("modulo", test_user.id, [100.0, 30.0])
+    modulo.result = modulo.get_result()
+    assert modulo.patch_inputs(append=[4.0]) == (100.0 % 30.0) % 4.0
+    with pytest.raises(ValueError, match="Cannot perform modulo by zero"):
+        modulo.patch_inputs(append=[0.0])
+    assert modulo.patch_inputs(remove=1) is None  # modulo cannot be undone
+
+    power = Calculation.create("exponentiation", test_user.id, [2.0, 3.0])
+    power.result = power.get_result()
+    assert power.patch_inputs(append=[2.0]) is None and power.inputs == [2.0, 3.0, 2.0]
+    with pytest.raises(ValueError, match="at least two numbers"):
+        power.patch_inputs(remove=2)
+
+def test_inputs_hash_tracks_inputs_across_writes(db_session, test_user, monkeypatch):
+    """
+    Test that inputs_hash is the canonical key on insert, update, bulk
+    insert and upload finalize, whatever the storage format, and that the
+    lookup helpers and the backfill use it.
+    """
+    import numpy as np
+    from app.core.config import settings
+    from app.models.upload import CalculationUpload
+    from app.operations.cache import make_key
+
+    inputs = [uuid.uuid4().int % 1000 + 0.25, 4.0, 8.0]
+    key = make_key("division", inputs)
+    json_row = Calculation.create("division", test_user.id, inputs)
+    json_row.result = json_row.get_result()
+    db_session.add(json_row)
+    monkeypatch.setattr(settings, "INPUTS_STORAGE_FORMAT", "binary")
+    packed_row = Calculation.create("division", test_user.id, inputs)
+    db_session.add(packed_row)
+    stored = Calculation.insert_many(db_session, test_user.id, [("division", inputs, None, 1.0)])
+    upload = CalculationUpload.open(db_session, test_user.id, "division")
+    upload.append(db_session, np.array(inputs))
+    uploaded_id = upload.finalize(db_session)
+    db_session.commit()
+
+    matches = Calculation.find_identical(db_session, key, user_id=test_user.id).all()
+    assert {calc.id for calc in matches} == {json_row.id, packed_row.id, stored[0]["id"], uploaded_id}
+    assert Calculation.find_identical(db_session, key, user_id=uuid.uuid4()).count() == 0
+    assert Calculation.stored_result(db_session, key) is not None
+    assert Calculation.stored_result(db_session, None) is None
+
+    json_row.inputs = [1, 2]
+    db_session.commit()
+    assert json_row.inputs_hash == make_key("division", [1.0, 2.0])
+    packed_row.patch_inputs(append=[2.0])
+    db_session.commit()
+    assert packed_row.inputs_hash == make_key("division", inputs + [2.0])
+
+    db_session.query(Calculation).filter(Calculation.id == packed_row.id).update({"inputs_hash": None})
+    db_session.commit()
+    assert Calculation.backfill_inputs_hash(db_session, chunk_size=2)["hashed"] >= 1
+    db_session.expire_all()
+    assert packed_row.inputs_hash == make_key("division", inputs + [2.0])
+
+def test_dependency_graph_recomputes_downstream_in_order(db_session, test_user):
+    """
+    Test that a diamond of references is recomputed sources-first, that
+    cycles are rejected, and that a failing dependent reports its error.
+    """
+    from app.models.dependency import DependencyCycleError, topological_order
+
+    def stored(calculation_type, inputs, references=None):
+        calculation = Calculation.create(calculation_type, test_user.id, inputs)
+        if references:
+            calculation.resolve_references(db_session, references)
+        calculation.store_result(calculation.get_result())
+        db_session.add(calculation)
+        db_session.flush()
+        if references:
+            calculation.set_references(db_session, references)
+        return calculation
+
+    root = stored("addition", [1, 2])
+    left = stored("multiplication", [0, 2], {0: root.id})
+    right = stored("subtraction", [0, 1], {0: root.id})
+    bottom = stored("division", [0, 0], {0: left.id, 1: right.id})
+    db_session.commit()
+    assert (left.result, right.result, bottom.result) == (6, 2, 3)
+    assert bottom.references == {0: left.id, 1: right.id}
+
+    order = topological_order(db_session, root.id)
+    assert set(order[:2]) == {left.id, right.id} and order[2] == bottom.id
+
+    root.inputs = [4, 5]
+    root.store_result(root.get_result())
+    assert Calculation.recompute_downstream(db_session, root) == 3
+    assert (left.result, right.result, bottom.result) == (18, 8, 2.25)
+    assert bottom.inputs == [18, 8]
+
+    with pytest.raises(DependencyCycleError):
+        root.set_references(db_session, {0: bottom.id})
+    with pytest.raises(DependencyCycleError):
+        root.set_references(db_session, {0: root.id})
+
+    root.inputs = [1, 0]
+    root.store_result(root.get_result())
+    with pytest.raises(ValueError, match=f"{bottom.id} could not be recomputed: Cannot divide by zero"):
+        Calculation.recompute_downstream(db_session, root)
+    db_session.rollback()
+
+def test_recompute_downstream_keeps_each_calculation_mode(db_session, test_user):
+    """
+    Test that exact dependents are recomputed exactly from their sources'
+    full-precision results, float ones from the nearest floats, and that
+    the compute hook is used for each.
+    """
+    from decimal import Decimal
+    from app.operations import kernels
+
+    def stored(calculation_type, inputs, exact, references=None):
+        calculation = Calculation.create(calculation_type, test_user.id, inputs)
+        calculation.exact = exact
+        if references:
+            calculation.resolve_references(db_session, references)
+        calculation.store_result(kernels.evaluate(calculation_type, calculation.kernel_inputs, exact=exact))
+        db_session.add(calculation)
+        db_session.flush()
+        if references:
+            calculation.set_references(db_session, references)
+        return calculation
+
+    root = stored("addition", [Decimal("0.1"), Decimal("0.2")], True)
+    exact_child = stored("division", [0, 3], True, {0: root.id})
+    float_child = stored("multiplication", [0, 3], False, {0: root.id})
+    db_session.commit()
+    assert exact_child.result_text == "0.1"
+
+    root.inputs = [Decimal("0.1"), Decimal("0.5")]
+    root.store_result(kernels.evaluate("addition", root.kernel_inputs, exact=True))
+    computed = []
+
+    def compute(row, inputs, exact):
+        computed.append((row.id, exact))
+        return kernels.evaluate(row.type, inputs, row.expression, exact=exact)
+
+    assert Calculation.recompute_downstream(db_session, root, compute=compute) == 2
+    assert sorted(computed) == sorted([(exact_child.id, True), (float_child.id, False)])
+    assert exact_child.exact and exact_child.inputs == [Decimal("0.6"), 3]
+    assert exact_child.result_text == "0.2"
+    assert not float_child.exact and float_child.result == 0.6 * 3
+    db_session.commit()
+
+def test_recompute_results_recomputes_dependents(db_session, test_user):
+    """
+    Test that Calculation.recompute_results recomputes the calculations
+    referencing a changed result, and counts a dependent that can no
+    longer be computed as failed instead of leaving it half-updated.
+    """
+    source = Calculation.create("subtraction", test_user.id, [2, 2])
+    source.store_result(-1.0)  # stale value
+    db_session.add(source)
+    db_session.flush()
+    dependents = []
+    for calculation_type, inputs, references in (
+        ("multiplication", [0, 3], {0: source.id}),
+        ("division", [1, 0], {1: source.id}),
+    ):
+        dependent = Calculation.create(calculation_type, test_user.id, inputs)
+        dependent.resolve_references(db_session, references)
+        dependent.store_result(dependent.get_result())
+        db_session.add(dependent)
+        db_session.flush()
+        dependent.set_references(db_session, references)
+        dependents.append(dependent)
+    db_session.commit()
+    product, quotient = dependents
+    assert (product.result, quotient.result) == (-3, -1)
+
+    summary = Calculation.recompute_results(
+        db_session, query=db_session.query(Calculation).filter(Calculation.id == source.id)
+    )
+
+    assert summary == {"updated": 1, "dependents": 1, "failed": 1}
+    for calculation in (source, product, quotient):
+        db_session.refresh(calculation)
+    assert (source.result, product.result) == (0, 0)
+    assert product.inputs == [0, 3]
+    assert quotient.result == -1 and quotient.inputs == [1, -1]
+
+def test_export_streams_rows_in_chunks(db_session, test_user, monkeypatch):
+    """Test that the export reads rows in fixed-size chunks and encodes both formats alike."""
+    import csv
+    import io
+    import json
+    from app.core.config import settings
+    from app.operations.export import EXPORT_COLUMNS, export_rows, stream_export
+
+    monkeypatch.setattr(settings, "INPUTS_STORAGE_FORMAT", "binary")
+    Calculation.insert_many(db_session, test_user.id, [("addition", [i, 1.5], None, i + 1.5) for i in range(5)])
+    db_session.commit()
+    query = Calculation.filter_query(db_session, user_id=test_user.id)
+
+    assert [len(chunk) for chunk in export_rows(db_session, query, chunk_size=2)] == [2, 2, 1]
+
+    lines = [json.loads(line) for chunk in stream_export(db_session, query, "ndjson", 2)
+             for line in chunk.decode().splitlines()]
+    # insert_many stamps every row alike, so the (created_at, id) order is by id
+    assert sorted(line["inputs"] for line in lines) == [[float(i), 1.5] for i in range(5)]
+    assert all(line["result"] == line["inputs"][0] + 1.5 and line["result_exact"] is None for line in lines)
+
+    text = b"".join(stream_export(db_session, query, "csv", 2)).decode()
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert tuple(rows[0]) == EXPORT_COLUMNS
+    assert [row["id"] for row in rows] == [line["id"] for line in lines]
+    assert json.loads(rows[4]["inputs"]) == lines[4]["inputs"] and rows[4]["expression"] == ""
+
+def test_import_loads_good_lines_and_reports_bad_ones(db_session, test_user, tmp_path, capsys):
+    """Test that chunked COPY imports skip bad lines, keep created_at, and that the CLI reports progress."""
+    import json
+    from datetime import datetime
+    from app.operations.importer import CalculationImporter, main
+
+    progress = []
+    importer = CalculationImporter(db_session, test_user.id, "ndjson", chunk_size=2,
+                                   on_chunk=lambda summary: progress.append(summary["imported"]))
+    body = "\n".join([
+        json.dumps({"type": "addition", "inputs": [1, 2], "created_at": "2020-01-02T03:04:05+00:00"}),
+        "not json",
+        json.dumps({"type": "division", "inputs": [1, 0]}),
+        "",
+        json.dumps({"type": "expression", "inputs": [2, 5], "expression": "a ** b"}),
+    ]).encode()
+    # Chunk boundaries fall anywhere, including inside lines
+    summary = importer.read(body[i:i + 7] for i in range(0, len(body), 7))
+
+    assert (summary["processed"], summary["imported"], summary["failed"]) == (4, 2, 2)
+    assert [error["line"] for error in summary["errors"]] == [2, 3]
+    assert progress == [1, 2]
+
+    rows = Calculation.filter_query(db_session, user_id=test_user.id).order_by(Calculation.created_at).all()
+    assert [(row.type, row.result) for row in rows] == [("addition", 3), ("expression", 32)]
+    assert rows[0].created_at == datetime(2020, 1, 2, 3, 4, 5)
+    assert rows[0].inputs_hash == rows[0].hash_inputs()
+
+    # Quoted fields may span lines; over-long and non-UTF-8 lines are reported
+    importer = CalculationImporter(db_session, test_user.id, "csv", max_line_bytes=40)
+    summary = importer.read([
+        b'type,inputs,expression\naddition,"[1,\n 2]",\n',
+        b"addition,\"[" + b"1, " * 20, b"1]\",\n",
+        b'subtraction,"[9, 4]",\n\xff\n',
+    ])
+    assert (summary["imported"], summary["failed"]) == (2, 2)
+    assert [error["line"] for error in summary["errors"]] == [4, 6]
+    assert "longer than 40 bytes" in summary["errors"][0]["error"]
+
+    path = tmp_path / "calculations.csv"
+    path.write_text('type,inputs,expression\nmultiplication,"[2, 3]",\nmodulo,"[1]",\n')
+    main([str(path), "--user-id", str(test_user.id)])
+    output = capsys.readouterr()
+    assert "Imported 1 calculations (1 lines failed)." in output.out
+    assert "line 3:" in output.err
+
+def test_listing_version_moves_on_every_write(db_session, test_user):
+    """
+    Test that the user's listing version changes on inserts, ORM updates,
+    bulk statements and deletes, and stays put otherwise.
+    """
+    versions = [Calculation.listing_version(db_session, test_user.id)]
+
+    calcs = [Calculation.create("addition", test_user.id, [i, 2]) for i in range(3)]
+    db_session.add_all(calcs)
+    db_session.commit()
+    versions.append(Calculation.listing_version(db_session, test_user.id))
+    assert Calculation.listing_version(db_session, test_user.id) == versions[-1]
+
+    calcs[0].result = 99
+    db_session.commit()
+    versions.append(Calculation.listing_version(db_session, test_user.id))
+
+    query = Calculation.filter_query(db_session, user_id=test_user.id, ids=[calcs[1].id])
+    assert Calculation.delete_many(db_session, query) == 1
+    versions.append(Calculation.listing_version(db_session, test_user.id))
+
+    db_session.delete(calcs[2])
+    db_session.commit()
+    versions.append(Calculation.listing_version(db_session, test_user.id))
+    assert len(set(versions)) == len(versions)
+
+def test_upgrade_schema_creates_listing_indexes(db_session):
+    """Test that upgrading an existing table adds the keyset listing indexes."""
+    from sqlalchemy import text
+    from app.operations.storage import upgrade_schema
+
+    names = ("ix_calculations_user_created_id", "ix_calculations_user_type_created_id", "ix_calculations_user_result_id")
+    engine = db_session.get_bind()
+    db_session.commit()
+    with engine.begin() as connection:
+        for name in names:
+            connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+    upgrade_schema(engine)
+    upgrade_schema(engine)  # idempotent
+
+    with engine.connect() as connection:
+        existing = set(connection.execute(
+            text("SELECT indexname FROM pg_indexes WHERE tablename = 'calculations'")
+        ).scalars())
+    assert existing.issuperset(names)
@@ -97,3 +97,18 @@ def test_calculation_response_valid():
     assert calc_response.type == "subtraction"
     assert calc_response.inputs == [20, 5]
     assert calc_response.result == 15.5
+
+def test_calculation_response_skips_input_validation():
+    """Test that a stored calculation is not re-validated when read back."""
+    data = {
+        "id": uuid4(),
+        "user_id": uuid4(),
+        "type": "exponentiation",
+        "inputs": [2, 100000],
+        "result": None,
+        "result_exact_summary": {"sign": 1, "log10": 30102.99, "digits": 30103, "digest": "0" * 64},
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow(),
+    }
+    calc_response = CalculationResponse(**data)
+    assert calc_response.inputs == [2, 100000]
@@ -0,0 +1,103 @@
+# tests/unit/test_batch.py
+
+import base64
+import random
+import uuid
+
+import pytest
+
+from app.core.packing import decode_packed_b64, pack_floats
+from app.models.calculation import Calculation
+from app.operations.batch import evaluate_batch
+
+
+def scalar_result(calculation_type, inputs):
+    """Evaluate one calculation through the model's scalar get_result()."""
+    return Calculation.create(calculation_type, uuid.uuid4(), inputs).get_result()
+
+
+@pytest.mark.parametrize(
+    "calculation_type",
+    ["addition", "subtraction", "multiplication", "division", "modulo"],
+)
+def test_batch_matches_scalar_kernels(calculation_type):
+    """
+    Batch results must be bit-for-bit identical to the scalar kernels for
+    random float inputs of mixed lengths.
+    """
+    rng = random.Random(601)
+    items = []
+    for _ in range(200):
+        length = rng.randint(2, 6)
+        items.append((calculation_type, [rng.uniform(-1000, 1000) for _ in range(length)]))
+
+    results = evaluate_batch(items)
+
+    assert len(results) == len(items)
+    for (_, inputs), outcome in zip(items, results):
+        assert outcome.ok, outcome.error
+        assert outcome.result == scalar_result(calculation_type, inputs)
+
+
+def test_batch_exponentiation_matches_scalar():
+    """Right-associative towers give the same results as the scalar kernel."""
+    items = [
+        ("exponentiation", [2.0, 3.0, 2.0]),
+        ("exponentiation", [5.0, 2.0, 2.0, 1.0]),
+        ("exponentiation", [1.5, -2.0]),
+        ("exponentiation", [-2.0, 3.0]),
+        ("exponentiation", [9.0, 0.5]),
+    ]
+    for (calculation_type, inputs), outcome in zip(items, evaluate_batch(items)):
+        assert outcome.result == scalar_result(calculation_type, inputs)
+
+
+def test_batch_reports_errors_per_row():
+    """A failing row gets its own error while the rest of the batch succeeds."""
+    items = [
+        ("division", [10.0, 2.0]),
+        ("division", [10.0, 0.0]),
+        ("modulo", [10.0, 0.0, 3.0]),
+        ("exponentiation", [0.0, -1.0]),
+        ("exponentiation", [10.0, 400.0]),
+        ("addition", [1.0]),
+        ("square_root", [4.0, 2.0]),
+    ]
+    results = evaluate_batch(items)
+
+    assert results[0].result == 5.0
+    assert results[1].error == "Cannot divide by zero."
+    assert results[2].error == "Cannot perform modulo by zero."
+    assert results[3].error == "Cannot raise 0 to a negative exponent."
+    assert results[4].error == "Exponentiation result is out of range."
+    assert results[5].error == "Inputs must be a list with at least two numbers."
+    assert results[6].error.startswith("Unsupported calculation type")
+
+
+def test_batch_reports_overflow_to_infinity():
+    """Results that overflow float64 fail their row instead of coming back as inf."""
+    results = evaluate_batch([
+        ("multiplication", [1e200, 1e200]),
+        ("addition", [1e308, 1e308]),
+        ("mean", [1e308, 1e308]),
+        ("expression", [1e308], "x * 10"),
+        ("multiplication", [1e100, 1e100]),
+    ])
+    assert [r.error for r in results[:4]] == ["Result is not a finite number."] * 4
+    assert results[4].result == 1e200
+
+
+def test_batch_rejects_non_numeric_rows_only():
+    """A non-numeric input only fails its own row, not its whole group."""
+    results = evaluate_batch([("addition", [1.0, 2.0]), ("addition", [1.0, "x"])])
+    assert results[0].result == 3.0
+    assert results[1].error == "Inputs must be a list of numbers."
+
+
+def test_decode_packed_b64():
+    text = base64.b64encode(pack_floats([1.5, -2.0])).decode()
+    assert decode_packed_b64(text).tolist() == [1.5, -2.0]
+    with pytest.raises(ValueError, match="base64"):
+        decode_packed_b64("not base64!")
+    with pytest.raises(ValueError, match="multiple of 8"):
+        decode_packed_b64(base64.b64encode(b"\x00" * 5).decode())
@@ -220,7 +220,7 @@ def test_divide_by_zero() -> None:
     Steps:
     1. Attempt to call the 'divide' function with arguments 6 and 0, which should raise a ValueError.
     2. Use pytest's 'raises' context manager to catch the expected exception.
-    3. Assert that the error message contains "Cannot divide by zero!".
+    3. Assert that the error message contains "Cannot divide by zero.".
 
     Example:
     >>> test_divide_by_zero()
@@ -231,8 +231,8 @@ def test_divide_by_zero() -> None:
         divide(6, 0)
     
     # Assert that the exception message contains the expected error message
-    assert "Cannot divide by zero!" in str(excinfo.value), \
-        f"Expected error message 'Cannot divide by zero!', but got '{excinfo.value}'"
+    assert "Cannot divide by zero." in str(excinfo.value), \
+        f"Expected error message 'Cannot divide by zero.', but got '{excinfo.value}'"
 
 
 
@@ -0,0 +1,94 @@
+# tests/unit/test_compression.py
+
+import gzip
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+from starlette.testclient import TestClient
+
+from app.core.compression import (
+    CompressionMiddleware, PrecompressedStaticFiles, negotiate, precompress_directory,
+)
+
+
+def test_negotiate_weighs_q_values_then_server_preference():
+    codings = ("zstd", "br", "gzip")
+    assert negotiate("gzip, deflate, br", codings) == "br"
+    assert negotiate("gzip;q=1.0, br;q=0.5", codings) == "gzip"
+    assert negotiate("*;q=0.2, zstd;q=0", codings) == "br"
+    assert negotiate("identity", codings) is None
+    assert negotiate("br;q=0, gzip;q=0", ("br", "gzip")) is None
+    assert negotiate("", codings) is None
+
+
+def _client(minimum_size: int = 100) -> TestClient:
+    rows = [{"id": i, "type": "addition", "inputs": [1, 2], "result": 3} for i in range(200)]
+
+    def stream():
+        for i in range(3):
+            yield f'{{"index": {i}}}\n' * 100
+
+    app = Starlette(routes=[
+        Route("/list", lambda request: JSONResponse(rows, headers={"ETag": '"v1"'})),
+        Route("/small", lambda request: JSONResponse({"ok": True})),
+        Route("/image", lambda request: Response(b"\x89PNG" * 100, media_type="image/png")),
+        Route("/stream", lambda request: StreamingResponse(stream(), media_type="application/x-ndjson")),
+        Route("/raw", lambda request: PlainTextResponse("x" * 500, headers={"Cache-Control": "no-transform"})),
+    ])
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size, codings=("gzip",))
+    return TestClient(app)
+
+
+def test_middleware_compresses_negotiated_responses():
+    client = _client()
+    response = client.get("/list", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["ETag"] == 'W/"v1"'
+    assert int(response.headers["Content-Length"]) < len(response.content) / 5
+    assert response.json()[199]["id"] == 199
+
+    streamed = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert streamed.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in streamed.headers
+    assert streamed.text.count("\n") == 300
+
+
+def test_middleware_leaves_other_responses_alone():
+    client = _client()
+    assert "Content-Encoding" not in client.get("/list", headers={"Accept-Encoding": "identity"}).headers
+    for path in ("/small", "/image", "/raw"):
+        response = client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in response.headers, path
+    head = client.head("/list", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in head.headers
+
+
+def test_precompressed_static_files(tmp_path):
+    (tmp_path / "css").mkdir()
+    stylesheet = tmp_path / "css" / "style.css"
+    stylesheet.write_text("body { color: black; }\n" * 200)
+    (tmp_path / "tiny.js").write_text("let a = 1;")
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG" * 1000)
+
+    assert precompress_directory(str(tmp_path), minimum_size=100) == 1
+    assert gzip.decompress((tmp_path / "css" / "style.css.gz").read_bytes()) == stylesheet.read_bytes()
+    assert precompress_directory(str(tmp_path), minimum_size=100) == 0, "Up-to-date variants are kept"
+
+    app = Starlette(routes=[Mount("/static", PrecompressedStaticFiles(directory=str(tmp_path)))])
+    client = TestClient(app)
+    response = client.get("/static/css/style.css", headers={"Accept-Encoding": "br, gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Content-Type"].startswith("text/css")
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.text == stylesheet.read_text()
+
+    revalidated = client.get(
+        "/static/css/style.css", headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["ETag"]}
+    )
+    assert revalidated.status_code == 304
+
+    plain = client.get("/static/css/style.css", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers and plain.headers["ETag"] != response.headers["ETag"]
+    assert "Content-Encoding" not in client.get("/static/tiny.js", headers={"Accept-Encoding": "gzip"}).headers
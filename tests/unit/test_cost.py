@@ -0,0 +1,72 @@
+# tests/unit/test_cost.py
+
+import math
+import time
+import uuid
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.calculation import Calculation
+from app.operations import cost
+from app.operations.cost import check_exponentiation_budget, estimate_exponentiation
+from app.schemas.calculation import CalculationBase
+
+
+def test_estimate_matches_small_towers():
+    """Small towers are evaluated directly, so the magnitude is exact."""
+    estimate = estimate_exponentiation([2, 3, 2])
+    assert estimate.exact
+    assert estimate.log10_magnitude == pytest.approx(math.log10(512))
+    assert check_exponentiation_budget([2, 3, 2]) == "exact"
+
+
+def test_huge_integer_tower_is_rejected_quickly():
+    """10 ** 10 ** 10 ** 10 is rejected from its estimate, never evaluated."""
+    start = time.perf_counter()
+    with pytest.raises(ValueError, match="too expensive"):
+        Calculation.create("exponentiation", uuid.uuid4(), [10, 10, 10, 10]).get_result()
+    assert time.perf_counter() - start < 0.1
+
+
+def test_expensive_inner_integer_step_is_detected():
+    """A tiny final result does not hide a huge integer intermediate."""
+    estimate = estimate_exponentiation([0.5, 10, 10, 10])
+    assert estimate.log10_magnitude == float("-inf")
+    assert estimate.max_digits > 10 ** 9
+    with pytest.raises(ValueError, match="too expensive"):
+        check_exponentiation_budget([0.5, 10, 10, 10])
+
+
+def test_float_overflow_is_rejected_up_front():
+    with pytest.raises(ValueError, match="out of range"):
+        check_exponentiation_budget([10.0, 400.0])
+    with pytest.raises(ValueError, match="out of range"):
+        Calculation.create("exponentiation", uuid.uuid4(), [1.0000001, 1e10]).get_result()
+
+
+def test_over_budget_integers_downgrade_to_float(monkeypatch):
+    monkeypatch.setattr(cost.settings, "EXPONENTIATION_MAX_RESULT_DIGITS", 10)
+    monkeypatch.setattr(cost.settings, "EXPONENTIATION_OVER_BUDGET", "downgrade")
+    assert check_exponentiation_budget([2, 100]) == "float"
+    result = Calculation.create("exponentiation", uuid.uuid4(), [2, 100]).get_result()
+    assert isinstance(result, float)
+    assert result == 2.0 ** 100
+
+
+def test_over_budget_integers_rejected_by_default(monkeypatch):
+    monkeypatch.setattr(cost.settings, "EXPONENTIATION_MAX_RESULT_DIGITS", 10)
+    with pytest.raises(ValueError, match="too expensive"):
+        check_exponentiation_budget([2, 100])
+
+
+def test_zero_to_negative_exponent_keeps_its_message():
+    """The estimator leaves 0 ** negative to the kernel's own error."""
+    with pytest.raises(ValueError, match="Cannot raise 0 to a negative exponent."):
+        Calculation.create("exponentiation", uuid.uuid4(), [0, -1]).get_result()
+
+
+def test_schema_rejects_over_budget_exponentiation():
+    with pytest.raises(ValidationError, match="out of range"):
+        CalculationBase(type="exponentiation", inputs=[10, 400])
+    assert CalculationBase(type="exponentiation", inputs=[2, 10]).inputs == [2.0, 10.0]
@@ -0,0 +1,64 @@
+# tests/unit/test_executor.py
+
+import asyncio
+
+import pytest
+
+from app.operations.executor import (
+    ComputeBusyError,
+    ComputeExecutor,
+    ComputeTimeoutError,
+    estimate_cost,
+)
+
+
+def test_cost_model_separates_cheap_and_heavy_work():
+    assert estimate_cost("addition", [1.0, 2.0]) == 2
+    assert estimate_cost("modulo", [1.0, 2.0]) > estimate_cost("addition", [1.0, 2.0])
+    # Big integers cost proportionally to their size
+    assert estimate_cost("multiplication", [10 ** 1000, 3]) > estimate_cost("multiplication", [10, 3])
+    # Integer exponentiation adds the predicted big-integer work
+    assert estimate_cost("exponentiation", [2, 10000]) > 100_000
+
+
+def test_cheap_calculations_run_inline():
+    executor = ComputeExecutor(inline_max_cost=1_000)
+    assert asyncio.run(executor.run("addition", [1.0, 2.0, 3.0])) == 6.0
+    assert executor.stats()["started"] is False
+
+
+def test_inline_errors_propagate():
+    executor = ComputeExecutor(inline_max_cost=1_000)
+    with pytest.raises(ValueError, match="Cannot divide by zero."):
+        asyncio.run(executor.run("division", [1.0, 0.0]))
+
+
+def test_heavy_calculations_run_on_the_pool():
+    executor = ComputeExecutor(inline_max_cost=0, max_workers=1, timeout=60)
+    try:
+        assert asyncio.run(executor.run("multiplication", [2.0, 3.0, 4.0])) == 24.0
+        with pytest.raises(ValueError, match="Cannot perform modulo by zero."):
+            asyncio.run(executor.run("modulo", [5.0, 0.0]))
+        assert executor.stats()["started"] is True
+        assert executor.stats()["pending"] == 0
+    finally:
+        executor.shutdown()
+
+
+def test_queue_depth_limit_fails_fast():
+    executor = ComputeExecutor(inline_max_cost=0, max_pending=0)
+    with pytest.raises(ComputeBusyError):
+        asyncio.run(executor.run("addition", [1.0, 2.0]))
+
+
+def test_timeout_recycles_the_pool():
+    executor = ComputeExecutor(inline_max_cost=0, max_workers=1, timeout=0.001)
+    try:
+        with pytest.raises(ComputeTimeoutError):
+            asyncio.run(executor.run("addition", [1.0, 2.0]))
+        assert executor.stats()["pending"] == 0
+        # A fresh pool is ready for the next request
+        executor.timeout = 60
+        assert asyncio.run(executor.run("addition", [1.0, 2.0])) == 3.0
+    finally:
+        executor.shutdown()
@@ -0,0 +1,121 @@
+# tests/unit/test_expression.py
+
+import random
+import uuid
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from app.models.calculation import Calculation, Expression
+from app.operations.batch import evaluate_batch
+from app.operations.expression import compile_expression
+from app.schemas.calculation import CalculationBase
+
+
+def test_variables_bind_in_order_of_first_appearance():
+    compiled = compile_expression("(b + a) / c ** 2 - a")
+    assert compiled.variables == ("b", "a", "c")
+    assert compiled.evaluate([1, 2, 3]) == (1 + 2) / 3 ** 2 - 2
+
+
+def test_operators_match_python_semantics():
+    compiled = compile_expression("-x ** 2 + y % 3 * 2 ** 3 ** 2")
+    assert compiled.evaluate([2, 7]) == -2.0 ** 2 + 7.0 % 3 * 2.0 ** 3.0 ** 2
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "__import__('os')",
+        "a.real",
+        "a[0]",
+        "a if b else c",
+        "a < b",
+        "lambda: 1",
+        "_div(1, 0)",
+        "'abc'",
+        "True + 1",
+        "a // b",
+        "a & b",
+        "(a := 1)",
+        "",
+        "1 +",
+    ],
+)
+def test_unsafe_or_malformed_expressions_are_rejected(text):
+    with pytest.raises(ValueError):
+        compile_expression(text)
+
+
+@pytest.mark.parametrize("text", ["1+" * 499 + "1", "-" * 999 + "1"])
+def test_deeply_nested_expressions_are_rejected(text):
+    with pytest.raises(ValueError, match="nested too deeply"):
+        compile_expression(text)
+    with pytest.raises(ValidationError, match="nested too deeply"):
+        CalculationBase(type="expression", inputs=[], expression=text)
+    assert compile_expression("1+" * 150 + "1").evaluate([]) == 151
+
+
+def test_arithmetic_errors_match_the_kernels():
+    with pytest.raises(ValueError, match="Cannot divide by zero."):
+        compile_expression("a / (b - 1)").evaluate([1, 1])
+    with pytest.raises(ValueError, match="Cannot perform modulo by zero."):
+        compile_expression("a % b").evaluate([1, 0])
+    with pytest.raises(ValueError, match="Cannot raise 0 to a negative exponent."):
+        compile_expression("a ** b").evaluate([0, -1])
+    with pytest.raises(ValueError, match="not a real number"):
+        compile_expression("a ** 0.5").evaluate([-4])
+    with pytest.raises(ValueError, match="expects 2 inputs"):
+        compile_expression("a + b").evaluate([1])
+
+
+def test_repeated_expressions_are_compiled_once():
+    compile_expression.cache_clear()
+    first = compile_expression("a * b + 1")
+    assert compile_expression("a * b + 1") is first
+    assert compile_expression.cache_info().hits == 1
+
+
+def test_vectorized_evaluation_matches_scalar():
+    compiled = compile_expression("(a + b) / c ** 2 - a % 3")
+    rng = random.Random(601)
+    rows = [[rng.uniform(-100, 100) for _ in range(3)] for _ in range(200)]
+    rows.append([1.0, 2.0, 0.0])  # division by zero (0 ** 2)
+    values, errors = compiled.evaluate_many(np.array(rows))
+    for row, value, error in zip(rows[:-1], values, errors):
+        assert error is None
+        assert value == compiled.evaluate(row)
+    assert errors[-1] == "Cannot divide by zero."
+
+
+def test_expression_model_and_factory():
+    calc = Calculation.create("expression", uuid.uuid4(), [1, 2, 3], expression="(a + b) / c ** 2")
+    assert isinstance(calc, Expression)
+    assert calc.get_result() == pytest.approx(1 / 3)
+
+
+def test_batch_engine_groups_expressions():
+    results = evaluate_batch([
+        ("expression", [1.0, 2.0], "a * b"),
+        ("addition", [1.0, 2.0]),
+        ("expression", [3.0, 4.0], "a * b"),
+        ("expression", [3.0], "a * b"),
+        ("expression", [1.0, 0.0], "a / b"),
+        ("expression", [1.0], None),
+    ])
+    assert [r.result for r in results[:3]] == [2.0, 3.0, 12.0]
+    assert "expects 2 inputs" in results[3].error
+    assert results[4].error == "Cannot divide by zero."
+    assert results[5].error == "Expression calculations require an expression."
+
+
+def test_schema_validates_expressions():
+    data = CalculationBase(type="expression", inputs=[4], expression="x * x")
+    assert data.expression == "x * x"
+    with pytest.raises(ValidationError, match="expects 1 inputs"):
+        CalculationBase(type="expression", inputs=[4, 5], expression="x * x")
+    with pytest.raises(ValidationError, match="only allowed for the expression type"):
+        CalculationBase(type="addition", inputs=[1, 2], expression="a + b")
+    with pytest.raises(ValidationError, match="not valid arithmetic"):
+        CalculationBase(type="expression", inputs=[1], expression="a +")
@@ -0,0 +1,209 @@
+# tests/unit/test_kernels.py
+
+import random
+import time
+import uuid
+from decimal import Decimal
+
+from importlib.metadata import EntryPoint
+
+import numpy as np
+import pytest
+
+from app.models.calculation import Calculation
+from app.operations import add, divide, exact, exponentiate, kernels, modulo
+from app.operations.batch import evaluate_batch
+from app.operations.errors import DIVIDE_BY_ZERO
+from app.operations.kernels import (
+    ENTRY_POINT_GROUP,
+    KERNELS,
+    Kernel,
+    evaluate,
+    fold_vector,
+    supports_vector_fold,
+    unfold_vector,
+)
+
+FOLDS = ["addition", "subtraction", "multiplication", "division", "modulo"]
+
+
+def scalar_result(calculation_type, inputs):
+    """Evaluate one calculation through the model's get_result()."""
+    return Calculation.create(calculation_type, uuid.uuid4(), inputs).get_result()
+
+
+@pytest.mark.parametrize("calculation_type", FOLDS)
+def test_vector_matches_scalar_kernels(calculation_type):
+    """One long float64 vector folds to exactly the scalar kernel's result."""
+    rng = random.Random(601)
+    inputs = [rng.uniform(0.5, 2.0) for _ in range(5000)]
+    assert evaluate(calculation_type, np.array(inputs)) == scalar_result(calculation_type, inputs)
+
+
+@pytest.mark.parametrize("calculation_type", FOLDS)
+def test_chunked_folds_match_one_shot(calculation_type):
+    rng = np.random.default_rng(601)
+    values = rng.uniform(0.5, 2.0, 1000)
+    running = None
+    for start in range(0, len(values), 128):
+        running = fold_vector(calculation_type, values[start:start + 128], running).result
+    assert running == evaluate(calculation_type, values)
+
+
+def test_unfold_inverts_appends():
+    values = np.array([8.0, 2.0, 4.0, 0.5])
+    for calculation_type in ("addition", "subtraction", "multiplication", "division"):
+        full = evaluate(calculation_type, values)
+        assert unfold_vector(calculation_type, values[2:], full) == pytest.approx(evaluate(calculation_type, values[:2]))
+    assert unfold_vector("modulo", values[2:], 1.0) is None
+    assert unfold_vector("multiplication", np.array([0.0]), 0.0) is None
+
+
+def test_vector_errors():
+    with pytest.raises(ValueError, match="Cannot divide by zero."):
+        evaluate("division", np.array([1.0, 2.0, 0.0]))
+    with pytest.raises(ValueError, match="Cannot perform modulo by zero."):
+        evaluate("modulo", np.array([1.0, 0.0]))
+    with pytest.raises(ValueError, match="at least two numbers"):
+        evaluate("addition", np.array([1.0]))
+    assert evaluate("addition", np.array([-0.0, -0.0])) == sum([-0.0, -0.0])
+    assert evaluate("exponentiation", np.array([2.0, 3.0])) == 8.0
+    assert supports_vector_fold("Modulo") and not supports_vector_fold("exponentiation")
+
+
+def test_shared_validation_rules():
+    """The model, the operations helpers and the batch engine reject the same inputs alike."""
+    for calculation_type, kernel in KERNELS.items():
+        with pytest.raises(ValueError, match="Inputs must be a list of numbers."):
+            evaluate(calculation_type, "1, 2")
+        with pytest.raises(ValueError, match="All inputs must be numbers."):
+            evaluate(calculation_type, [1, "2"])
+        if kernel.expression:
+            continue
+        with pytest.raises(ValueError, match="at least two numbers"):
+            scalar_result(calculation_type, [1])
+    with pytest.raises(ValueError, match="Unsupported calculation type"):
+        evaluate("square_root", [4, 2])
+
+    with pytest.raises(ValueError, match="Cannot divide by zero."):
+        divide(1, 0)
+    with pytest.raises(ValueError, match="Cannot raise 0 to a negative exponent."):
+        exponentiate(0, -1)
+    with pytest.raises(ValueError, match="not a real number"):
+        exponentiate(-8, 1 / 3)
+    assert add(2, 3) == 5 and modulo(100, 30, 4) == 2
+    assert evaluate_batch([("division", [1.0, 0.0])])[0].error == "Cannot divide by zero."
+    # The request validator reports the kernels' message word for word
+    with pytest.raises(ValueError) as excinfo:
+        KERNELS["division"].validate([1, 0])
+    assert str(excinfo.value) == DIVIDE_BY_ZERO
+
+
+def test_exact_kernels():
+    """Exact mode keeps big integers and decimal inputs exact, and rounds only non-terminating quotients."""
+    assert evaluate("exponentiation", [3, 100], exact=True) == 3 ** 100
+    assert evaluate("addition", [Decimal("0.1"), Decimal("0.2")], exact=True) == Decimal("0.3")
+    assert evaluate("multiplication", [2 ** 70, 3], exact=True) == 3 * 2 ** 70
+    assert evaluate("division", [10 ** 30, 4], exact=True) == 25 * 10 ** 28
+    third = evaluate("division", [1, 3], exact=True)
+    assert third == Decimal("0." + "3" * exact.settings.EXACT_DIVISION_DIGITS)
+    assert evaluate("modulo", [-(10 ** 20) - 1, 7], exact=True) == (-(10 ** 20) - 1) % 7
+    assert evaluate("exponentiation", [Decimal("1.5"), 2], exact=True) == Decimal("2.25")
+    # Types without an exact kernel evaluate in float
+    assert evaluate("mean", [Decimal("1.5"), 2], exact=True) == 1.75
+
+    with pytest.raises(ValueError, match="Cannot divide by zero."):
+        evaluate("division", [1, Decimal("0.0")], exact=True)
+    with pytest.raises(ValueError, match="too large"):
+        evaluate("multiplication", [10 ** 3000, 10 ** 3000], exact=True)
+
+
+def test_exact_result_storage():
+    calculation = Calculation.create("exponentiation", uuid.uuid4(), [3, 100])
+    calculation.store_result(3 ** 100)
+    assert calculation.result_exact is None  # only exact-mode results keep their digits
+    calculation.store_result(3 ** 100, exact=True)
+    assert calculation.result == float(3 ** 100)
+    assert calculation.result_exact == 3 ** 100
+    assert calculation.result_exact_summary["digits"] == 48
+    assert calculation.result_exact_summary["sign"] == 1
+    assert calculation.result_text == str(3 ** 100)
+
+    calculation.store_result(10 ** 400, exact=True)
+    assert calculation.result is None and calculation.result_exact_summary["log10"] == 400
+
+    calculation.store_result(2 ** 200, exact=True)  # float64 holds this one exactly
+    assert calculation.result == 2.0 ** 200
+    assert calculation.result_exact is None and calculation.result_exact_summary is None
+    assert exact.canonical_text(Decimal("-12.500")) == "-12.5"
+
+
+# A third-party operation, as an installed package would expose it
+SUM_OF_SQUARES = Kernel("sum_of_squares", lambda inputs: sum(value * value for value in inputs))
+
+
+def test_plugin_operations_load_on_first_use(monkeypatch):
+    """Entry point operations are listed up front but imported only when used."""
+    monkeypatch.setattr(kernels, "KERNELS", dict(KERNELS))
+    monkeypatch.setattr(kernels, "_discovered", {
+        name: EntryPoint(name, value, ENTRY_POINT_GROUP)
+        for name, value in [
+            ("sum_of_squares", f"{__name__}:SUM_OF_SQUARES"),
+            ("broken", "tests.unit.no_such_module:KERNEL"),
+        ]
+    })
+
+    assert "sum_of_squares" in kernels.operation_names()
+    assert kernels.operation_labels()["sum_of_squares"] == "Sum Of Squares"
+    assert "sum_of_squares" not in kernels.KERNELS
+
+    assert evaluate("sum_of_squares", [1, 2, 3]) == 14
+    assert kernels.KERNELS["sum_of_squares"] is SUM_OF_SQUARES
+    assert evaluate_batch([("sum_of_squares", [3.0, 4.0])])[0].result == 25.0
+
+    calculation_class = Calculation.class_for("sum_of_squares")
+    assert calculation_class is Calculation.class_for("SUM_OF_SQUARES")
+    assert Calculation.create("sum_of_squares", uuid.uuid4(), [2, 2]).get_result() == 8
+
+    with pytest.raises(ValueError, match="could not be loaded"):
+        evaluate("broken", [1, 2])
+    with pytest.raises(ValueError, match="built in"):
+        kernels.register_kernel(Kernel("addition", sum))
+    with pytest.raises(ValueError, match="Invalid operation name"):
+        kernels.register_kernel(Kernel("Not Valid", sum))
+
+
+@pytest.mark.slow
+def test_benchmark_hot_path():
+    """
+    Time every entry point of every fold over the same inputs, and check
+    that the vector path beats the scalar loop on a long vector.
+
+    Run with --run-slow -s to see the timings.
+    """
+    rng = np.random.default_rng(601)
+    vector = rng.uniform(0.5, 2.0, 1_000_000)
+    as_list = vector.tolist()
+    rows = [("addition", row) for row in rng.uniform(0.5, 2.0, (10_000, 8)).tolist()]
+
+    for calculation_type in FOLDS:
+        started = time.perf_counter()
+        scalar = evaluate(calculation_type, as_list)
+        scalar_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        vectorized = evaluate(calculation_type, vector)
+        vector_seconds = time.perf_counter() - started
+
+        assert vectorized == scalar
+        assert vector_seconds < scalar_seconds
+        print(f"{calculation_type:>15}: scalar {scalar_seconds * 1e3:8.2f} ms, vector {vector_seconds * 1e3:8.2f} ms")
+
+    started = time.perf_counter()
+    batch = evaluate_batch(rows)
+    batch_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    scalar_rows = [evaluate(calculation_type, inputs) for calculation_type, inputs in rows]
+    rows_seconds = time.perf_counter() - started
+    assert [outcome.result for outcome in batch] == scalar_rows
+    print(f"{'batch x10000':>15}: scalar {rows_seconds * 1e3:8.2f} ms, batch {batch_seconds * 1e3:8.2f} ms")
@@ -0,0 +1,72 @@
+# tests/unit/test_result_cache.py
+
+import uuid
+
+import pytest
+
+from app.models.calculation import Calculation
+from app.operations.cache import ResultCache, make_key
+
+
+def make_cache(**kwargs) -> ResultCache:
+    """A cache with the Redis tier disabled so tests stay in-process."""
+    options = {"max_entries": 100, "ttl_seconds": 60, "redis_enabled": False}
+    options.update(kwargs)
+    return ResultCache(**options)
+
+
+def test_make_key_is_canonical():
+    """Equal numeric inputs map to the same key regardless of int/float/tuple spelling."""
+    assert make_key("addition", [1, 2]) == make_key("ADDITION", (1.0, 2.0))
+    assert make_key("addition", [1, 2]) != make_key("subtraction", [1, 2])
+    assert make_key("addition", [1, 2]) != make_key("addition", [2, 1])
+
+
+def test_make_key_refuses_inexact_inputs():
+    """Inputs that do not round-trip through float64 are never keyed."""
+    assert make_key("addition", [2 ** 60, 1]) is None
+    assert make_key("addition", ["1", 2]) is None
+    assert make_key("addition", "not-a-list") is None
+
+
+def test_get_or_compute_counts_hits_and_misses():
+    cache = make_cache()
+    calc = Calculation.create("multiplication", uuid.uuid4(), [6, 7])
+
+    assert cache.get_or_compute(calc) == 42
+    assert cache.get_or_compute(calc) == 42
+
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["local_hits"] == 1
+    assert stats["local_entries"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_lru_eviction_is_size_bounded():
+    cache = make_cache(max_entries=2)
+    cache.set("a", 1.0)
+    cache.set("b", 2.0)
+    assert cache.get("a") == 1.0  # "a" becomes most recently used
+    cache.set("c", 3.0)           # evicts "b"
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1.0
+    assert cache.get("c") == 3.0
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_not_returned():
+    cache = make_cache(ttl_seconds=-1)
+    cache.set("a", 1.0)
+    assert cache.get("a") is None
+
+
+def test_errors_are_not_cached():
+    cache = make_cache()
+    calc = Calculation.create("division", uuid.uuid4(), [1, 0])
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Cannot divide by zero"):
+            cache.get_or_compute(calc)
+    assert cache.stats()["local_entries"] == 0
@@ -0,0 +1,75 @@
+# tests/unit/test_statistics.py
+
+import random
+import statistics as pystats
+import uuid
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from app.models.calculation import Calculation, Median, Quantile
+from app.operations import statistics
+from app.operations.batch import evaluate_batch
+from app.schemas.calculation import CalculationBase
+
+
+@pytest.fixture
+def data():
+    rng = random.Random(601)
+    return [rng.uniform(-1000, 1000) for _ in range(1001)]
+
+
+def test_moments_match_the_statistics_module(data):
+    assert statistics.mean(data) == pytest.approx(pystats.fmean(data), rel=1e-12)
+    assert statistics.variance(data) == pytest.approx(pystats.variance(data), rel=1e-12)
+    assert statistics.standard_deviation(data) == pytest.approx(pystats.stdev(data), rel=1e-12)
+
+
+def test_blocked_moments_merge_exactly_enough(monkeypatch, data):
+    """Merging many small blocks agrees with a single block."""
+    whole = statistics.moments(data)
+    monkeypatch.setattr(statistics, "MOMENTS_BLOCK_SIZE", 7)
+    blocked = statistics.moments(data)
+    assert blocked.count == whole.count
+    assert blocked.mean == pytest.approx(whole.mean, rel=1e-12)
+    assert blocked.m2 == pytest.approx(whole.m2, rel=1e-12)
+
+
+def test_variance_is_stable_for_large_offsets():
+    """Welford's update does not cancel like the sum-of-squares formula."""
+    values = [1e9 + 4, 1e9 + 7, 1e9 + 13, 1e9 + 16]
+    assert statistics.variance(values) == 30.0
+
+
+def test_selection_matches_sorting(data):
+    assert statistics.median(data) == pytest.approx(pystats.median(data))
+    assert statistics.median(data[:-1]) == pytest.approx(pystats.median(data[:-1]))
+    for q in (0.0, 0.1, 0.25, 0.9, 1.0):
+        assert statistics.quantile([q] + data) == pytest.approx(float(np.quantile(data, q)))
+    assert statistics.minimum(data) == min(data)
+    assert statistics.maximum(data) == max(data)
+
+
+def test_kernels_accept_arrays_and_reject_bad_inputs():
+    assert statistics.mean(np.array([1.0, 2.0, 3.0, 4.0])) == 2.5
+    with pytest.raises(ValueError, match="at least two numbers"):
+        statistics.variance([1.0])
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        statistics.quantile([1.5, 1.0, 2.0])
+    with pytest.raises(ValueError, match="list of numbers"):
+        statistics.median([1.0, "x"])
+
+
+def test_models_schema_and_batch():
+    assert isinstance(Calculation.create("median", uuid.uuid4(), [4, 1, 3, 2]), Median)
+    calc = Calculation.create("quantile", uuid.uuid4(), [0.9, 1, 2, 3, 4, 5])
+    assert isinstance(calc, Quantile) and calc.get_result() == pytest.approx(4.6)
+
+    with pytest.raises(ValidationError, match="between 0 and 1"):
+        CalculationBase(type="quantile", inputs=[2, 1, 3])
+
+    results = evaluate_batch([("mean", [1.0, 2.0]), ("variance", [1.0]), ("maximum", [3.0, 9.0])])
+    assert results[0].result == 1.5
+    assert "at least two numbers" in results[1].error
+    assert results[2].result == 9.0
@@ -0,0 +1,66 @@
+# tests/unit/test_sweep.py
+
+import json
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from app.operations.kernels import evaluate
+from app.operations.sweep import axis_values, sweep_chunks, sweep_ndjson
+from app.schemas.calculation import CalculationSweepRequest
+
+
+def test_axis_values():
+    assert axis_values(0, 1, num=5).tolist() == [0.0, 0.25, 0.5, 0.75, 1.0]
+    assert axis_values(0, 1, step=0.1).tolist() == pytest.approx([i / 10 for i in range(11)])
+    assert axis_values(3, 1, step=-1).tolist() == [3.0, 2.0, 1.0]
+    assert axis_values(values=[2, 7]).tolist() == [2.0, 7.0]
+    with pytest.raises(ValueError, match="non-zero"):
+        axis_values(0, 1, step=-0.5)
+
+
+def test_sweep_matches_scalar_kernels():
+    """Every point of the product gets the scalar kernel's result, last axis fastest, across chunks."""
+    first, second = np.array([1.0, 2.0, 3.0]), np.array([0.5, -1.0])
+    chunks = list(sweep_chunks("exponentiation", [first, 10.0, second], chunk_points=4))
+    assert [start for start, *_ in chunks] == [0, 4]
+
+    points = np.concatenate([chunk[1] for chunk in chunks])
+    values = np.concatenate([chunk[2] for chunk in chunks])
+    expected = [(a, b) for a in first for b in second]
+    assert points.tolist() == [list(point) for point in expected]
+    assert values.tolist() == [evaluate("exponentiation", [a, 10.0, b]) for a, b in expected]
+
+
+def test_sweep_ndjson_reports_errors_per_point():
+    lines = [
+        json.loads(line)
+        for chunk in sweep_ndjson("division", [1.0, np.array([2.0, 0.0])])
+        for line in chunk.decode().splitlines()
+    ]
+    assert lines == [
+        {"index": 0, "point": [2.0], "result": 0.5},
+        {"index": 1, "point": [0.0], "error": "Cannot divide by zero."},
+    ]
+    statistics = b"".join(sweep_ndjson("mean", [np.array([1.0, 3.0]), 5.0])).decode().splitlines()
+    assert [json.loads(line)["result"] for line in statistics] == [3.0, 4.0]
+    expression = b"".join(sweep_ndjson("expression", [np.array([1.0, 2.0]), 3.0], "a * b")).decode()
+    assert [json.loads(line)["result"] for line in expression.splitlines()] == [3.0, 6.0]
+
+
+def test_sweep_request_validation(monkeypatch):
+    request = CalculationSweepRequest(type="addition", inputs=[{"start": 0, "stop": 9, "step": 1}, {"values": [1, 2]}])
+    assert request.points == 20
+    assert [len(value) for value in request.sweep_inputs()] == [10, 2]
+
+    with pytest.raises(ValidationError, match="at least one range"):
+        CalculationSweepRequest(type="addition", inputs=[1, 2])
+    with pytest.raises(ValidationError, match="exactly one of num or step"):
+        CalculationSweepRequest(type="addition", inputs=[{"start": 0, "stop": 1}, 2])
+    with pytest.raises(ValidationError, match="limited to"):
+        CalculationSweepRequest(type="addition", inputs=[{"start": 0, "stop": 1, "num": 10 ** 6}, {"values": [1, 2]}])
+    with pytest.raises(ValidationError, match="too many points"):
+        CalculationSweepRequest(type="addition", inputs=[{"start": 0, "stop": 1e308, "step": 1e-308}, 2])
+    with pytest.raises(ValidationError, match="finite"):
+        CalculationSweepRequest(type="addition", inputs=[{"start": 0, "stop": float("inf"), "num": 3}, 2])